@@ -0,0 +1,917 @@
+"""Benchmarks des outils du shelf sur des scènes synthétiques, sans Maya
+
+Compare l'implémentation actuelle à l'ancienne (copiée ici comme référence)
+sur le backend en mémoire de mayaStandIn. Le nombre d'appels maya.cmds est
+la mesure pertinente : dans Maya, chaque appel coûte bien plus que dans le stand-in.
+
+    python benchmarks.py            # tous les benchmarks
+    python benchmarks.py meshes     # un benchmark précis
+
+    python benchmarks.py --suite --save             # suite de régression -> benchmarks_baseline.json
+    python benchmarks.py --suite --compare          # échoue (code 1) en cas de régression
+    python benchmarks.py --suite --sizes 1000 clean_lookdev
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import mayaStandIn
+
+scene = mayaStandIn.install()
+
+import maya.cmds as cmds  # noqa: E402  (stand-in)
+import customPlugins  # noqa: E402
+
+
+# --- Anciennes implémentations (référence) ---------------------------------
+
+def legacy_select_only_meshes():
+    selection = cmds.ls(sl=True, long=True) or cmds.ls(long=True)
+    meshes = []
+    for obj in selection:
+        shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
+        for shape in shapes:
+            if cmds.nodeType(shape) == 'mesh':
+                meshes.append(obj)
+                break
+    if meshes:
+        cmds.select(meshes, replace=True)
+    else:
+        cmds.select(clear=True)
+    return meshes
+
+
+def legacy_delete_empty_groups():
+    deleted_count = 0
+    while True:
+        all_transforms = cmds.ls(type='transform')
+        empty_groups = []
+        for obj in all_transforms:
+            children = cmds.listRelatives(obj, children=True, fullPath=True)
+            if not children:
+                empty_groups.append(obj)
+        if not empty_groups:
+            break
+        for grp in empty_groups:
+            try:
+                cmds.delete(grp)
+                deleted_count += 1
+            except Exception:
+                pass
+    return deleted_count
+
+
+def legacy_remove_pasted_prefix():
+    renamed_count = 0
+    for obj in cmds.ls():
+        if "pasted__" in obj:
+            new_name = obj.replace("pasted__", "")
+            try:
+                cmds.rename(obj, new_name)
+                renamed_count += 1
+            except Exception:
+                pass
+    return renamed_count
+
+
+def legacy_isolate(selection):
+    selection_long = cmds.ls(selection, long=True)
+    selection_and_children = set(selection_long)
+    for obj in selection_long:
+        descendants = cmds.listRelatives(obj, allDescendents=True, fullPath=True) or []
+        selection_and_children.update(descendants)
+    hidden_objects = []
+    for obj in cmds.ls(dag=True, visible=True, transforms=True, long=True):
+        if obj not in selection_and_children and cmds.objExists(obj):
+            cmds.setAttr(f"{obj}.visibility", 0)
+            hidden_objects.append(obj)
+    return hidden_objects
+
+
+def legacy_select_type(shape_types, default_cameras=()):
+    transforms = []
+    for shape in cmds.ls(type=shape_types):
+        if shape in default_cameras:
+            continue
+        parent = cmds.listRelatives(shape, parent=True)
+        if parent:
+            transforms.append(parent[0])
+    if transforms:
+        cmds.select(transforms, replace=True)
+    else:
+        cmds.select(clear=True)
+    return transforms
+
+
+def legacy_initialize_plugin():
+    """Ancien chargement : rechargement du module et reconstruction complète du shelf"""
+    import importlib
+    importlib.reload(customPlugins)
+    if cmds.shelfLayout("MesOutils", exists=True):
+        cmds.deleteUI("MesOutils", layout=True)
+    shelf = cmds.shelfLayout("MesOutils", parent="ShelfLayout")
+    for button in customPlugins.SHELF_BUTTONS:
+        cmds.shelfButton(parent=shelf, label=button['label'], image=button['image'],
+                         command=f"from customPlugins import {button['call'].split('(')[0]}\n{button['call']}",
+                         annotation=button['annotation'], imageOverlayLabel=button['overlay'], style="iconOnly")
+
+
+def count_pasted():
+    return sum(1 for n in scene.nodes.values() if "pasted__" in n.name)
+
+
+# --- Outils de mesure ----------------------------------------------------
+
+def measure(func, setup=None):
+    """Exécute func après setup et retourne (durée, nombre d'appels cmds, résultat)"""
+    if setup:
+        setup()
+    scene.call_counts.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start
+    return duration, sum(scene.call_counts.values()), result
+
+
+def report(name, label, duration, calls):
+    print(f"  {name:<28} {label:<8} {duration * 1000:10.1f} ms {calls:>10} appel(s) cmds")
+
+
+# --- Benchmarks ----------------------------------------------------------
+
+def bench_meshes():
+    """select_only_meshes sur toute la scène (rien de sélectionné)"""
+    for group_count in (100, 1000):
+        mayaStandIn.build_scene(scene, group_count=group_count)
+        node_count = len(scene.nodes)
+        print(f"select_only_meshes - {node_count} nodes")
+        legacy = measure(legacy_select_only_meshes, lambda: cmds.select(clear=True))
+        current = measure(customPlugins.select_only_meshes, lambda: cmds.select(clear=True))
+        assert legacy[2] == current[2], "résultats différents"
+        report('select_only_meshes', 'ancien', legacy[0], legacy[1])
+        report('select_only_meshes', 'actuel', current[0], current[1])
+
+
+def bench_empty_groups():
+    """delete_empty_groups sur des hiérarchies profondes (type import CAD)"""
+    for depth, breadth in ((10, 10), (50, 10)):
+        setup = lambda: mayaStandIn.build_nested_groups(scene, depth=depth, breadth=breadth)
+        setup()
+        print(f"delete_empty_groups - profondeur {depth} x largeur {breadth} ({len(scene.nodes)} nodes)")
+        legacy = measure(legacy_delete_empty_groups, setup)
+        legacy_remaining = len(scene.nodes)
+        current = measure(customPlugins.delete_empty_groups, setup)
+        assert legacy[2] == len(current[2]), "nombre de groupes supprimés différent"
+        assert legacy_remaining == len(scene.nodes), "scènes résultantes différentes"
+        report('delete_empty_groups', 'ancien', legacy[0], legacy[1])
+        report('delete_empty_groups', 'actuel', current[0], current[1])
+    check_instanced_groups()
+
+
+def check_instanced_groups():
+    """Régression : un transform dont le seul enfant est une shape instanciée n'est pas vide"""
+    def setup():
+        scene.clear()
+        scene.add_transform('source', shape_type='mesh')
+        scene.add_transform('holder')
+        scene.add_transform('empty')
+        cmds.parent('|source|sourceShape', '|holder', add=True, shape=True)
+    
+    for indexed in (False, True):
+        setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if indexed:
+                customPlugins.enable_scene_index(event_source=scene)
+            deleted = customPlugins.delete_empty_groups()
+        customPlugins.disable_scene_index()
+        scene.listeners.clear()
+        assert deleted == ['|empty'], f"groupes supprimés inattendus : {deleted}"
+        assert cmds.ls('|holder|sourceShape'), "instance supprimée avec son parent"
+
+
+def bench_pasted():
+    """remove_pasted_prefix sur des copies collées aux noms répétés"""
+    for group_count in (230, 2300):
+        setup = lambda: mayaStandIn.build_pasted_scene(scene, group_count=group_count)
+        setup()
+        print(f"remove_pasted_prefix - {len(scene.nodes)} nodes, {count_pasted()} à renommer")
+        legacy = measure(legacy_remove_pasted_prefix, setup)
+        legacy_left = count_pasted()
+        current = measure(customPlugins.remove_pasted_prefix, setup)
+        stats = current[2]
+        assert count_pasted() == 0, "des nodes 'pasted__' restent"
+        report('remove_pasted_prefix', 'ancien', legacy[0], legacy[1])
+        print(f"  {'':<37} {legacy[2]} renommé(s), {legacy_left} oublié(s)")
+        report('remove_pasted_prefix', 'actuel', current[0], current[1])
+        print(f"  {'':<37} {stats['applied']}/{stats['planned']} renommé(s)")
+
+
+def bench_batch_names():
+    """compute_batch_names : aperçu (premières lignes) et calcul complet"""
+    rules = {'search': r'geo(\d+)_', 'replace': r'prop\1_', 'regex': True,
+             'case': 'MAJUSCULES', 'numbering': True, 'padding': 4, 'suffix': '_GEO'}
+    for count in (10000, 100000):
+        names = [f"geo{i // 10}_{i % 10}" for i in range(count)]
+        print(f"compute_batch_names - {count} noms")
+        preview = measure(lambda: customPlugins.compute_batch_names(
+            names[:customPlugins.BATCH_RENAME_PREVIEW_ROWS], rules))
+        full = measure(lambda: customPlugins.compute_batch_names(names, rules))
+        report('aperçu (par frappe)', 'actuel', preview[0], preview[1])
+        report('calcul complet', 'actuel', full[0], full[1])
+
+
+def bench_materials():
+    """assign_unique_materials : ancienne boucle, mode groupé, partage par géométrie"""
+    def setup():
+        mayaStandIn.build_scene(scene, group_count=500, meshes_per_group=10)
+        # Quatre géométries différentes réparties sur les mesh
+        for index, node in enumerate(n for n in list(scene.nodes.values()) if n.type == 'mesh'):
+            node.attrs['points'] = [coord * (1 + index % 4) for coord in mayaStandIn.CUBE_POINTS]
+        cmds.select([n.parent.long_name() for n in scene.nodes.values() if n.type == 'mesh'])
+
+    setup()
+    mesh_count = sum(1 for n in scene.nodes.values() if n.type == 'mesh')
+    print(f"assign_unique_materials - {mesh_count} mesh")
+    variants = (
+        ('ancien', lambda: customPlugins.assign_unique_materials(batched=False)),
+        ('groupé', lambda: customPlugins.assign_unique_materials()),
+        ('partagé', lambda: customPlugins.assign_unique_materials(share_identical=True)),
+    )
+    for label, func in variants:
+        duration, calls, result = measure(func, setup)
+        report('assign_unique_materials', label, duration, calls)
+        if label == 'partagé':
+            assert result['materials'] == 4, "un matériau par géométrie attendu"
+        # Chaque shading group dupliqué est alimenté par son propre shader
+        surface_shaders = [source for source, destination in scene.connections if destination.endswith('.surfaceShader')]
+        assert len(set(surface_shaders)) == len(surface_shaders) == result['materials'], "réseaux dupliqués incorrects"
+        print(f"  {'':<37} {mesh_count / duration:.0f} mesh/s")
+
+
+def bench_geometry_hash():
+    """hash_mesh_buffers sur une grille de quads (NumPy si installé)"""
+    for side in (100, 300):
+        vertex_count = side * side
+        points = [float(v) for i in range(vertex_count) for v in (i % side, i // side, 0.0)]
+        counts = [4] * ((side - 1) * (side - 1))
+        connects = [i for row in range(side - 1) for col in range(side - 1)
+                    for i in (row * side + col, row * side + col + 1,
+                              (row + 1) * side + col + 1, (row + 1) * side + col)]
+        print(f"hash_mesh_buffers - {vertex_count} sommets")
+        duration, calls, _ = measure(lambda: customPlugins.hash_mesh_buffers(points, counts, connects))
+        report('hash_mesh_buffers', 'actuel', duration, calls)
+        print(f"  {'':<37} {vertex_count / duration / 1e6:.2f} M sommets/s")
+    check_geometry_hash_cache()
+
+
+def check_geometry_hash_cache():
+    """Régression : sommets échangés (mêmes comptes, même bounding box) => nouveau hash"""
+    scene.clear()
+    shape = scene.add_transform('cube', shape_type='mesh').children[0]
+    path = shape.long_name()
+    with contextlib.redirect_stdout(io.StringIO()):
+        before = customPlugins.hash_meshes([path])[path][0]
+        points = list(mayaStandIn.CUBE_POINTS)
+        points[0:3], points[3:6] = points[3:6], points[0:3]
+        cmds.setAttr(f"{path}.points", points)
+        after = customPlugins.hash_meshes([path])[path][0]
+    assert before != after, "hash périmé après modification des points"
+    customPlugins.clear_geometry_hash_cache()
+
+
+def bench_render_preset():
+    """Preset de rendu : première application, réapplication, relance sur une scène à jour"""
+    scene.clear()
+    mayaStandIn.build_render_globals(scene)
+    preset = customPlugins.DEFAULT_RENDER_PRESET
+    target = customPlugins.render_preset_attributes(preset, 'defaultArnoldDriver')
+    print(f"render preset - {len(target)} attributs")
+    first = measure(lambda: customPlugins.apply_render_attributes(target))
+    again = measure(lambda: customPlugins.apply_render_attributes(target))
+    with contextlib.redirect_stdout(io.StringIO()):
+        customPlugins.setup_arnold_render()
+    skipped = measure(customPlugins.setup_arnold_render)
+    assert not again[2], "la réapplication ne doit rien modifier"
+    assert not scene.call_counts['setAttr'], "scène à jour modifiée"
+    assert scene.call_counts['getAttr'] <= 1, "attributs du preset relus malgré le hash enregistré"
+    report('apply_render_attributes', 'initial', first[0], first[1])
+    print(f"  {'':<37} {len(first[2])} attribut(s) écrit(s)")
+    report('apply_render_attributes', 'réappl.', again[0], again[1])
+    report('setup_arnold_render', 'à jour', skipped[0], skipped[1])
+    
+    # Un AOV supprimé depuis invalide le hash enregistré : il est recréé
+    scene.remove_node(scene.require('aiAOV_Z'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        customPlugins.setup_arnold_render()
+    assert cmds.ls('aiAOV_Z', type='aiAOV'), "AOV supprimé non recréé"
+    
+    # Régression : un preset appliqué avec des échecs n'est pas enregistré comme appliqué
+    cmds.fileInfo(remove=customPlugins.RENDER_PRESET_FILEINFO)
+    scene.remove_node(scene.require('defaultResolution'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        customPlugins.setup_arnold_render({'resolution': [1280, 720]})
+    assert not cmds.fileInfo(customPlugins.RENDER_PRESET_FILEINFO, query=True), "hash enregistré malgré des échecs"
+
+
+def bench_isolation():
+    """Isolation LookDev : masquage objet par objet contre ancêtres de plus haut niveau"""
+    for group_count in (100, 3000):
+        setup = lambda: mayaStandIn.build_scene(scene, group_count=group_count)
+        setup()
+        transform_count = sum(1 for n in scene.nodes.values() if n.type == 'transform')
+        print(f"isolation LookDev - {transform_count} transforms")
+        legacy = measure(lambda: legacy_isolate(['|grp0|geo0_0']), setup)
+        current = measure(lambda: customPlugins.isolate_nodes(['|grp0|geo0_0']), setup)
+        report('isolation', 'ancien', legacy[0], legacy[1])
+        print(f"  {'':<37} {len(legacy[2])} node(s) modifié(s)")
+        report('isolation', 'actuel', current[0], current[1])
+        print(f"  {'':<37} {len(current[2][0])} node(s) modifié(s)")
+
+
+def bench_framing():
+    """compute_turntable_framing sur des nuages de points (coins de bounds ou sommets)"""
+    import math
+    import random
+    
+    random.seed(0)
+    fov_h, fov_v = math.radians(54.4), math.radians(31.0)
+    for count in (8000, 800000):
+        points = [(random.uniform(-10, 10), random.uniform(0, 5), random.uniform(-1, 1)) for _ in range(count)]
+        print(f"compute_turntable_framing - {count} points")
+        for fit in ('cylinder', 'sphere'):
+            duration, calls, framing = measure(
+                lambda: customPlugins.compute_turntable_framing(points, fov_h, fov_v, fit=fit))
+            report('compute_turntable_framing', fit, duration, calls)
+            print(f"  {'':<37} distance caméra {framing['distance']:.2f}")
+
+
+def bench_unused():
+    """delete_unused_nodes : parcours du graphe de shading sur un snapshot des connexions"""
+    for material_count in (1000, 5000):
+        setup = lambda: mayaStandIn.build_shading_scene(scene, material_count=material_count)
+        setup()
+        print(f"delete_unused_nodes - {material_count} réseaux de shading, {len(scene.nodes)} nodes")
+        duration, calls, counts = measure(customPlugins.delete_unused_nodes, setup)
+        # Réseaux non assignés (4 nodes), sauf la texture et son place2d qui éclairent la scène
+        expected = (material_count - material_count // 2) * 4 - 2
+        assert sum(counts.values()) == expected, "nombre de nodes supprimés inattendu"
+        assert scene.resolve('lambert1') is not None, "node par défaut supprimé"
+        report('delete_unused_nodes', 'actuel', duration, calls)
+        print(f"  {'':<37} {sum(counts.values())} node(s) supprimé(s): {counts}")
+
+
+def bench_unknown():
+    """delete_unknown_nodes : ancienne boucle node par node contre déverrouillage et suppression groupés"""
+    for group_count in (100, 1000):
+        setup = lambda: mayaStandIn.build_unknown_scene(scene, group_count=group_count)
+        setup()
+        unknown_count = sum(1 for n in scene.nodes.values() if n.type.startswith('unknown'))
+        print(f"delete_unknown_nodes - {unknown_count} nodes inconnus, {len(scene.unknown_plugins)} plugins")
+        legacy = measure(lambda: customPlugins.delete_unknown_nodes(batched=False, remove_plugins=False), setup)
+        current = measure(customPlugins.delete_unknown_nodes, setup)
+        assert legacy[2] == current[2] == unknown_count, "nombre de nodes supprimés différent"
+        assert not scene.unknown_plugins, "des plugins inconnus restent"
+        report('delete_unknown_nodes', 'ancien', legacy[0], legacy[1])
+        report('delete_unknown_nodes', 'actuel', current[0], current[1])
+
+
+def bench_select_type():
+    """Select by Type : ancienne boucle listRelatives par shape, moteur de filtres, avec l'index (et son cache)"""
+    legacy_filters = {
+        'light': lambda: legacy_select_type(customPlugins.MAYA_LIGHT_TYPES),
+        'camera': lambda: legacy_select_type('camera', ['perspShape', 'topShape', 'frontShape', 'sideShape']),
+        'locator': lambda: legacy_select_type('locator'),
+    }
+    # Résultats attendus des filtres composés, lus directement dans la scène
+    expected = {
+        'heavyMesh': lambda: sorted(n.parent.name for n in scene.nodes.values()
+                                    if n.type == 'mesh' and n.attrs.get('faceCount', 6) > 100000),
+        'blackLight': lambda: sorted(n.parent.name for n in scene.nodes.values()
+                                     if n.attrs.get('intensity', 1.0) == 0),
+    }
+    short = lambda paths: sorted(path.rsplit('|', 1)[-1] for path in paths)
+    for group_count in (100, 1000):
+        mayaStandIn.build_selection_scene(scene, group_count=group_count)
+        print(f"select_type - {len(scene.nodes)} nodes")
+        for name in ('light', 'camera', 'locator', 'heavyMesh', 'blackLight'):
+            current = measure(lambda: customPlugins.select_type(name))
+            if name in legacy_filters:
+                legacy = measure(legacy_filters[name])
+                assert short(legacy[2]) == short(current[2]), f"{name}: résultats différents"
+                report(f"select_type {name}", 'ancien', legacy[0], legacy[1])
+            else:
+                assert short(current[2]) == expected[name](), f"{name}: résultats différents"
+            report(f"select_type {name}", 'actuel', current[0], current[1])
+            
+            with contextlib.redirect_stdout(io.StringIO()):
+                customPlugins.enable_scene_index(event_source=scene)
+            cold = measure(lambda: customPlugins.select_type(name))
+            cached = measure(lambda: customPlugins.select_type(name))
+            assert short(cold[2]) == short(cached[2]) == short(current[2]), f"{name}: résultats différents avec l'index"
+            customPlugins.disable_scene_index()
+            scene.listeners.clear()
+            report(f"select_type {name}", 'index', cold[0], cold[1])
+            report(f"select_type {name}", 'cache', cached[0], cached[1])
+
+
+def bench_statistics():
+    """gather_scene_statistics : une passe sur la scène, tailles des textures en série ou en pool de threads"""
+    import tempfile
+    
+    texture_dir = tempfile.mkdtemp(prefix='stats_bench_')
+    for asset_count in (100, 1000):
+        mayaStandIn.build_statistics_scene(scene, texture_dir, asset_count=asset_count)
+        meshes = [n for n in scene.nodes.values() if n.type == 'mesh' and not n.attrs.get('intermediateObject')]
+        expected_triangles = sum(n.attrs['faceVertexCount'] - 2 * n.attrs['faceCount'] for n in meshes)
+        expected_bytes = sum(os.path.getsize(os.path.join(texture_dir, name)) for name in os.listdir(texture_dir)
+                             if name.startswith(tuple(f"asset{a}_" for a in range(asset_count))))
+        print(f"gather_scene_statistics - {len(scene.nodes)} nodes, {asset_count * 4} textures")
+        for workers in (1, customPlugins.STATISTICS_WORKERS):
+            duration, calls, stats = measure(lambda: customPlugins.gather_scene_statistics(workers=workers))
+            totals = stats['totals']
+            assert totals['triangles'] == expected_triangles, "triangles différents"
+            assert totals['texture_bytes'] == expected_bytes, "taille des textures différente"
+            assert totals['missing_textures'] == asset_count, "textures manquantes différentes"
+            assert len(stats['assets']) == asset_count, "nombre d'assets différent"
+            report('gather_scene_statistics', f"{workers} thr.", duration, calls)
+
+
+def bench_startup():
+    """Chargement du plugin : ancien (reload + shelf reconstruit) contre actuel (premier lancement, puis shelf à jour)"""
+    print(f"initializePlugin - {len(customPlugins.SHELF_BUTTONS)} boutons")
+    runs = 20
+    unload = lambda: measure(lambda: customPlugins.uninitializePlugin(None))
+    
+    legacy = [measure(legacy_initialize_plugin) for _ in range(runs)]
+    
+    scene.ui.clear()
+    scene.option_vars.clear()
+    first = measure(lambda: customPlugins.initializePlugin(None))
+    assert len(scene.ui["MesOutils"]) == len(customPlugins.SHELF_BUTTONS), "shelf incomplet"
+    unload()
+    
+    later = []
+    for _ in range(runs):
+        later.append(measure(lambda: customPlugins.initializePlugin(None)))
+        assert not scene.call_counts['shelfButton'], "shelf reconstruit alors qu'il est à jour"
+        unload()
+    
+    best = lambda results: min(results, key=lambda result: result[0])
+    report('initializePlugin', 'ancien', *best(legacy)[:2])
+    report('initializePlugin', '1er', *first[:2])
+    report('initializePlugin', 'suivants', *best(later)[:2])
+    print(f"  {'':<37} Dans Maya, chaque shelfButton crée des widgets : le nombre d'appels est la mesure à comparer")
+
+
+def bench_instrumentation():
+    """run_tool : surcoût du comptage des commandes, phases, journal avec rotation et capture cProfile"""
+    import tempfile
+    
+    directory = tempfile.mkdtemp(prefix='tools_log_')
+    customPlugins.TOOL_LOG_PATH = os.path.join(directory, 'tools.jsonl')
+    customPlugins.TOOL_LOG_MAX_BYTES = 4096
+    
+    for depth, breadth in ((10, 10), (50, 10)):
+        setup = lambda: mayaStandIn.build_nested_groups(scene, depth=depth, breadth=breadth)
+        setup()
+        print(f"run_tool delete_empty_groups - {len(scene.nodes)} nodes")
+        direct = measure(customPlugins.delete_empty_groups, setup)
+        wrapped = measure(lambda: customPlugins.run_tool('Delete Empty', customPlugins.delete_empty_groups), setup)
+        assert len(direct[2]) == len(wrapped[2]), "résultats différents"
+        
+        record = customPlugins.read_tool_log('Delete Empty')[-1]
+        # Le proxy doit compter les mêmes commandes que le stand-in sans instrumentation
+        assert record['commands'] == direct[1], "nombre de commandes différent"
+        assert set(record['phases']) == {'query', 'mutate', 'report'}, "phases manquantes"
+        report('delete_empty_groups', 'direct', direct[0], direct[1])
+        report('delete_empty_groups', 'run_tool', wrapped[0], wrapped[1])
+        phases = ", ".join(f"{name} {phase['seconds'] * 1000:.1f} ms/{phase['commands']}"
+                           for name, phase in record['phases'].items())
+        print(f"  {'':<37} {phases}")
+    
+    profiled = measure(lambda: customPlugins.run_tool('Delete Empty', customPlugins.delete_empty_groups, profile=True),
+                       setup)
+    record = customPlugins.read_tool_log('Delete Empty')[-1]
+    assert os.path.exists(record['profile']), "capture cProfile absente"
+    report('delete_empty_groups', 'cProfile', profiled[0], profiled[1])
+    
+    for _ in range(50):
+        with contextlib.redirect_stdout(io.StringIO()):
+            customPlugins.run_tool('Select Meshes', customPlugins.select_only_meshes)
+    backups = [name for name in os.listdir(directory) if name.startswith('tools.jsonl.')]
+    assert len(backups) == customPlugins.TOOL_LOG_BACKUPS, "rotation du journal incorrecte"
+    print(f"  {'':<37} journal: {len(customPlugins.read_tool_log())} enregistrement(s) sur {len(backups) + 1} fichier(s)")
+
+
+def bench_export():
+    """export_assets : premier export, nouvel export sans changement (manifest), puis un asset modifié"""
+    import shutil
+    import tempfile
+    
+    for node_count in (1500, 15000):
+        directory = tempfile.mkdtemp(prefix='export_')
+        mayaStandIn.build_benchmark_scene(scene, node_count)
+        with contextlib.redirect_stdout(io.StringIO()):
+            shader, shading_group = customPlugins.create_material_network('asset2')
+        cmds.sets('|asset2|geo2_1|geo2_1Shape', edit=True, forceElement=shading_group)
+        assets = cmds.ls('asset*', assemblies=True, long=True)
+        print(f"export_assets - {len(assets)} asset(s), {len(scene.nodes)} nodes")
+        first = measure(lambda: customPlugins.export_assets(assets, output_dir=directory, cache=False))
+        unchanged = measure(lambda: customPlugins.export_assets(assets, output_dir=directory, cache=False))
+        assert all(record['status'] == 'skipped' for record in unchanged[2]), "assets inchangés réexportés"
+        
+        shape = scene.require('|asset0|geo0_1|geo0_1Shape')
+        scene.set_attr(shape, 'points', [coord * 2.0 for coord in mayaStandIn.CUBE_POINTS])
+        edited = measure(lambda: customPlugins.export_assets(assets, output_dir=directory, cache=False))
+        statuses = [record['status'] for record in edited[2]]
+        assert statuses.count('exported') == 1, "seul l'asset modifié doit être réexporté"
+        
+        # UVs seules modifiées : l'asset doit aussi être réexporté
+        shape = scene.require('|asset1|geo1_1|geo1_1Shape')
+        points = mayaStandIn.CUBE_POINTS
+        scene.set_attr(shape, 'uvSets', {'map1': ([u * 0.5 for u in points[0::3]], list(points[1::3]),
+                                                  mayaStandIn.CUBE_COUNTS, mayaStandIn.CUBE_CONNECTS)})
+        with contextlib.redirect_stdout(io.StringIO()):
+            uv_edited = customPlugins.export_assets(assets, output_dir=directory, cache=False)
+        assert [record['status'] for record in uv_edited].count('exported') == 1, "modification d'UVs ignorée"
+        
+        # Valeur du shader seule modifiée (réseau de shading) : réexport de l'asset qui l'utilise
+        cmds.setAttr(f"{shader}.base", 0.5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            shader_edited = customPlugins.export_assets(assets, output_dir=directory, cache=False)
+        assert [record['asset'] for record in shader_edited if record['status'] == 'exported'] == ['|asset2'], \
+            "modification du shader ignorée"
+        
+        report('export_assets', 'premier', first[0], first[1])
+        report('export_assets', 'inchangé', unchanged[0], unchanged[1])
+        report('export_assets', '1 modif', edited[0], edited[1])
+        shutil.rmtree(directory)
+
+
+def bench_export_cache():
+    """Cache d'export : hachage d'assets hors Maya, stockage avec éviction LRU, reprise depuis le cache"""
+    import random
+    import shutil
+    import tempfile
+    
+    # Hachage pur : buffers de mesh synthétiques -> hash de contenu -> clé du cache
+    side = 30
+    points = [float(v) for i in range(side * side) for v in (i % side, i // side, 0.0)]
+    counts = [4] * ((side - 1) * (side - 1))
+    connects = [i for row in range(side - 1) for col in range(side - 1)
+                for i in (row * side + col, row * side + col + 1, (row + 1) * side + col + 1, (row + 1) * side + col)]
+    preset_hash = customPlugins.preset_hash(customPlugins.EXPORT_PRESETS['fbx'])
+    
+    def hash_assets(asset_count, meshes_per_asset=10):
+        keys = set()
+        for a in range(asset_count):
+            content = {'transforms': {}, 'meshes': {}, 'materials': {}}
+            for m in range(meshes_per_asset):
+                path = f"|asset{a}|geo{m}"
+                moved = [coord + a for coord in points[:3]] + points[3:]
+                content['transforms'][path] = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0,
+                                               0.0, 0.0, 1.0, 0.0, float(m), 0.0, 0.0, 1.0]
+                content['meshes'][path + '|geoShape'] = customPlugins.hash_mesh_buffers(moved, counts, connects)
+                content['materials'][path + '|geoShape'] = [f"material{m % 3}SG"]
+            keys.add(customPlugins.export_cache_key(customPlugins.hash_asset_content(content), preset_hash))
+        return keys
+    
+    for asset_count in (10, 100):
+        print(f"hachage d'assets - {asset_count} asset(s) de 10 meshes ({side * side} sommets)")
+        duration, calls, keys = measure(lambda: hash_assets(asset_count))
+        assert len(keys) == asset_count, "clés en collision"
+        report('hash_asset_content', 'actuel', duration, calls)
+        print(f"  {'':<37} {asset_count / duration:.0f} asset(s)/s")
+    
+    # Cache seul : stockage au-delà de la taille max (éviction LRU), puis accès par lien ou copie
+    directory = tempfile.mkdtemp(prefix='export_cache_')
+    sources = os.path.join(directory, 'sources')
+    os.makedirs(sources)
+    random.seed(0)
+    file_count = 2000
+    files = []
+    for i in range(file_count):
+        path = os.path.join(sources, f"asset{i}.fbx")
+        with open(path, 'wb') as f:
+            f.write(os.urandom(random.randint(1, 16) * 1024))
+        files.append((customPlugins.export_cache_key(f"content{i}", preset_hash), path))
+    total = sum(os.path.getsize(path) for _, path in files)
+    
+    cache_dir = os.path.join(directory, 'cache')
+    cache = customPlugins.ExportCache(cache_dir, max_bytes=total // 2)
+    print(f"ExportCache - {file_count} fichiers, {customPlugins.format_bytes(total)} pour un cache de "
+          f"{customPlugins.format_bytes(cache.max_bytes)}")
+    stored = measure(lambda: [cache.store(key, '.fbx', path) for key, path in files])
+    assert cache.total_bytes <= cache.max_bytes and cache.evicted, "éviction LRU incorrecte"
+    report('store', 'actuel', stored[0], stored[1])
+    print(f"  {'':<37} {cache.evicted} évincé(s), {customPlugins.format_bytes(cache.total_bytes)} en cache")
+    
+    scan = measure(lambda: customPlugins.ExportCache(cache_dir, max_bytes=total // 2))
+    assert scan[2].total_bytes == cache.total_bytes, "scan du cache incohérent"
+    report('scan', 'actuel', scan[0], scan[1])
+    
+    # Les derniers fichiers stockés sont en cache, les premiers ont été évincés
+    output = os.path.join(directory, 'output')
+    os.makedirs(output)
+    recent = files[-200:]
+    for link in (True, False):
+        cache.link = link
+        label = 'lien' if link else 'copie'
+        fetched = measure(lambda: [cache.fetch(key, '.fbx', os.path.join(output, os.path.basename(path)))
+                                   for key, path in recent])
+        assert all(fetched[2]), "fichiers récents absents du cache"
+        report(f"fetch x{len(recent)}", label, fetched[0], fetched[1])
+    assert not cache.fetch(files[0][0], '.fbx', os.path.join(output, 'evicted.fbx')), "fichier évincé encore en cache"
+    
+    # Pipeline : export dans un dossier (cache froid), puis les mêmes assets dans un autre dossier
+    mayaStandIn.build_benchmark_scene(scene, 15000)
+    assets = cmds.ls('asset*', assemblies=True, long=True)
+    cache = customPlugins.ExportCache(os.path.join(directory, 'pipeline'))
+    print(f"export_assets avec cache - {len(assets)} asset(s)")
+    cold = measure(lambda: customPlugins.export_assets(assets, output_dir=os.path.join(directory, 'a'), cache=cache))
+    warm = measure(lambda: customPlugins.export_assets(assets, output_dir=os.path.join(directory, 'b'), cache=cache))
+    assert all(record['status'] == 'cached' for record in warm[2]), "assets réexportés malgré le cache"
+    report('export_assets', 'froid', cold[0], cold[1])
+    report('export_assets', 'cache', warm[0], warm[1])
+    shutil.rmtree(directory)
+
+
+def index_matches_scene(index):
+    """L'index tenu par événements est-il identique à un index reconstruit ?"""
+    fresh = customPlugins.SceneIndex()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh.rebuild()
+    return (index.names, index.types, index.parents, index.watched) == \
+        (fresh.names, fresh.types, fresh.parents, fresh.watched)
+
+
+def bench_scene_index():
+    """Outils servis par l'index de scène contre les rescans ls, et coût de reconstruction"""
+    queries = [
+        ('select_only_meshes', lambda: mayaStandIn.build_scene(scene, group_count=group_count),
+         customPlugins.select_only_meshes, sorted),
+        ('select_type', lambda: mayaStandIn.build_scene(scene, group_count=group_count),
+         lambda: customPlugins.select_type('locator'), sorted),
+        ('delete_empty_groups', lambda: mayaStandIn.build_nested_groups(scene, depth=group_count // 20, breadth=10),
+         lambda: customPlugins.delete_empty_groups(dry_run=True), lambda groups: sorted(groups)),
+        ('remove_pasted_prefix', lambda: mayaStandIn.build_pasted_scene(scene, group_count=group_count),
+         customPlugins.remove_pasted_prefix, lambda stats: stats['applied']),
+    ]
+    for group_count in (100, 1000):
+        print(f"Index de scène - {group_count} groupes")
+        for name, setup, func, normalize in queries:
+            setup()
+            raw = measure(func, setup)
+            
+            setup()
+            with contextlib.redirect_stdout(io.StringIO()):
+                build = measure(lambda: customPlugins.enable_scene_index(event_source=scene))
+            cmds.select(clear=True)
+            indexed = measure(func)
+            assert normalize(raw[2]) == normalize(indexed[2]), f"{name}: résultats différents"
+            assert index_matches_scene(customPlugins.get_scene_index()), f"{name}: index désynchronisé"
+            customPlugins.disable_scene_index()
+            scene.listeners.clear()
+            
+            report(name, 'ls', raw[0], raw[1])
+            report(name, 'index', indexed[0], indexed[1])
+            print(f"  {'':<37} {len(scene.nodes)} nodes, index construit en {build[0] * 1000:.1f} ms ({build[1]} appel(s))")
+
+
+def write_synthetic_ma(path, group_count, vertices_per_mesh=2000):
+    """Scène .ma synthétique : groupes de mesh (données de sommets), copies collées,
+    nodes inconnus, groupes vides et connexions"""
+    points = " ".join(f"{i * 0.001:.4f} {i * 0.002:.4f} {i * 0.003:.4f}" for i in range(vertices_per_mesh))
+    with open(path, 'w') as f:
+        f.write('//Maya ASCII 2024 scene\n//Name: synthetic.ma\nrequires maya "2024";\n')
+        for g in range(group_count):
+            prefix = "pasted__" if g % 4 == 0 else ""
+            f.write(f'createNode transform -n "{prefix}grp{g}";\n')
+            f.write(f'createNode transform -n "{prefix}geo{g}" -p "{prefix}grp{g}";\n')
+            f.write(f'\tsetAttr ".t" -type "double3" {g} 0 0 ;\n')
+            f.write(f'createNode mesh -n "{prefix}geo{g}Shape" -p "{prefix}geo{g}";\n')
+            f.write(f'\tsetAttr -s {vertices_per_mesh} ".vt[0:{vertices_per_mesh - 1}]"  {points};\n')
+            f.write(f'createNode transform -n "empty{g}" -p "{prefix}grp{g}";\n')
+            if g % 10 == 0:
+                f.write(f'createNode unknown -n "unknown{g}";\n\taddAttr -ci true -sn "x" -ln "x" -at "double";\n')
+        for g in range(group_count):
+            prefix = "pasted__" if g % 4 == 0 else ""
+            f.write(f'connectAttr "{prefix}geo{g}Shape.iog" ":initialShadingGroup.dsm" -na;\n')
+            if g % 10 == 0:
+                f.write(f'connectAttr "unknown{g}.x" "{prefix}geo{g}.tx";\n')
+
+
+def bench_ma_parser():
+    """mayaAscii : découpage en instructions et réécriture nettoyée, en Mo/s"""
+    import tempfile
+    import mayaAscii
+    
+    directory = tempfile.mkdtemp(prefix='ma_bench_')
+    for group_count in (1000, 5000):
+        source = os.path.join(directory, f'synthetic_{group_count}.ma')
+        write_synthetic_ma(source, group_count)
+        size = os.path.getsize(source) / (1 << 20)
+        print(f"mayaAscii - {size:.0f} Mo, {group_count} groupes")
+        
+        duration, calls, result = measure(lambda: mayaAscii.measure_throughput(source))
+        report('iter_statements', 'actuel', duration, calls)
+        print(f"  {'':<37} {result[0]} instruction(s), {size / duration:.1f} Mo/s")
+        
+        # Lecture par blocs (fichier non mappable) : mêmes instructions que mmap
+        with open(source, 'rb') as f:
+            duration, calls, statements = measure(lambda: sum(1 for _ in mayaAscii.iter_chunk_statements(f)))
+        report('iter_chunk_statements', 'blocs', duration, calls)
+        assert statements == result[0], "découpage par blocs différent du découpage mmap"
+        
+        for stages in (('unknown',), mayaAscii.STAGES):
+            destination = os.path.join(directory, 'clean.ma')
+            duration, calls, stats = measure(lambda: mayaAscii.rewrite_scene(source, destination, stages))
+            report('rewrite_scene', '+'.join(stages)[:8], duration, calls)
+            counts = ", ".join(f"{stage}={stats[stage]}" for stage in stages)
+            print(f"  {'':<37} {counts}, {size / duration:.1f} Mo/s")
+        os.remove(source)
+    
+    # Instruction de 12 Mo lue par blocs de 64 Ko : la recherche de sa fin reprend
+    # là où le bloc précédent s'est arrêté au lieu de relire l'instruction
+    source = os.path.join(directory, 'long_statement.ma')
+    with open(source, 'w') as f:
+        f.write('setAttr -s 3000000 ".vt"' + ' 1.5' * 3000000 + ';\nselect -ne :time1;\n')
+    with open(source, 'rb') as f:
+        duration, calls, statements = measure(lambda: sum(1 for _ in mayaAscii.iter_chunk_statements(f, 1 << 16)))
+    report('iter_chunk_statements', '64 Ko', duration, calls)
+    assert statements == mayaAscii.measure_throughput(source)[0], "découpage par blocs différent du découpage mmap"
+    assert duration < 5, "instruction longue relue à chaque bloc"
+    os.remove(source)
+    os.remove(os.path.join(directory, 'clean.ma'))
+    os.rmdir(directory)
+
+
+# --- Suite de régression ---------------------------------------------------
+#
+# Chaque outil est mesuré sur build_benchmark_scene à plusieurs tailles ; les
+# résultats (meilleur temps sur --repeat exécutions, nombre d'appels cmds) sont
+# enregistrés en JSON et servent de référence aux mesures suivantes.
+
+SUITE_SIZES = (1000, 10000, 100000)
+
+# Fichier de référence par défaut de --save / --compare
+SUITE_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks_baseline.json')
+
+# Tolérance sur le temps : régression au-delà de threshold x référence, et d'au moins
+# SUITE_MIN_DELTA secondes (les mesures de quelques ms sont trop bruitées)
+SUITE_THRESHOLD = 1.5
+SUITE_MIN_DELTA = 0.005
+
+# Règles de renommage appliquées aux meshes de la scène de benchmark
+SUITE_RENAME_RULES = {'search': 'geo', 'replace': 'prop', 'numbering': True, 'padding': 6, 'suffix': '_GEO'}
+
+
+def setup_batch_rename(node_count):
+    mayaStandIn.build_benchmark_scene(scene, node_count)
+    cmds.select(cmds.ls('geo*', type='transform'), replace=True)
+
+
+def setup_clean_lookdev(node_count):
+    """Setup LookDev tel que le laisse build_lookdev_scene : tout est masqué sauf le premier asset"""
+    mayaStandIn.build_benchmark_scene(scene, node_count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        hidden, _ = customPlugins.isolate_nodes(['|asset0'])
+    grp = cmds.group(empty=True, name='LookDev_Setup_GRP')
+    customPlugins.store_hidden_nodes(grp, hidden)
+    cmds.addAttr(grp, longName='hdriExisted', attributeType='bool')
+    cmds.setAttr(f"{grp}.hdriExisted", False)
+
+
+# outil -> (setup(node_count), fonction mesurée)
+SUITE_TOOLS = {
+    'select_only_meshes': (lambda n: mayaStandIn.build_benchmark_scene(scene, n),
+                           customPlugins.select_only_meshes),
+    'delete_empty_groups': (lambda n: mayaStandIn.build_benchmark_scene(scene, n),
+                            customPlugins.delete_empty_groups),
+    'remove_pasted_prefix': (lambda n: mayaStandIn.build_benchmark_scene(scene, n),
+                             customPlugins.remove_pasted_prefix),
+    'apply_batch_rename': (setup_batch_rename,
+                           lambda: customPlugins.apply_batch_rename(SUITE_RENAME_RULES)),
+    'select_type': (lambda n: mayaStandIn.build_benchmark_scene(scene, n),
+                    lambda: customPlugins.select_type('heavyMesh')),
+    'clean_lookdev': (setup_clean_lookdev, customPlugins.clean_lookdev),
+}
+
+
+def run_suite(tools=None, sizes=SUITE_SIZES, repeat=3):
+    """Mesure chaque outil à chaque taille de scène (meilleur temps sur repeat exécutions)
+    
+    Retourne {'environment': {...}, 'results': {'outil@taille': {seconds, calls, nodes}}}.
+    """
+    import platform
+    
+    results = {}
+    for size in sizes:
+        for tool in tools or SUITE_TOOLS:
+            setup, func = SUITE_TOOLS[tool]
+            runs = [measure(func, lambda: setup(size)) for _ in range(repeat)]
+            duration = min(run[0] for run in runs)
+            calls = runs[0][1]
+            results[f"{tool}@{size}"] = {'seconds': duration, 'calls': calls, 'nodes': len(scene.nodes)}
+            report(f"{tool} ({size})", 'suite', duration, calls)
+    return {
+        'environment': {
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_results(current, baseline, threshold=SUITE_THRESHOLD):
+    """Compare deux résultats de run_suite ; retourne la liste des régressions
+    
+    Régression : plus d'appels cmds que la référence (mesure exacte), ou un temps
+    supérieur à threshold x référence et d'au moins SUITE_MIN_DELTA secondes.
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        if result['calls'] > reference['calls']:
+            regressions.append(f"{key}: {reference['calls']} -> {result['calls']} appel(s) cmds")
+        if result['seconds'] > reference['seconds'] * threshold and \
+                result['seconds'] - reference['seconds'] > SUITE_MIN_DELTA:
+            regressions.append(f"{key}: {reference['seconds'] * 1000:.1f} -> {result['seconds'] * 1000:.1f} ms")
+    return regressions
+
+
+BENCHMARKS = {
+    'meshes': bench_meshes,
+    'empty_groups': bench_empty_groups,
+    'pasted': bench_pasted,
+    'batch_names': bench_batch_names,
+    'materials': bench_materials,
+    'geometry_hash': bench_geometry_hash,
+    'render_preset': bench_render_preset,
+    'isolation': bench_isolation,
+    'framing': bench_framing,
+    'unused': bench_unused,
+    'unknown': bench_unknown,
+    'scene_index': bench_scene_index,
+    'select_type': bench_select_type,
+    'statistics': bench_statistics,
+    'startup': bench_startup,
+    'instrumentation': bench_instrumentation,
+    'export': bench_export,
+    'export_cache': bench_export_cache,
+    'ma_parser': bench_ma_parser,
+}
+
+
+def main(argv=None):
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(description="Benchmarks des outils du shelf (backend mayaStandIn)")
+    parser.add_argument('names', nargs='*', help="benchmarks comparatifs (tous par défaut) ou outils de la suite")
+    parser.add_argument('--suite', action='store_true', help="suite de régression sur des scènes synthétiques")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SUITE_SIZES),
+                        help="tailles de scène de la suite (nodes, séparées par des virgules)")
+    parser.add_argument('--repeat', type=int, default=3, help="exécutions par mesure (le meilleur temps est gardé)")
+    parser.add_argument('--save', nargs='?', const=SUITE_BASELINE, help="enregistre les résultats de la suite (JSON)")
+    parser.add_argument('--compare', nargs='?', const=SUITE_BASELINE,
+                        help="compare la suite à une référence ; code de sortie 1 en cas de régression")
+    parser.add_argument('--threshold', type=float, default=SUITE_THRESHOLD,
+                        help="facteur de temps toléré avant régression")
+    args = parser.parse_args(argv)
+    
+    if not args.suite:
+        for name in args.names or list(BENCHMARKS):
+            BENCHMARKS[name]()
+        return 0
+    
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"Suite de régression - {', '.join(str(size) for size in sizes)} nodes")
+    current = run_suite(args.names or None, sizes, args.repeat)
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Résultats enregistrés: {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"  RÉGRESSION {regression}")
+        print(f"{len(regressions)} régression(s) par rapport à {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""Nettoyage hors interface d'un dossier de scènes Maya
+
+Chaque scène est ouverte une seule fois, passe par toutes les étapes de nettoyage
+demandées (voir CLEANUP_STAGES dans customPlugins) puis est enregistrée une seule fois.
+Les scènes sont réparties sur plusieurs process mayapy (un interpréteur par worker) ;
+chaque résultat est ajouté à un journal, ce qui permet de reprendre un lot interrompu
+en relançant la même commande. Le rapport JSON donne les temps et les nombres de
+nodes traités par fichier et par étape.
+
+    python cleanupRunner.py scenes/                          # toutes les étapes, en place
+    python cleanupRunner.py scenes/ --stages unknown,pasted --workers 4 --output-dir propres/
+    python cleanupRunner.py scenes/ --report rapport.json    # relancer reprend où le lot s'est arrêté
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+# Préfixe des lignes du protocole worker -> contrôleur (le reste de la sortie est du log Maya)
+RESULT_PREFIX = "@@cleanup@@ "
+
+SCENE_EXTENSIONS = ('.ma', '.mb')
+SCENE_TYPES = {'.ma': 'mayaAscii', '.mb': 'mayaBinary'}
+
+
+def default_mayapy():
+    """mayapy de MAYA_LOCATION s'il est défini, sinon celui du PATH"""
+    executable = 'mayapy.exe' if sys.platform == 'win32' else 'mayapy'
+    maya_location = os.environ.get('MAYA_LOCATION')
+    if maya_location:
+        return os.path.join(maya_location, 'bin', executable)
+    return executable
+
+
+def cleanup_stage_names():
+    """Noms des étapes de CLEANUP_STAGES (customPlugins)
+
+    Le contrôleur tourne souvent hors de Maya : sans maya.cmds, les noms sont lus
+    dans la source du module plutôt que recopiés ici.
+    """
+    try:
+        from customPlugins import CLEANUP_STAGES
+        return list(CLEANUP_STAGES)
+    except ImportError:
+        import ast
+
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'customPlugins.py')
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == 'CLEANUP_STAGES'
+                                                    for target in node.targets):
+                return [ast.literal_eval(key) for key in node.value.keys]
+        raise
+
+
+def find_scenes(paths, recursive=False):
+    """Liste triée des scènes .ma/.mb des fichiers et dossiers donnés"""
+    scenes = []
+    for path in paths:
+        if os.path.isfile(path):
+            scenes.append(os.path.abspath(path))
+            continue
+        for root, dirs, files in os.walk(path):
+            scenes.extend(os.path.abspath(os.path.join(root, name)) for name in files
+                          if name.lower().endswith(SCENE_EXTENSIONS))
+            if not recursive:
+                break
+    return sorted(set(scenes))
+
+
+def output_path(scene, output_dir, input_root):
+    """Chemin d'enregistrement : en place, ou même arborescence sous output_dir"""
+    if not output_dir:
+        return scene
+    relative = os.path.relpath(scene, input_root) if input_root else os.path.basename(scene)
+    return os.path.join(os.path.abspath(output_dir), relative)
+
+
+def journal_key(scene, stages):
+    return f"{scene}|{','.join(stages)}"
+
+
+def load_journal(path, stages):
+    """Résultats déjà réussis du journal {clé: résultat} ; les échecs seront retentés"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # ligne tronquée par un crash
+            if record.get('status') == 'ok':
+                done[journal_key(record['path'], stages)] = record
+    return done
+
+
+# --- Worker (exécuté dans mayapy) -------------------------------------------
+
+def clean_scene(scene, destination, stages):
+    """Ouvre une scène, applique le pipeline et l'enregistre ; retourne le résultat"""
+    import maya.cmds as cmds
+    import customPlugins
+
+    record = {'path': scene, 'output': destination, 'status': 'ok', 'error': None, 'stages': {}}
+    start = time.perf_counter()
+    try:
+        cmds.file(scene, open=True, force=True, prompt=False)
+        record['open_seconds'] = round(time.perf_counter() - start, 3)
+
+        record['stages'] = customPlugins.run_cleanup_pipeline(stages)
+        failed = [name for name, result in record['stages'].items() if 'error' in result]
+        if failed:
+            record['status'] = 'partial'
+            record['error'] = f"étape(s) en échec: {', '.join(failed)}"
+
+        save_start = time.perf_counter()
+        directory = os.path.dirname(destination)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        if destination != scene:
+            cmds.file(rename=destination)
+        scene_type = SCENE_TYPES.get(os.path.splitext(destination)[1].lower(), 'mayaAscii')
+        cmds.file(save=True, force=True, type=scene_type)
+        record['save_seconds'] = round(time.perf_counter() - save_start, 3)
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = str(e)
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_worker(stages):
+    """Boucle du worker : un message JSON {scene, output} par ligne sur stdin"""
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+
+    # Le module du plugin est à côté de ce script
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    protocol = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        # Les messages des outils vont dans stderr pour ne pas brouiller le protocole
+        with contextlib.redirect_stdout(sys.stderr):
+            record = clean_scene(job['scene'], job['output'], stages)
+        protocol.write(RESULT_PREFIX + json.dumps(record) + "\n")
+        protocol.flush()
+
+    maya.standalone.uninitialize()
+
+
+# --- Contrôleur --------------------------------------------------------------
+
+class CleanupWorker(object):
+    """Process mayapy persistant ; relancé s'il meurt en cours de fichier"""
+
+    def __init__(self, mayapy, stages, log):
+        self.command = [mayapy, os.path.abspath(__file__), '--worker', '--stages', ','.join(stages)]
+        self.log = log
+        self.process = None
+
+    def ensure_started(self):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self.log,
+                universal_newlines=True,
+                bufsize=1,
+            )
+
+    def process_scene(self, scene, destination):
+        """Envoie une scène au worker et attend son résultat"""
+        self.ensure_started()
+        try:
+            self.process.stdin.write(json.dumps({'scene': scene, 'output': destination}) + "\n")
+            self.process.stdin.flush()
+            for line in self.process.stdout:
+                if line.startswith(RESULT_PREFIX):
+                    return json.loads(line[len(RESULT_PREFIX):])
+        except (OSError, ValueError) as e:
+            error = str(e)
+        else:
+            error = None
+
+        # Fin de sortie sans résultat : le process a planté sur cette scène
+        return_code = self.process.wait()
+        self.process = None
+        return {'path': scene, 'output': destination, 'status': 'crashed', 'stages': {},
+                'error': error or f"mayapy s'est arrêté (code {return_code})"}
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def run_cleanup(paths, stages, workers=2, mayapy=None, output_dir=None, report_path=None,
+                journal_path=None, recursive=False):
+    """Nettoie toutes les scènes trouvées et écrit le rapport JSON ; retourne le rapport"""
+    scenes = find_scenes(paths, recursive=recursive)
+    input_root = os.path.abspath(paths[0]) if len(paths) == 1 and os.path.isdir(paths[0]) else None
+    report_path = report_path or os.path.abspath('cleanup_report.json')
+    journal_path = journal_path or report_path + '.journal'
+
+    done = load_journal(journal_path, stages)
+    todo = [scene for scene in scenes if journal_key(scene, stages) not in done]
+    print(f"{len(scenes)} scène(s), {len(scenes) - len(todo)} déjà traitée(s), {len(todo)} à traiter "
+          f"sur {min(workers, len(todo))} worker(s)")
+
+    pending = queue.Queue()
+    for scene in todo:
+        pending.put(scene)
+
+    records = list(done.values())
+    lock = threading.Lock()
+    start = time.perf_counter()
+    log_path = report_path + '.log'
+
+    with open(journal_path, 'a') as journal, open(log_path, 'a') as log:
+        def work():
+            worker = CleanupWorker(mayapy or default_mayapy(), stages, log)
+            try:
+                while True:
+                    try:
+                        scene = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    record = worker.process_scene(scene, output_path(scene, output_dir, input_root))
+                    with lock:
+                        records.append(record)
+                        journal.write(json.dumps(record) + "\n")
+                        journal.flush()
+                        os.fsync(journal.fileno())
+                        counts = ", ".join(f"{name}={result['count']}" for name, result in record['stages'].items())
+                        print(f"[{len(records)}/{len(scenes)}] {record['status']:<8} {record.get('seconds', 0):7.2f}s "
+                              f"{os.path.basename(scene)} {counts}")
+            finally:
+                worker.stop()
+
+        threads = [threading.Thread(target=work) for _ in range(max(1, min(workers, len(todo))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    totals = {stage: sum(r['stages'].get(stage, {}).get('count', 0) for r in records) for stage in stages}
+    statuses = {}
+    for record in records:
+        statuses[record['status']] = statuses.get(record['status'], 0) + 1
+
+    report = {
+        'stages': stages,
+        'workers': workers,
+        'seconds': round(time.perf_counter() - start, 3),
+        'statuses': statuses,
+        'totals': totals,
+        'files': sorted(records, key=lambda r: r['path']),
+    }
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("=" * 50)
+    print(f"Nettoyage terminé en {report['seconds']:.1f}s")
+    for status, count in sorted(statuses.items()):
+        print(f"  - {status}: {count}")
+    for stage, count in totals.items():
+        print(f"  - {stage}: {count} node(s)")
+    print(f"  - Rapport: {report_path}")
+    print("=" * 50)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nettoyage d'un lot de scènes Maya avec mayapy")
+    parser.add_argument('paths', nargs='*', help="scènes ou dossiers de scènes")
+    parser.add_argument('--stages', default='unknown,pasted,empty_groups,unused',
+                        help="étapes dans l'ordre, séparées par des virgules (défaut: %(default)s)")
+    parser.add_argument('--workers', type=int, default=2, help="nombre de process mayapy (défaut: %(default)s)")
+    parser.add_argument('--mayapy', help="exécutable mayapy (défaut: MAYA_LOCATION/bin/mayapy)")
+    parser.add_argument('--output-dir', help="dossier de sortie (défaut: scènes modifiées en place)")
+    parser.add_argument('--report', help="rapport JSON (défaut: cleanup_report.json)")
+    parser.add_argument('--journal', help="journal de reprise (défaut: <rapport>.journal)")
+    parser.add_argument('--recursive', action='store_true', help="parcourt aussi les sous-dossiers")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    if args.worker:
+        run_worker(stages)
+        return 0
+
+    if not args.paths:
+        parser.error("aucune scène ou dossier donné")
+
+    known = cleanup_stage_names()
+    unknown = [stage for stage in stages if stage not in known]
+    if unknown:
+        parser.error(f"étape(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(known)})")
+
+    report = run_cleanup(args.paths, stages, workers=args.workers, mayapy=args.mayapy,
+                         output_dir=args.output_dir, report_path=args.report,
+                         journal_path=args.journal, recursive=args.recursive)
+    return 0 if set(report['statuses']) <= {'ok'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
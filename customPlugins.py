@@ -3,22 +3,541 @@ import maya.OpenMaya as om
 import maya.OpenMayaMPx as ommpx
 import sys
 import os
+import re
+import json
+import time
+
+
+# Journal JSONL des exécutions d'outils (voir run_tool) : chemin, taille max et rotations gardées
+TOOL_LOG_PATH = os.environ.get('CUSTOM_PLUGINS_TOOL_LOG') or os.path.join(
+    os.path.expanduser('~'), 'maya', 'customPlugins', 'tools.jsonl')
+TOOL_LOG_MAX_BYTES = 5 * 1024 * 1024
+TOOL_LOG_BACKUPS = 3
+
+# Capture cProfile de chaque outil lancé par run_tool (fichiers .prof à côté du journal)
+TOOL_PROFILING = False
+
+# Exécutions en cours (la plus récente à la fin) et logger du journal
+_tool_runs = []
+_tool_logger = []
+
+
+class CommandCounter(object):
+    """Remplace maya.cmds dans le module pendant un outil : compte les appels par commande"""
+    
+    def __init__(self, module):
+        self.module = module
+        self.counts = {}
+        self._wrappers = {}
+    
+    def __getattr__(self, name):
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            function = getattr(self.module, name)
+            if not callable(function):
+                return function
+            counts = self.counts
+            
+            def wrapper(*args, **kwargs):
+                counts[name] = counts.get(name, 0) + 1
+                return function(*args, **kwargs)
+            self._wrappers[name] = wrapper
+        return wrapper
+    
+    def total(self):
+        return sum(self.counts.values())
+
+
+class ToolRun(object):
+    """Mesures d'une exécution d'outil : temps et nombre de commandes par phase"""
+    
+    def __init__(self, name, counter):
+        self.name = name
+        self.counter = counter
+        self.phases = {}
+        self._phase = None
+        self.start = time.perf_counter()
+    
+    def start_phase(self, name):
+        now = time.perf_counter()
+        commands = self.counter.total()
+        if self._phase:
+            phase_name, phase_start, phase_commands = self._phase
+            phase = self.phases.setdefault(phase_name, {'seconds': 0.0, 'commands': 0})
+            phase['seconds'] = round(phase['seconds'] + now - phase_start, 6)
+            phase['commands'] += commands - phase_commands
+        self._phase = (name, now, commands) if name else None
+
+
+def tool_phase(name):
+    """Termine la phase en cours de l'outil et démarre la phase name (query, mutate, report...)
+    
+    Sans effet hors de run_tool : les outils peuvent baliser leurs phases sans coût.
+    """
+    if _tool_runs:
+        _tool_runs[-1].start_phase(name)
+
+
+def get_tool_logger():
+    """Logger du journal des outils (fichier JSONL avec rotation), créé au premier appel
+    et recréé si TOOL_LOG_PATH change"""
+    if _tool_logger and _tool_logger[0].handlers[0].baseFilename != os.path.abspath(TOOL_LOG_PATH):
+        _tool_logger[0].handlers[0].close()
+        del _tool_logger[:]
+    if not _tool_logger:
+        import logging
+        import logging.handlers
+        
+        directory = os.path.dirname(TOOL_LOG_PATH)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        logger = logging.getLogger('customPlugins.tools')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(
+            TOOL_LOG_PATH, maxBytes=TOOL_LOG_MAX_BYTES, backupCount=TOOL_LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.handlers[:] = [handler]
+        _tool_logger.append(logger)
+    return _tool_logger[0]
+
+
+def save_tool_profile(profiler, name):
+    """Enregistre une capture cProfile à côté du journal ; retourne son chemin"""
+    directory = os.path.join(os.path.dirname(TOOL_LOG_PATH), 'profiles')
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    path = os.path.join(directory, f"{re.sub(r'[^A-Za-z0-9_]+', '_', name)}_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def run_tool(name, func, *args, **kwargs):
+    """Exécute un outil en mesurant son temps, ses commandes Maya et ses phases
+    
+    Pendant l'outil, cmds est remplacé dans le module par un CommandCounter ; le
+    résultat (durée, appels par commande, phases balisées par tool_phase, erreur)
+    est ajouté au journal JSONL TOOL_LOG_PATH. Avec TOOL_PROFILING ou profile=True,
+    une capture cProfile est enregistrée. Un outil appelé par un autre est compté
+    dans la mesure de l'appelant.
+    """
+    profile = kwargs.pop('profile', TOOL_PROFILING)
+    if _tool_runs:
+        return func(*args, **kwargs)
+    
+    module_globals = globals()
+    counter = CommandCounter(module_globals['cmds'])
+    run = ToolRun(name, counter)
+    _tool_runs.append(run)
+    module_globals['cmds'] = counter
+    
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    status, error = 'ok', None
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        status, error = 'error', str(e)
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        run.start_phase(None)
+        seconds = time.perf_counter() - run.start
+        module_globals['cmds'] = counter.module
+        _tool_runs.pop()
+        
+        record = {
+            'tool': name,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scene': counter.module.file(query=True, sceneName=True) or "untitled",
+            'status': status,
+            'error': error,
+            'seconds': round(seconds, 6),
+            'commands': counter.total(),
+            'by_command': dict(sorted(counter.counts.items(), key=lambda item: item[1], reverse=True)),
+            'phases': run.phases,
+        }
+        try:
+            if profiler:
+                record['profile'] = save_tool_profile(profiler, name)
+            get_tool_logger().info(json.dumps(record))
+        except (OSError, IOError) as e:
+            print(f"Journal des outils indisponible: {e}")
+        print(f"{name}: {seconds:.2f}s, {record['commands']} commande(s) Maya")
+
+
+def read_tool_log(tool=None, path=None):
+    """Enregistrements du journal (rotations comprises, du plus ancien au plus récent)"""
+    path = path or TOOL_LOG_PATH
+    paths = [f"{path}.{i}" for i in range(TOOL_LOG_BACKUPS, 0, -1)] + [path]
+    records = []
+    for log_path in paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if tool is None or record.get('tool') == tool:
+                    records.append(record)
+    return records
+
+
+# Sous-chaînes de nom suivies par l'index (nodes à renommer par remove_pasted_prefix)
+SCENE_INDEX_WATCHED = ('pasted__',)
+
+# Opérations de fichier pendant lesquelles l'index est suspendu puis reconstruit
+SCENE_INDEX_FILE_EVENTS = ('Open', 'New', 'Import', 'CreateReference', 'LoadReference',
+                           'UnloadReference', 'RemoveReference')
+
+
+def node_uuids(nodes):
+    """UUID de chaque node (nom ou chemin), dans l'ordre des nodes
+    
+    Une résolution API par node : ls(nodes, uuid=True) ne garantit ni l'ordre ni le
+    nombre des résultats (nodes dédoublonnés, chemins d'instances).
+    """
+    import maya.api.OpenMaya as om2
+    
+    uuids = []
+    for node in nodes:
+        selection = om2.MSelectionList()
+        selection.add(node)
+        uuids.append(om2.MFnDependencyNode(selection.getDependNode(0)).uuid().asString())
+    return uuids
+
+
+class SceneIndex(object):
+    """Index des nodes de la scène, tenu à jour par événements
+    
+    Seaux par type (exact et hérités), parents/enfants du DAG et nom -> UUID, tous
+    indexés par UUID. Un node instancié a plusieurs parents. Construit une fois par
+    rebuild() puis mis à jour par node_added, node_removed, node_renamed,
+    node_parent_added et node_parent_removed, appelés par les callbacks Maya (voir
+    enable_scene_index) ou par n'importe quelle autre source d'événements.
+    """
+    
+    def __init__(self):
+        self._inherited = {}
+        self.paused = False
+        self.version = 0         # incrémenté à chaque changement (validation des caches)
+        self.clear()
+    
+    def clear(self):
+        self.version += 1
+        self.names = {}          # uuid -> nom court
+        self.types = {}          # uuid -> type exact
+        self.by_name = {}        # nom court -> {uuid}
+        self.by_type = {}        # type (et types hérités) -> {uuid}
+        self.by_exact_type = {}  # type exact -> {uuid}
+        self.parents = {}        # uuid -> {uuid des parents DAG} (dict ordonné, parent principal en premier)
+        self.children = {}       # uuid -> {uuid}
+        self.dag = set()
+        self.watched = {substring: set() for substring in SCENE_INDEX_WATCHED}
+    
+    def inherited_types(self, node_type):
+        """Type et types parents (mis en cache : un appel Maya par type rencontré)"""
+        if node_type not in self._inherited:
+            self._inherited[node_type] = cmds.nodeType(node_type, isTypeName=True, inherited=True) or [node_type]
+        return self._inherited[node_type]
+    
+    def rebuild(self):
+        """Reconstruit l'index à partir d'un ls sur toute la scène (un chemin par instance)"""
+        start = time.perf_counter()
+        self.clear()
+        listing = cmds.ls(long=True, showType=True, allPaths=True) or []
+        paths = listing[::2]
+        path_uuids = dict(zip(paths, node_uuids(paths)))
+        for path, node_type in zip(paths, listing[1::2]):
+            uuid = path_uuids[path]
+            parent_path, _, name = path.rpartition('|')
+            parent = path_uuids.get(parent_path)
+            if uuid in self.names:
+                # Autre chemin d'un node instancié
+                self.node_parent_added(uuid, parent)
+            else:
+                self.node_added(uuid, name, node_type, parent)
+        self.paused = False
+        print(f"Index de scène: {len(self.names)} node(s) indexé(s) en {time.perf_counter() - start:.3f}s")
+    
+    # --- Événements ---------------------------------------------------------
+    
+    def node_added(self, uuid, name, node_type, parent=None):
+        if self.paused:
+            return
+        self.version += 1
+        self.names[uuid] = name
+        self.types[uuid] = node_type
+        self.by_name.setdefault(name, set()).add(uuid)
+        self.by_exact_type.setdefault(node_type, set()).add(uuid)
+        inherited = self.inherited_types(node_type)
+        for type_name in inherited:
+            self.by_type.setdefault(type_name, set()).add(uuid)
+        if 'dagNode' in inherited:
+            self.dag.add(uuid)
+        for substring, uuids in self.watched.items():
+            if substring in name:
+                uuids.add(uuid)
+        if parent:
+            self.node_parent_added(uuid, parent)
+    
+    def node_removed(self, uuid):
+        if self.paused or uuid not in self.names:
+            return
+        self.version += 1
+        name = self.names.pop(uuid)
+        node_type = self.types.pop(uuid)
+        self.by_name[name].discard(uuid)
+        if not self.by_name[name]:
+            del self.by_name[name]
+        self.by_exact_type[node_type].discard(uuid)
+        for type_name in self.inherited_types(node_type):
+            self.by_type[type_name].discard(uuid)
+        self.dag.discard(uuid)
+        for uuids in self.watched.values():
+            uuids.discard(uuid)
+        for parent in self.parents.pop(uuid, ()):
+            if parent in self.children:
+                self.children[parent].discard(uuid)
+        # Les enfants supprimés avec ce node envoient leur propre événement
+        self.children.pop(uuid, None)
+    
+    def node_renamed(self, uuid, new_name):
+        if self.paused or uuid not in self.names:
+            return
+        self.version += 1
+        old_name = self.names[uuid]
+        self.by_name[old_name].discard(uuid)
+        if not self.by_name[old_name]:
+            del self.by_name[old_name]
+        self.names[uuid] = new_name
+        self.by_name.setdefault(new_name, set()).add(uuid)
+        for substring, uuids in self.watched.items():
+            if substring in new_name:
+                uuids.add(uuid)
+            else:
+                uuids.discard(uuid)
+    
+    def node_parent_added(self, uuid, parent=None):
+        """Nouveau parent (MDagMessage parentAdded) : reparentage ou nouvelle instance
+        
+        parent : uuid du parent, None pour le monde.
+        """
+        if self.paused or not parent:
+            return
+        self.version += 1
+        self.parents.setdefault(uuid, {})[parent] = None
+        self.children.setdefault(parent, set()).add(uuid)
+    
+    def node_parent_removed(self, uuid, parent=None):
+        """Parent retiré (MDagMessage parentRemoved) : les autres instances sont conservées"""
+        if self.paused or not parent:
+            return
+        self.version += 1
+        parents = self.parents.get(uuid)
+        if parents is not None:
+            parents.pop(parent, None)
+            if not parents:
+                del self.parents[uuid]
+        if parent in self.children:
+            self.children[parent].discard(uuid)
+    
+    def node_reparented(self, uuid, parent=None):
+        """Déplace un node (toutes ses instances) sous parent, None pour le monde"""
+        for previous in list(self.parents.get(uuid, ())):
+            self.node_parent_removed(uuid, previous)
+        self.node_parent_added(uuid, parent)
+    
+    # --- Requêtes -----------------------------------------------------------
+    
+    def nodes_of_type(self, node_types, exact=False):
+        """UUIDs des nodes d'un ou plusieurs types (types hérités compris sauf si exact)"""
+        buckets = self.by_exact_type if exact else self.by_type
+        if isinstance(node_types, str):
+            return set(buckets.get(node_types, ()))
+        result = set()
+        for node_type in node_types:
+            result.update(buckets.get(node_type, ()))
+        return result
+    
+    def path(self, uuid):
+        """Chemin long (par les parents principaux) d'un node DAG, nom court sinon"""
+        if uuid not in self.dag:
+            return self.names[uuid]
+        parts = []
+        while uuid:
+            parts.append(self.names[uuid])
+            uuid = next(iter(self.parents.get(uuid, ())), None)
+        return '|' + '|'.join(reversed(parts))
+    
+    def paths(self, uuids):
+        return [self.path(uuid) for uuid in uuids]
+    
+    def parent_uuids(self, uuids):
+        """Parents distincts des nodes (tous ceux d'un node instancié), dans l'ordre"""
+        return list(dict.fromkeys(parent for uuid in uuids for parent in self.parents.get(uuid, ())))
+    
+    def empty_groups(self):
+        """Comme find_empty_groups : (groupes vides du plus profond au moins profond, racines)"""
+        groups = self.by_exact_type.get('transform', set())
+        empty = []
+        empty_set = set()
+        stack = [uuid for uuid in groups if not self.children.get(uuid)]
+        while stack:
+            uuid = stack.pop()
+            if uuid in empty_set:
+                continue
+            empty.append(uuid)
+            empty_set.add(uuid)
+            for parent in self.parents.get(uuid, ()):
+                if parent in groups and parent not in empty_set and empty_set.issuperset(self.children[parent]):
+                    stack.append(parent)
+        
+        paths = {uuid: self.path(uuid) for uuid in empty}
+        ordered = sorted(empty, key=lambda uuid: paths[uuid].count('|'), reverse=True)
+        # Un groupe dont un parent n'est pas supprimé (racine, ou instance ailleurs) est supprimé lui-même
+        roots = [uuid for uuid in ordered
+                 if not self.parents.get(uuid) or not empty_set.issuperset(self.parents[uuid])]
+        return [paths[uuid] for uuid in ordered], [paths[uuid] for uuid in roots]
+
+
+_scene_index = None
+_scene_index_callbacks = []
+
+
+def get_scene_index():
+    """Index de scène actif, ou None si enable_scene_index() n'a pas été appelé"""
+    return _scene_index
+
+
+def enable_scene_index(event_source=None):
+    """Construit l'index de scène et le tient à jour
+    
+    Par défaut via les callbacks Maya (MDGMessage, MNodeMessage, MDagMessage) ;
+    event_source peut fournir d'autres événements (objet avec add_listener(index)).
+    Les outils de sélection et de nettoyage l'utilisent ensuite automatiquement.
+    """
+    global _scene_index
+    disable_scene_index()
+    _scene_index = SceneIndex()
+    _scene_index.rebuild()
+    if event_source is not None:
+        event_source.add_listener(_scene_index)
+    else:
+        register_scene_index_callbacks(_scene_index)
+    return _scene_index
+
+
+def disable_scene_index():
+    """Retire les callbacks et abandonne l'index : les outils interrogent de nouveau Maya"""
+    global _scene_index
+    if _scene_index_callbacks:
+        import maya.api.OpenMaya as om2
+        while _scene_index_callbacks:
+            om2.MMessage.removeCallback(_scene_index_callbacks.pop())
+    _scene_index = None
+
+
+def register_scene_index_callbacks(index):
+    """Branche les messages Maya sur les événements de l'index"""
+    import maya.api.OpenMaya as om2
+    
+    def uuid_of(mobject):
+        return om2.MFnDependencyNode(mobject).uuid().asString()
+    
+    def parent_uuid(dag_path):
+        # Le monde (chemin vide) n'a pas d'uuid
+        return uuid_of(dag_path.node()) if dag_path.length() else None
+    
+    def node_added(mobject, client_data):
+        fn_node = om2.MFnDependencyNode(mobject)
+        parent = None
+        if mobject.hasFn(om2.MFn.kDagNode):
+            fn_dag = om2.MFnDagNode(mobject)
+            if fn_dag.parentCount() and not fn_dag.parent(0).hasFn(om2.MFn.kWorld):
+                parent = uuid_of(fn_dag.parent(0))
+        index.node_added(fn_node.uuid().asString(), fn_node.name(), fn_node.typeName, parent)
+    
+    def node_removed(mobject, client_data):
+        index.node_removed(uuid_of(mobject))
+    
+    def node_renamed(mobject, previous_name, client_data):
+        index.node_renamed(uuid_of(mobject), om2.MFnDependencyNode(mobject).name())
+    
+    # Un reparentage envoie parentRemoved puis parentAdded ; parent -add seulement parentAdded
+    def parent_added(child_path, parent_path, client_data):
+        index.node_parent_added(uuid_of(child_path.node()), parent_uuid(parent_path))
+    
+    def parent_removed(child_path, parent_path, client_data):
+        index.node_parent_removed(uuid_of(child_path.node()), parent_uuid(parent_path))
+    
+    def pause(client_data):
+        index.paused = True
+    
+    def rebuild(client_data):
+        index.rebuild()
+    
+    _scene_index_callbacks.extend([
+        om2.MDGMessage.addNodeAddedCallback(node_added, 'dependNode'),
+        om2.MDGMessage.addNodeRemovedCallback(node_removed, 'dependNode'),
+        om2.MNodeMessage.addNameChangedCallback(om2.MObject(), node_renamed),
+        om2.MDagMessage.addParentAddedCallback(parent_added),
+        om2.MDagMessage.addParentRemovedCallback(parent_removed),
+    ])
+    # Les opérations de fichier ajoutent ou retirent des milliers de nodes : reconstruction
+    for event in SCENE_INDEX_FILE_EVENTS:
+        _scene_index_callbacks.append(om2.MSceneMessage.addCallback(getattr(om2.MSceneMessage, f"kBefore{event}"), pause))
+        _scene_index_callbacks.append(om2.MSceneMessage.addCallback(getattr(om2.MSceneMessage, f"kAfter{event}"), rebuild))
+
+
+def get_mesh_transforms(nodes=None):
+    """Retourne les transforms (chemins longs) qui possèdent au moins un shape mesh
+    
+    Résolution en quelques appels groupés au lieu d'un listRelatives/nodeType par node :
+    - sans argument : ls(type='mesh') sur toute la scène puis une seule résolution des parents
+    - avec une liste de nodes : un seul listRelatives(type='mesh') sur toute la liste
+    L'ordre des nodes fournis est conservé.
+    """
+    if nodes is None:
+        index = get_scene_index()
+        if index is not None:
+            # Réponse depuis l'index, sans interroger la scène
+            return index.paths(index.parent_uuids(index.nodes_of_type('mesh')))
+        mesh_shapes = cmds.ls(type='mesh', long=True) or []
+    else:
+        if not nodes:
+            return []
+        mesh_shapes = cmds.listRelatives(nodes, shapes=True, type='mesh', fullPath=True) or []
+    
+    if not mesh_shapes:
+        return []
+    
+    # Une seule résolution des parents pour tous les shapes
+    parents = cmds.listRelatives(mesh_shapes, parent=True, fullPath=True) or []
+    
+    if nodes is None:
+        # Déduplique en conservant l'ordre (plusieurs shapes peuvent partager un transform)
+        return list(dict.fromkeys(parents))
+    
+    # Conserve l'ordre de la sélection d'origine
+    mesh_parents = set(parents)
+    nodes_long = cmds.ls(nodes, long=True) or []
+    return [obj for obj in dict.fromkeys(nodes_long) if obj in mesh_parents]
 
 
 def select_only_meshes():
     """Sélectionne uniquement les mesh dans la sélection actuelle"""
-    # Récupère la sélection actuelle ou tous les objets si rien n'est sélectionné
-    selection = cmds.ls(sl=True, long=True) or cmds.ls(long=True)
+    # Récupère la sélection actuelle, ou toute la scène si rien n'est sélectionné
+    selection = cmds.ls(sl=True, long=True)
     
-    meshes = []
-    for obj in selection:
-        # Récupère les shapes de l'objet
-        shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
-        for shape in shapes:
-            # Vérifie si c'est un mesh
-            if cmds.nodeType(shape) == 'mesh':
-                meshes.append(obj)
-                break
+    meshes = get_mesh_transforms(selection or None)
     
     # Sélectionne les mesh trouvés
     if meshes:
@@ -36,8 +555,8 @@ def delete_history():
     meshes = select_only_meshes()
     
     if meshes:
-        for obj in meshes:
-            cmds.delete(obj, ch=True)
+        # Un seul appel pour tous les mesh
+        cmds.delete(meshes, ch=True)
         print(f"Historique supprimé pour {len(meshes)} mesh(es)")
     else:
         print("Aucun mesh sélectionné")
@@ -54,8 +573,30 @@ def freeze_transform():
         print("Aucun mesh sélectionné")
 
 
-def assign_unique_materials():
-    """Assigne un matériau aiStandardSurface unique à chaque mesh sélectionné"""
+def create_material_network(name, shader_attrs=None):
+    """Crée un réseau aiStandardSurface + shading group et retourne (shader, shading_group)"""
+    shader = cmds.shadingNode('aiStandardSurface', asShader=True, name=f"{name}_mat")
+    for attr, value in (shader_attrs or {}).items():
+        if isinstance(value, (list, tuple)):
+            cmds.setAttr(f"{shader}.{attr}", *value)
+        else:
+            cmds.setAttr(f"{shader}.{attr}", value)
+    
+    shading_group = cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"{name}_SG")
+    cmds.connectAttr(f"{shader}.outColor", f"{shading_group}.surfaceShader", force=True)
+    return shader, shading_group
+
+
+def assign_unique_materials(batched=True, share_identical=False, shader_attrs=None, verbose=1):
+    """Assigne un matériau aiStandardSurface unique à chaque mesh sélectionné
+    
+    batched : construit le réseau une fois puis le clone (un duplicate -upstreamNodes et
+    un sets -forceElement par matériau), le tout dans un seul undo chunk et sans
+    rafraîchir le viewport (False : ancienne boucle)
+    share_identical : un seul matériau par géométrie identique (hash_meshes)
+    shader_attrs : valeurs d'attributs appliquées au shader template (ex: {'base': 0.8})
+    verbose : 0 = silencieux, 1 = résumé, 2 = une ligne par mesh
+    """
     # Vérifie si il y a une sélection
     selection = cmds.ls(sl=True)
     if not selection:
@@ -69,180 +610,820 @@ def assign_unique_materials():
         cmds.error("Aucun mesh trouvé dans la sélection !")
         return
     
-    # Crée un matériau unique pour chaque mesh
-    for mesh in meshes:
-        # Récupère le nom court de l'objet
-        short_name = mesh.split('|')[-1]
-        
-        # Crée un shader aiStandardSurface
-        shader = cmds.shadingNode('aiStandardSurface', asShader=True, name=f"{short_name}_mat")
-        
-        # Crée un shading group
-        shading_group = cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"{short_name}_SG")
+    start = time.perf_counter()
+    
+    if not batched:
+        # Ancienne boucle : un réseau créé de zéro et un message par mesh
+        for mesh in meshes:
+            short_name = mesh.split('|')[-1]
+            shader, shading_group = create_material_network(short_name, shader_attrs=shader_attrs)
+            cmds.sets(mesh, edit=True, forceElement=shading_group)
+            print(f"Matériau '{shader}' assigné à '{short_name}'")
+        material_count = len(meshes)
+    else:
+        # Regroupe les mesh qui recevront le même matériau
+        if share_identical:
+            # Shape de chaque transform en un appel, puis hash de géométrie (avec son cache)
+            shapes = cmds.listRelatives(meshes, shapes=True, type='mesh', noIntermediate=True, fullPath=True) or []
+            shape_of = {}
+            for shape in shapes:
+                shape_of.setdefault(shape.rpartition('|')[0], shape)
+            shape_hashes = hash_meshes(list(shape_of.values()), verbose=False)
+            groups = {}
+            for mesh in meshes:
+                shape = shape_of.get(mesh)
+                groups.setdefault(shape_hashes[shape][0] if shape else mesh, []).append(mesh)
+            mesh_groups = list(groups.values())
+        else:
+            mesh_groups = [[mesh] for mesh in meshes]
         
-        # Connecte le shader au shading group
-        cmds.connectAttr(f"{shader}.outColor", f"{shading_group}.surfaceShader", force=True)
+        cmds.undoInfo(openChunk=True, chunkName="assignUniqueMaterials")
+        cmds.refresh(suspend=True)
+        try:
+            # Réseau template du premier groupe : les suivants en reçoivent une copie complète
+            # (shader, shading group, connexion) en un seul duplicate -upstreamNodes
+            template_name = mesh_groups[0][0].split('|')[-1]
+            template_shader, template_group = create_material_network(template_name, shader_attrs)
+            for group in mesh_groups[1:]:
+                short_name = group[0].split('|')[-1]
+                shading_group = cmds.duplicate(template_group, upstreamNodes=True, name=f"{short_name}_SG")[0]
+                # L'ordre des copies amont n'est pas garanti : le shader est lu sur le SG
+                shader = cmds.listConnections(f"{shading_group}.surfaceShader", source=True, destination=False)[0]
+                shader = cmds.rename(shader, f"{short_name}_mat")
+                cmds.sets(group, edit=True, forceElement=shading_group)
+                if verbose >= 2:
+                    print(f"Matériau '{shader}' assigné à {len(group)} mesh(es) ('{short_name}')")
+            # Le template n'est assigné qu'une fois dupliqué : ses copies n'ont pas de membres
+            cmds.sets(mesh_groups[0], edit=True, forceElement=template_group)
+            if verbose >= 2:
+                print(f"Matériau '{template_shader}' assigné à {len(mesh_groups[0])} mesh(es) ('{template_name}')")
+        finally:
+            cmds.refresh(suspend=False)
+            cmds.undoInfo(closeChunk=True)
+        material_count = len(mesh_groups)
+    
+    duration = time.perf_counter() - start
+    rate = len(meshes) / duration if duration > 0 else float('inf')
+    if verbose >= 1 or not batched:
+        print(f"Matériaux assignés à {len(meshes)} mesh(es) ({material_count} matériau(x)) "
+              f"en {duration:.2f}s ({rate:.0f} mesh/s)")
+    
+    return {'meshes': len(meshes), 'materials': material_count, 'seconds': duration}
+
+
+# Cache des hashs de géométrie : uuid du shape -> (tolérance, hash, octets estimés).
+# Une entrée est retirée dès que le shape est marqué dirty (MNodeMessage), et tout le
+# cache à l'ouverture ou à la création d'une scène, où les uuids peuvent se répéter.
+_geometry_hash_cache = {}
+_geometry_dirty_callbacks = {}  # uuid du shape -> id du callback de dirty
+
+
+def hash_mesh_buffers(points, counts, connects, tolerance=1e-5, uv_sets=(), color_sets=()):
+    """Hash de la topologie, des positions et des UVs/couleurs d'un mesh, indépendant de sa transformation
+    
+    points : positions en espace objet à plat (x, y, z, x, y, z...)
+    counts / connects : nombre de sommets par face et indices des sommets par face
+    tolerance : écart en dessous duquel deux valeurs (positions, UVs, couleurs) sont identiques
+    uv_sets : (nom, u, v, UVs par face, indices des UVs) par UV set (voir read_mesh_sets)
+    color_sets : (nom, r, g, b, a à plat par sommet de face) par color set
+    Utilise NumPy si disponible ; le résultat est identique sans NumPy.
+    """
+    import array
+    import hashlib
+    
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    
+    def indices(values):
+        if np is not None:
+            return np.asarray(values, dtype=np.int64).tobytes()
+        return array.array('q', values).tobytes()
+    
+    def quantized(values):
+        if np is not None:
+            return np.round(np.asarray(values, dtype=np.float64) / tolerance).astype(np.int64).tobytes()
+        # round() arrondit au pair le plus proche, comme np.round : mêmes octets qu'avec NumPy
+        return array.array('q', [round(value / tolerance) for value in values]).tobytes()
+    
+    digest = hashlib.sha1()
+    digest.update(indices(counts))
+    digest.update(indices(connects))
+    digest.update(quantized(points))
+    for name, u_values, v_values, uv_counts, uv_ids in uv_sets:
+        digest.update(b'uv:' + name.encode('utf-8'))
+        digest.update(indices(uv_counts))
+        digest.update(indices(uv_ids))
+        digest.update(quantized(u_values))
+        digest.update(quantized(v_values))
+    for name, colors in color_sets:
+        digest.update(b'color:' + name.encode('utf-8'))
+        digest.update(quantized(colors))
+    return digest.hexdigest()
+
+
+def estimate_mesh_bytes(vertex_count, face_count, face_vertex_count):
+    """Estimation de la mémoire d'un mesh : positions float3, indices et comptes par face"""
+    return vertex_count * 12 + face_vertex_count * 4 + face_count * 4
+
+
+def read_mesh_buffers(shape):
+    """Lit positions (espace objet, à plat) et topologie d'un shape mesh
+    
+    Les positions sont lues en un seul tableau plat x, y, z (xform sur tous les sommets)
+    plutôt que MPoint par MPoint ; la topologie via l'API Maya 2.0.
+    """
+    import maya.api.OpenMaya as om2
+    
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    fn_mesh = om2.MFnMesh(selection.getDagPath(0))
+    counts, connects = fn_mesh.getVertices()
+    
+    points = cmds.xform(f"{shape}.vtx[*]", query=True, objectSpace=True, translation=True) or []
+    try:
+        import numpy as np
+        points = np.asarray(points, dtype=np.float64)
+    except ImportError:
+        pass
+    
+    return points, counts, connects
+
+
+def read_mesh_sets(shape):
+    """Lit les UV sets (valeurs et assignation par face) et les color sets (couleur de
+    chaque sommet de face) d'un shape mesh via l'API Maya 2.0 ; retourne (uv_sets, color_sets)"""
+    import array
+    import itertools
+    import maya.api.OpenMaya as om2
+    
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    fn_mesh = om2.MFnMesh(selection.getDagPath(0))
+    
+    uv_sets = []
+    for name in fn_mesh.getUVSetNames():
+        u_values, v_values = fn_mesh.getUVs(name)
+        uv_counts, uv_ids = fn_mesh.getAssignedUVs(name)
+        uv_sets.append((name, u_values, v_values, uv_counts, uv_ids))
+    
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    
+    def flatten(colors):
+        # Couleurs mises à plat (r, g, b, a) en un seul tableau, sans boucle Python par couleur
+        if np is not None:
+            return np.asarray(colors, dtype=np.float64).reshape(-1)
+        return array.array('d', itertools.chain.from_iterable(colors))
+    
+    color_sets = []
+    for name in fn_mesh.getColorSetNames():
+        color_sets.append((name, flatten(fn_mesh.getFaceVertexColors(name))))
+    return uv_sets, color_sets
+
+
+def compute_mesh_hash(shape, tolerance=1e-5):
+    """(hash, octets estimés) d'un shape mesh, calculé sur ses buffers actuels (sans cache)
+    
+    Positions, topologie, UV sets et color sets : deux mesh aux UVs différents ne sont
+    ni instanciés l'un par l'autre ni exportés dans le même fichier.
+    """
+    points, counts, connects = read_mesh_buffers(shape)
+    uv_sets, color_sets = read_mesh_sets(shape)
+    geometry_hash = hash_mesh_buffers(points, counts, connects, tolerance, uv_sets, color_sets)
+    return geometry_hash, estimate_mesh_bytes(len(points) // 3, len(counts), len(connects))
+
+
+def on_geometry_dirty(node, plug, uuid):
+    # Toute modification du shape (points, topologie, déformation amont) invalide son hash
+    _geometry_hash_cache.pop(uuid, None)
+
+
+def watch_geometry(shape, uuid):
+    """Installe, une fois par shape, le callback qui retire son hash du cache quand il est modifié"""
+    if uuid in _geometry_dirty_callbacks:
+        return
+    import maya.api.OpenMaya as om2
+    
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    _geometry_dirty_callbacks[uuid] = om2.MNodeMessage.addNodeDirtyPlugCallback(
+        selection.getDependNode(0), on_geometry_dirty, uuid)
+
+
+def clear_geometry_hash_cache(*args):
+    """Vide le cache des hashs de géométrie et retire ses callbacks (ouverture / nouvelle scène)"""
+    import maya.api.OpenMaya as om2
+    
+    _geometry_hash_cache.clear()
+    while _geometry_dirty_callbacks:
+        _, callback_id = _geometry_dirty_callbacks.popitem()
+        try:
+            om2.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            pass
+
+
+def hash_meshes(shapes, tolerance=1e-5, chunk_size=256, verbose=True):
+    """Retourne {shape: (hash, octets estimés)} en réutilisant le cache par uuid
+    
+    Les shapes sont traités par paquets de chunk_size ; un shape qui n'a pas été marqué
+    dirty depuis le dernier calcul n'est pas relu.
+    """
+    shape_uuids = list(zip(shapes, node_uuids(shapes)))
+    results = {}
+    computed = 0
+    
+    for chunk_start in range(0, len(shape_uuids), chunk_size):
+        for shape, uuid in shape_uuids[chunk_start:chunk_start + chunk_size]:
+            cached = _geometry_hash_cache.get(uuid)
+            if cached and cached[0] == tolerance:
+                results[shape] = cached[1:]
+                continue
+            
+            # Callback installé avant la lecture : une modification pendant le calcul invalide l'entrée
+            watch_geometry(shape, uuid)
+            geometry_hash, size = compute_mesh_hash(shape, tolerance)
+            _geometry_hash_cache[uuid] = (tolerance, geometry_hash, size)
+            results[shape] = (geometry_hash, size)
+            computed += 1
         
-        # Assigne le matériau au mesh
-        cmds.sets(mesh, edit=True, forceElement=shading_group)
+        if verbose:
+            print(f"Hachage: {min(chunk_start + chunk_size, len(shapes))}/{len(shapes)} mesh(es)")
+    
+    if verbose:
+        print(f"{computed} hash(s) calculé(s), {len(shapes) - computed} depuis le cache")
+    return results
+
+
+def group_identical_meshes(shape_hashes):
+    """Regroupe les shapes par hash ; ne retourne que les groupes d'au moins deux shapes"""
+    groups = {}
+    for shape, (geometry_hash, _) in shape_hashes.items():
+        groups.setdefault(geometry_hash, []).append(shape)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def instance_duplicate_meshes(dry_run=False, tolerance=1e-5, chunk_size=256):
+    """Remplace les mesh dupliqués (même topologie et mêmes points) par des instances
+    
+    Travaille sur les mesh de la sélection, ou de toute la scène si rien n'est
+    sélectionné. Chaque transform dupliqué garde son nom, sa hiérarchie, sa position
+    et son matériau ; seul son shape est remplacé par une instance du premier.
+    """
+    meshes = select_only_meshes()
+    if not meshes:
+        return
+    
+    # Un seul shape mesh (non intermédiaire) par transform
+    shape_of = {}
+    for transform in meshes:
+        shapes = cmds.listRelatives(transform, shapes=True, type='mesh', noIntermediate=True, fullPath=True) or []
+        if len(shapes) == 1:
+            shape_of[shapes[0]] = transform
+    
+    shape_hashes = hash_meshes(list(shape_of), tolerance, chunk_size)
+    groups = group_identical_meshes(shape_hashes)
+    
+    duplicate_count = sum(len(group) - 1 for group in groups)
+    saved_bytes = sum(shape_hashes[shape][1] for group in groups for shape in group[1:])
+    
+    if not groups:
+        print("Aucun mesh dupliqué trouvé")
+        return []
+    
+    if dry_run:
+        for group in groups:
+            print(f"{len(group)} mesh(es) identique(s): {', '.join(shape_of[s].split('|')[-1] for s in group)}")
+        print(f"{duplicate_count} doublon(s) dans {len(groups)} groupe(s), "
+              f"{saved_bytes / (1024 * 1024):.1f} Mo récupérables")
+        return groups
+    
+    cmds.undoInfo(openChunk=True, chunkName="instanceDuplicateMeshes")
+    try:
+        shapes_to_delete = []
+        for group in groups:
+            master = group[0]
+            master_sg = cmds.listConnections(master, type='shadingEngine') or []
+            # Le cache peut dater : buffers complets relus avant de remplacer un shape
+            master_hash = compute_mesh_hash(master, tolerance)[0]
+            for shape in group[1:]:
+                transform = shape_of[shape]
+                if compute_mesh_hash(shape, tolerance)[0] != master_hash:
+                    print(f"Géométrie modifiée depuis le hachage, conservé: '{transform.split('|')[-1]}'")
+                    duplicate_count -= 1
+                    saved_bytes -= shape_hashes[shape][1]
+                    continue
+                shading_groups = cmds.listConnections(shape, type='shadingEngine') or []
+                # Ajoute une instance du shape maître sous le transform du doublon
+                instance = cmds.parent(master, transform, add=True, shape=True)[0]
+                if shading_groups and shading_groups[:1] != master_sg[:1]:
+                    cmds.sets(instance, edit=True, forceElement=shading_groups[0])
+                shapes_to_delete.append(shape)
         
-        print(f"Matériau '{shader}' assigné à '{short_name}'")
+        cmds.delete(shapes_to_delete)
+    finally:
+        cmds.undoInfo(closeChunk=True)
     
-    print(f"Matériaux assignés à {len(meshes)} mesh(es)")
+    print(f"{duplicate_count} mesh(es) converti(s) en instances ({len(groups)} géométrie(s)), "
+          f"{saved_bytes / (1024 * 1024):.1f} Mo économisés")
+    return groups
 
 
-def remove_pasted_prefix():
-    """Enlève le préfixe 'pasted__' de tous les objets dans la scène"""
-    # Sélectionne tout dans la scène
-    all_objects = cmds.ls()
+def plan_renames(nodes, rename_func):
+    """Prépare les renommages sans toucher à la scène
+    
+    nodes : noms des nodes (chemins longs pour le DAG)
+    rename_func : fonction nom court -> nouveau nom court
+    Retourne la liste des (node, nouveau nom) dont le nom change réellement.
+    """
+    plan = []
+    for node in dict.fromkeys(nodes):
+        short_name = node.rpartition('|')[2]
+        new_name = rename_func(short_name)
+        if new_name and new_name != short_name:
+            plan.append((node, new_name))
+    return plan
+
+
+def apply_renames(plan, chunk_name="batchRename", verbose=False):
+    """Applique un plan de renommage en un seul undo chunk, sans chemins périmés
     
-    renamed_count = 0
+    Les nodes sont renommés du plus profond au moins profond : renommer un parent
+    invalide les chemins longs de ses enfants, qui sont donc déjà traités.
+    Retourne un dict avec planned, applied, failed et seconds.
+    """
+    start = time.perf_counter()
+    applied = 0
+    failed = []
     
-    for obj in all_objects:
-        # Vérifie si le nom contient "pasted__"
-        if "pasted__" in obj:
-            # Enlève le préfixe "pasted__"
-            new_name = obj.replace("pasted__", "")
-            
-            try:
-                cmds.rename(obj, new_name)
-                renamed_count += 1
-                print(f"Renommé: '{obj}' -> '{new_name}'")
-            except:
-                print(f"Impossible de renommer: '{obj}'")
+    ordered = sorted(plan, key=lambda item: item[0].count('|'), reverse=True)
     
-    if renamed_count > 0:
-        print(f"{renamed_count} objet(s) renommé(s)")
+    cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    try:
+        for node, new_name in ordered:
+            try:
+                # ignoreShape : les shapes à renommer font partie du plan
+                result = cmds.rename(node, new_name, ignoreShape=True)
+                applied += 1
+                if verbose:
+                    print(f"Renommé: '{node}' -> '{result}'")
+            except Exception as e:
+                failed.append(node)
+                print(f"Impossible de renommer '{node}': {str(e)}")
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    
+    return {
+        'planned': len(plan),
+        'applied': applied,
+        'failed': failed,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def remove_pasted_prefix(verbose=False):
+    """Enlève le préfixe 'pasted__' de tous les objets dans la scène"""
+    tool_phase('query')
+    index = get_scene_index()
+    if index is not None:
+        candidates = index.paths(index.watched['pasted__'])
     else:
+        # Pré-filtre côté Maya plutôt qu'un parcours Python de tous les nodes
+        candidates = cmds.ls('*pasted__*', long=True, recursive=True) or []
+    
+    plan = plan_renames(candidates, lambda name: name.replace("pasted__", ""))
+    
+    if not plan:
         print("Aucun objet avec 'pasted__' trouvé")
+        return {'planned': 0, 'applied': 0, 'failed': [], 'seconds': 0.0}
+    
+    tool_phase('mutate')
+    stats = apply_renames(plan, chunk_name="removePastedPrefix", verbose=verbose)
+    tool_phase('report')
+    print(f"{stats['applied']}/{stats['planned']} objet(s) renommé(s) en {stats['seconds']:.2f}s")
+    return stats
 
 
-def delete_empty_groups():
-    """Supprime tous les groupes vides dans la scène"""
-    deleted_count = 0
+def find_empty_groups(dag_nodes, groups):
+    """Calcule en une passe les groupes vides, y compris ceux qui ne contiennent que des groupes vides
+    
+    dag_nodes : chemins longs de tous les nodes DAG de la scène (snapshot), un par
+    instance (ls -allPaths) : un groupe dont le seul enfant est une instance n'est pas vide
+    groups : chemins longs des transforms simples pouvant être supprimés
+    Retourne (empty_groups, roots) : tous les groupes vides, des plus profonds aux moins
+    profonds, et les plus hauts d'entre eux (supprimer ces derniers supprime tout le reste).
+    """
+    groups = set(groups)
+    
+    # Nombre d'enfants non vides de chaque node, déduit des chemins longs
+    remaining_children = {}
+    for path in dag_nodes:
+        parent = path.rpartition('|')[0]
+        if parent:
+            remaining_children[parent] = remaining_children.get(parent, 0) + 1
+    
+    # Parcours du plus profond au moins profond : un groupe est vide quand
+    # tous ses enfants ont déjà été identifiés comme groupes vides
+    empty_groups = []
+    empty_set = set()
+    for path in sorted(groups, key=lambda p: p.count('|'), reverse=True):
+        if remaining_children.get(path, 0) == 0:
+            empty_groups.append(path)
+            empty_set.add(path)
+            parent = path.rpartition('|')[0]
+            if parent:
+                remaining_children[parent] -= 1
     
-    # Boucle jusqu'à ce qu'il n'y ait plus de groupes vides
-    # (car supprimer un groupe peut rendre son parent vide)
-    while True:
-        # Récupère tous les transforms
-        all_transforms = cmds.ls(type='transform')
-        empty_groups = []
-        
-        for obj in all_transforms:
-            # Vérifie si l'objet n'a pas d'enfants
-            children = cmds.listRelatives(obj, children=True, fullPath=True)
-            
-            if not children:
-                empty_groups.append(obj)
-        
-        # Si aucun groupe vide trouvé, on arrête
-        if not empty_groups:
-            break
-        
-        # Supprime les groupes vides
-        for grp in empty_groups:
+    roots = [path for path in empty_groups if path.rpartition('|')[0] not in empty_set]
+    return empty_groups, roots
+
+
+def delete_empty_groups(dry_run=False):
+    """Supprime tous les groupes vides dans la scène
+    
+    Le DAG est lu une seule fois, les groupes vides (récursivement) sont calculés en
+    mémoire puis supprimés en un seul appel. Avec dry_run=True, les groupes sont
+    seulement listés.
+    """
+    tool_phase('query')
+    index = get_scene_index()
+    if index is not None:
+        empty_groups, roots = index.empty_groups()
+    else:
+        # Snapshot du DAG : tous les chemins longs (un par instance) et les transforms simples
+        dag_nodes = cmds.ls(dag=True, long=True, allPaths=True) or []
+        groups = cmds.ls(exactType='transform', long=True, allPaths=True) or []
+        empty_groups, roots = find_empty_groups(dag_nodes, groups)
+    
+    if not empty_groups:
+        print("Aucun groupe vide trouvé")
+        return []
+    
+    if dry_run:
+        tool_phase('report')
+        for grp in roots:
+            print(f"Groupe vide (simulation): '{grp}'")
+        print(f"{len(empty_groups)} groupe(s) vide(s) à supprimer (dont {len(roots)} de plus haut niveau)")
+        return empty_groups
+    
+    # Supprimer les groupes de plus haut niveau supprime aussi les groupes vides qu'ils contiennent
+    tool_phase('mutate')
+    try:
+        cmds.delete(roots)
+        deleted = empty_groups
+    except Exception:
+        # Un node verrouillé ou référencé fait échouer l'appel groupé : suppression une par une
+        deleted = []
+        for grp in roots:
             try:
                 cmds.delete(grp)
-                deleted_count += 1
-                print(f"Groupe vide supprimé: '{grp}'")
-            except:
+                deleted.extend(p for p in empty_groups if p == grp or p.startswith(grp + '|'))
+            except Exception:
                 print(f"Impossible de supprimer: '{grp}'")
     
-    if deleted_count > 0:
-        print(f"{deleted_count} groupe(s) vide(s) supprimé(s)")
+    tool_phase('report')
+    if deleted:
+        print(f"{len(deleted)} groupe(s) vide(s) supprimé(s)")
     else:
-        print("Aucun groupe vide trouvé")
+        print("Aucun groupe vide supprimé")
+    return deleted
 
 
-def delete_unknown_nodes():
-    """Supprime tous les nodes inconnus dans la scène"""
-    unknown_nodes = cmds.ls(type='unknown') or []
-    unknown_dag = cmds.ls(type='unknownDag') or []
-    
-    all_unknown = unknown_nodes + unknown_dag
+# Types des nodes dont le plugin est absent
+UNKNOWN_NODE_TYPES = ['unknown', 'unknownDag', 'unknownTransform']
+
+# Clés fileInfo : temps de chargement de la scène avant nettoyage (comparé à l'ouverture suivante)
+UNKNOWN_CLEANUP_FILEINFO = "customPluginsUnknownCleanup"
+
+# Durée du dernier chargement de scène, mesurée par les callbacks MSceneMessage
+_scene_load = {'start': None, 'seconds': None}
+_scene_callbacks = []
+
+
+def delete_unknown_nodes(batched=True, remove_plugins=True):
+    """Supprime tous les nodes inconnus dans la scène
+    
+    batched : déverrouille puis supprime tous les nodes en un appel chacun
+    (batched=False : ancienne boucle node par node)
+    remove_plugins : retire aussi les plugins inconnus (instructions 'requires' de la
+    scène) ; le gain de chargement est affiché à la prochaine ouverture de la scène
+    Retourne le nombre de nodes supprimés.
+    """
+    tool_phase('query')
+    all_unknown = cmds.ls(type=UNKNOWN_NODE_TYPES, long=True) or []
     deleted_count = 0
     
-    for node in all_unknown:
+    tool_phase('mutate')
+    if not batched:
+        for node in all_unknown:
+            try:
+                # Déverrouille le node si nécessaire
+                if cmds.lockNode(node, query=True, lock=True)[0]:
+                    cmds.lockNode(node, lock=False)
+                cmds.delete(node)
+                deleted_count += 1
+                print(f"Node inconnu supprimé: '{node}'")
+            except Exception as e:
+                print(f"Impossible de supprimer '{node}': {str(e)}")
+    elif all_unknown:
         try:
-            # Déverrouille le node si nécessaire
-            if cmds.lockNode(node, query=True, lock=True)[0]:
-                cmds.lockNode(node, lock=False)
-            cmds.delete(node)
-            deleted_count += 1
-            print(f"Node inconnu supprimé: '{node}'")
-        except Exception as e:
-            print(f"Impossible de supprimer '{node}': {str(e)}")
-    
+            cmds.lockNode(all_unknown, lock=False)
+            cmds.delete(all_unknown)
+            deleted_count = len(all_unknown)
+        except Exception:
+            # Un node référencé fait échouer l'appel groupé : suppression une par une
+            for node in all_unknown:
+                try:
+                    if cmds.objExists(node):
+                        cmds.lockNode(node, lock=False)
+                        cmds.delete(node)
+                    deleted_count += 1
+                except Exception as e:
+                    print(f"Impossible de supprimer '{node}': {str(e)}")
+    
+    removed_plugins = remove_unknown_plugins() if remove_plugins else []
+    
+    tool_phase('report')
     if deleted_count > 0:
         print(f"{deleted_count} node(s) inconnu(s) supprimé(s)")
     else:
         print("Aucun node inconnu trouvé")
+    if removed_plugins:
+        print(f"{len(removed_plugins)} plugin(s) inconnu(s) retiré(s): {', '.join(removed_plugins)}")
+    
+    if (deleted_count or removed_plugins) and _scene_load['seconds'] is not None:
+        # Référence pour mesurer le gain à la prochaine ouverture (scène à enregistrer)
+        cmds.fileInfo(UNKNOWN_CLEANUP_FILEINFO, f"{_scene_load['seconds']:.3f}")
+        print(f"Chargement actuel: {_scene_load['seconds']:.2f}s ; le gain sera affiché à la prochaine ouverture")
+    return deleted_count
 
 
-def delete_unused_nodes():
-    """Supprime tous les nodes inutilisés (materials, textures, etc.)"""
-    
-    # Utilise MEL pour optimiser la scène (supprime les nodes inutilisés)
-    import maya.mel as mel
-    
-    deleted_counts = {}
-    
-    # Types de nodes à vérifier
-    node_types = [
-        ('shadingEngine', 'Shading Groups'),
-        ('lambert', 'Lambert'),
-        ('blinn', 'Blinn'),
-        ('phong', 'Phong'),
-        ('aiStandardSurface', 'aiStandardSurface'),
-        ('file', 'File Textures'),
-        ('place2dTexture', 'Place2D Textures'),
-        ('bump2d', 'Bump2D'),
-        ('multiplyDivide', 'MultiplyDivide'),
-        ('ramp', 'Ramp'),
-        ('noise', 'Noise'),
-        ('layeredTexture', 'Layered Textures'),
-    ]
-    
-    # Compte les nodes avant
-    before_counts = {}
-    for node_type, _ in node_types:
+def remove_unknown_plugins():
+    """Retire les plugins inconnus (sans node restant) de la scène ; retourne leurs noms"""
+    removed = []
+    for plugin in cmds.unknownPlugin(query=True, list=True) or []:
         try:
-            before_counts[node_type] = len(cmds.ls(type=node_type) or [])
-        except:
-            before_counts[node_type] = 0
-    
-    # Utilise la commande MLdeleteUnused pour supprimer les nodes inutilisés
-    try:
-        mel.eval('MLdeleteUnused;')
-    except:
-        # Fallback: suppression manuelle
-        mel.eval('hyperShadePanelMenuCommand("hyperShadePanel1", "deleteUnusedNodes");')
-    
-    # Compte les nodes après
-    total_deleted = 0
-    for node_type, label in node_types:
+            cmds.unknownPlugin(plugin, remove=True)
+            removed.append(plugin)
+        except Exception as e:
+            # Des nodes du plugin existent encore (référencés, verrouillés...)
+            print(f"Impossible de retirer le plugin '{plugin}': {str(e)}")
+    return removed
+
+
+def on_before_scene_open(*args):
+    _scene_load['start'] = time.perf_counter()
+
+
+def on_after_scene_open(*args):
+    """Mesure le chargement et le compare à celui d'avant le dernier nettoyage"""
+    if _scene_load['start'] is None:
+        return
+    _scene_load['seconds'] = time.perf_counter() - _scene_load['start']
+    _scene_load['start'] = None
+    
+    baseline = cmds.fileInfo(UNKNOWN_CLEANUP_FILEINFO, query=True)
+    if baseline:
+        before = float(baseline[0])
+        after = _scene_load['seconds']
+        print(f"Chargement de la scène: {after:.2f}s (avant nettoyage des nodes inconnus: {before:.2f}s, "
+              f"gain: {before - after:.2f}s)")
+        cmds.fileInfo(remove=UNKNOWN_CLEANUP_FILEINFO)
+
+
+def register_scene_callbacks():
+    """Installe les callbacks de scène : mesure du temps de chargement, remise à zéro du cache de hashs"""
+    _scene_callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, on_before_scene_open))
+    _scene_callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, on_after_scene_open))
+    # Les uuids sont enregistrés dans les fichiers : le cache de hashs ne survit pas à un changement de scène
+    _scene_callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, clear_geometry_hash_cache))
+    _scene_callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, clear_geometry_hash_cache))
+
+
+def remove_scene_callbacks():
+    while _scene_callbacks:
+        om.MMessage.removeCallback(_scene_callbacks.pop())
+
+
+# Nodes connectés à tous les nodes de shading (listes par défaut, light linker, layout
+# de l'Hypershade...) : une connexion vers eux ne rend pas un node utilisé
+SHADING_HUB_TYPES = {
+    'defaultShaderList', 'defaultTextureList', 'defaultRenderUtilityList', 'lightLinker',
+    'materialInfo', 'partition', 'hyperLayout', 'hyperView', 'nodeGraphEditorInfo',
+}
+
+
+def find_unused_shading_nodes():
+    """Calcule les nodes de shading inutilisés à partir d'un snapshot unique des connexions
+    
+    Les candidats sont tous les nodes classés shader, texture ou utility (Arnold compris)
+    et les shading groups. Sont utilisés : les shading groups assignés à une géométrie,
+    les nodes connectés à autre chose qu'un node de shading (lights, réglages de rendu,
+    rig...) et tout ce qui est en amont d'eux. Retourne (unused, types) où types
+    donne le type de chaque candidat.
+    """
+    node_types = {'shadingEngine'}
+    for classification in ('shader', 'texture', 'utility'):
+        node_types.update(cmds.listNodeTypes(classification) or [])
+    
+    listing = cmds.ls(type=sorted(node_types), showType=True) or []
+    types = dict(zip(listing[::2], listing[1::2]))
+    if not types:
+        return [], types
+    candidates = list(types)
+    
+    # Nodes par défaut (lambert1, initialShadingGroup...) et nodes référencés : jamais supprimés
+    protected = set(cmds.ls(candidates, defaultNodes=True) or [])
+    protected.update(cmds.ls(candidates, readOnly=True) or [])
+    
+    # Snapshot : connexions vers l'aval de tous les candidats...
+    downstream = {}
+    pairs = cmds.listConnections(candidates, source=False, destination=True, connections=True, plugs=False) or []
+    for plug, other in zip(pairs[::2], pairs[1::2]):
+        downstream.setdefault(plug.partition('.')[0], set()).add(other)
+    
+    # ... et géométries membres des shading groups (shape -> instObjGroups -> dagSetMembers)
+    shading_engines = [node for node, node_type in types.items() if node_type == 'shadingEngine']
+    members = {}
+    if shading_engines:
+        pairs = cmds.listConnections(shading_engines, source=True, destination=False, connections=True,
+                                     plugs=False, shapes=True) or []
+        for plug, other in zip(pairs[::2], pairs[1::2]):
+            members.setdefault(plug.partition('.')[0], set()).add(other)
+    
+    # Type des nodes connectés qui ne sont pas des candidats, en un appel
+    others = {other for nodes in downstream.values() for other in nodes if other not in types}
+    others.update(other for nodes in members.values() for other in nodes if other not in types)
+    other_types = {}
+    geometry = set()
+    if others:
+        listing = cmds.ls(list(others), showType=True) or []
+        other_types = dict(zip(listing[::2], listing[1::2]))
+        geometry = set(cmds.ls(list(others), dag=True) or [])
+    
+    used = set(protected)
+    upstream = {}
+    for node, nodes in downstream.items():
+        for other in nodes:
+            if other in types:
+                upstream.setdefault(other, []).append(node)
+            elif other_types.get(other) not in SHADING_HUB_TYPES:
+                used.add(node)
+    for shading_engine, nodes in members.items():
+        if nodes & geometry:
+            used.add(shading_engine)
+    
+    # Tout ce qui alimente un node utilisé est utilisé
+    stack = list(used)
+    while stack:
+        for node in upstream.get(stack.pop(), ()):
+            if node not in used:
+                used.add(node)
+                stack.append(node)
+    
+    unused = [node for node in candidates if node not in used]
+    return unused, types
+
+
+def delete_unused_nodes(dry_run=False):
+    """Supprime tous les nodes inutilisés (materials, textures, etc.)
+    
+    Les nodes inutilisés sont calculés par parcours du graphe de shading (voir
+    find_unused_shading_nodes) puis supprimés en un seul appel, sans passer par
+    l'interface : fonctionne aussi en batch. Avec dry_run=True, ils sont seulement listés.
+    Retourne le nombre de nodes supprimés par type.
+    """
+    tool_phase('query')
+    unused, types = find_unused_shading_nodes()
+    
+    if unused and not dry_run:
+        tool_phase('mutate')
         try:
-            after_count = len(cmds.ls(type=node_type) or [])
-            deleted = before_counts[node_type] - after_count
-            if deleted > 0:
-                deleted_counts[label] = deleted
-                total_deleted += deleted
-        except:
-            pass
+            cmds.delete(unused)
+            deleted = unused
+        except Exception:
+            # Un node verrouillé fait échouer l'appel groupé : suppression une par une
+            deleted = []
+            for node in unused:
+                try:
+                    cmds.delete(node)
+                    deleted.append(node)
+                except Exception:
+                    print(f"Impossible de supprimer: '{node}'")
+    else:
+        deleted = unused
+    
+    deleted_counts = {}
+    for node in deleted:
+        deleted_counts[types[node]] = deleted_counts.get(types[node], 0) + 1
     
     # Affiche le résumé
+    tool_phase('report')
     print("=" * 50)
-    if total_deleted > 0:
-        print(f"Nodes inutilisés supprimés: {total_deleted}")
-        for label, count in deleted_counts.items():
-            print(f"  - {label}: {count}")
+    if deleted:
+        label = "Nodes inutilisés (simulation)" if dry_run else "Nodes inutilisés supprimés"
+        print(f"{label}: {len(deleted)}")
+        for node_type, count in sorted(deleted_counts.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  - {node_type}: {count}")
     else:
         print("Aucun node inutilisé trouvé")
     print("=" * 50)
+    return deleted_counts
+
+
+# Étapes de nettoyage composables : nom -> fonction retournant le nombre de nodes traités
+CLEANUP_STAGES = {
+    'unknown': lambda: delete_unknown_nodes(),
+    'pasted': lambda: remove_pasted_prefix()['applied'],
+    'empty_groups': lambda: len(delete_empty_groups()),
+    'unused': lambda: sum(delete_unused_nodes().values()),
+}
+
+# Ordre par défaut : les nodes inconnus d'abord, les nodes inutilisés en dernier
+DEFAULT_CLEANUP_PIPELINE = ['unknown', 'pasted', 'empty_groups', 'unused']
+
+
+def run_cleanup_pipeline(stages=None):
+    """Applique les étapes de nettoyage à la scène ouverte, dans l'ordre donné
+    
+    Retourne {étape: {'count': nodes traités, 'seconds': durée}}. Une étape en
+    échec est consignée ('error') sans arrêter les suivantes.
+    """
+    results = {}
+    for stage in stages or DEFAULT_CLEANUP_PIPELINE:
+        if stage not in CLEANUP_STAGES:
+            raise ValueError(f"Étape de nettoyage inconnue: {stage}")
+        start = time.perf_counter()
+        try:
+            results[stage] = {'count': CLEANUP_STAGES[stage]()}
+        except Exception as e:
+            results[stage] = {'count': 0, 'error': str(e)}
+        results[stage]['seconds'] = round(time.perf_counter() - start, 3)
+    return results
+
+
+# Nombre maximum de lignes affichées dans l'aperçu du Batch Rename
+BATCH_RENAME_PREVIEW_ROWS = 200
+
+# Options de casse du Batch Rename : libellé -> fonction
+BATCH_RENAME_CASES = {
+    "Inchangée": None,
+    "minuscules": str.lower,
+    "MAJUSCULES": str.upper,
+    "Première Lettre": lambda name: name[:1].upper() + name[1:],
+}
+
+# Snapshot de la sélection utilisé par l'aperçu (évite de requêter Maya à chaque frappe)
+_batch_rename_snapshot = {'nodes': [], 'names': []}
+
+
+def compute_batch_names(names, rules, start_index=0):
+    """Calcule les nouveaux noms courts à partir des noms courts et des règles
+    
+    Fonction pure (aucun appel Maya). rules est un dict avec les clés optionnelles :
+    prefix, suffix, search, replace, regex (bool), case (clé de BATCH_RENAME_CASES),
+    numbering (bool), start, padding et step.
+    start_index : position du premier nom dans la sélection complète (pour la numérotation).
+    Lève re.error si l'expression régulière est invalide.
+    """
+    prefix = rules.get('prefix', '')
+    suffix = rules.get('suffix', '')
+    search = rules.get('search', '')
+    replace = rules.get('replace', '')
+    case_func = BATCH_RENAME_CASES.get(rules.get('case'))
+    numbering = rules.get('numbering', False)
+    start = rules.get('start', 1)
+    padding = rules.get('padding', 3)
+    step = rules.get('step', 1)
+    
+    pattern = re.compile(search) if search and rules.get('regex') else None
+    
+    new_names = []
+    for index, name in enumerate(names, start_index):
+        # Rechercher/Remplacer (texte simple ou expression régulière)
+        if pattern is not None:
+            name = pattern.sub(replace, name)
+        elif search:
+            name = name.replace(search, replace)
+        
+        if case_func is not None:
+            name = case_func(name)
+        
+        # Numérotation séquentielle avec padding (ex: _001)
+        if numbering:
+            name = f"{name}_{start + index * step:0{padding}d}"
+        
+        new_names.append(prefix + name + suffix)
+    
+    return new_names
 
 
 def batch_rename():
-    """Ouvre une fenêtre pour renommer plusieurs objets avec préfixe/suffixe"""
+    """Ouvre une fenêtre pour renommer plusieurs objets (préfixe/suffixe, regex, numérotation, casse)"""
     
     window_name = "batchRenameWindow"
     
@@ -251,26 +1432,54 @@ def batch_rename():
         cmds.deleteUI(window_name)
     
     # Crée la fenêtre
-    window = cmds.window(window_name, title="Batch Rename", widthHeight=(300, 280), sizeable=True)
+    window = cmds.window(window_name, title="Batch Rename", widthHeight=(340, 620), sizeable=True)
     
-    cmds.columnLayout(adjustableColumn=True, rowSpacing=10, columnOffset=('both', 10))
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=6, columnOffset=('both', 10))
     
     cmds.separator(height=10, style='none')
     
+    # Met à jour l'aperçu à chaque frappe
+    update = lambda *args: update_batch_rename_preview()
+    
     # Champ pour le préfixe
     cmds.text(label="Préfixe:", align='left')
-    prefix_field = cmds.textField("batchRenamePrefix", placeholderText="ex: prop_")
+    cmds.textField("batchRenamePrefix", placeholderText="ex: prop_", textChangedCallback=update)
     
     # Champ pour le suffixe
     cmds.text(label="Suffixe:", align='left')
-    suffix_field = cmds.textField("batchRenameSuffix", placeholderText="ex: _geo")
+    cmds.textField("batchRenameSuffix", placeholderText="ex: _geo", textChangedCallback=update)
     
     # Champ pour rechercher/remplacer
     cmds.text(label="Rechercher:", align='left')
-    search_field = cmds.textField("batchRenameSearch", placeholderText="texte à rechercher")
+    cmds.textField("batchRenameSearch", placeholderText="texte ou expression régulière", textChangedCallback=update)
     
     cmds.text(label="Remplacer par:", align='left')
-    replace_field = cmds.textField("batchRenameReplace", placeholderText="texte de remplacement")
+    cmds.textField("batchRenameReplace", placeholderText="texte de remplacement (\\1 pour un groupe)", textChangedCallback=update)
+    
+    cmds.checkBox("batchRenameRegex", label="Expression régulière", value=False, changeCommand=update)
+    
+    # Casse
+    cmds.optionMenu("batchRenameCase", label="Casse:", changeCommand=update)
+    for label in BATCH_RENAME_CASES:
+        cmds.menuItem(label=label)
+    
+    # Numérotation
+    cmds.checkBox("batchRenameNumbering", label="Numéroter (_001, _002...)", value=False, changeCommand=update)
+    cmds.rowLayout(numberOfColumns=4, adjustableColumn=4)
+    cmds.text(label="Début:")
+    cmds.intField("batchRenameStart", value=1, minValue=0, width=60, changeCommand=update)
+    cmds.text(label="Padding:")
+    cmds.intField("batchRenamePadding", value=3, minValue=1, maxValue=10, width=60, changeCommand=update)
+    cmds.setParent('..')
+    
+    cmds.separator(height=10, style='in')
+    
+    # Aperçu
+    cmds.rowLayout(numberOfColumns=2, adjustableColumn=1)
+    cmds.text("batchRenameCount", label="", align='left')
+    cmds.button(label="Recharger la sélection", command=lambda x: refresh_batch_rename_selection())
+    cmds.setParent('..')
+    cmds.textScrollList("batchRenamePreview", height=220, allowMultiSelection=False)
     
     cmds.separator(height=10, style='none')
     
@@ -278,84 +1487,714 @@ def batch_rename():
     cmds.button(label="Appliquer", command=lambda x: apply_batch_rename(), height=30)
     
     cmds.showWindow(window)
+    
+    refresh_batch_rename_selection()
+
+
+def read_batch_rename_rules():
+    """Lit les règles de renommage depuis la fenêtre Batch Rename"""
+    return {
+        'prefix': cmds.textField("batchRenamePrefix", query=True, text=True),
+        'suffix': cmds.textField("batchRenameSuffix", query=True, text=True),
+        'search': cmds.textField("batchRenameSearch", query=True, text=True),
+        'replace': cmds.textField("batchRenameReplace", query=True, text=True),
+        'regex': cmds.checkBox("batchRenameRegex", query=True, value=True),
+        'case': cmds.optionMenu("batchRenameCase", query=True, value=True),
+        'numbering': cmds.checkBox("batchRenameNumbering", query=True, value=True),
+        'start': cmds.intField("batchRenameStart", query=True, value=True),
+        'padding': cmds.intField("batchRenamePadding", query=True, value=True),
+    }
+
 
+def refresh_batch_rename_selection():
+    """Met en cache les noms de la sélection puis met à jour l'aperçu"""
+    nodes = cmds.ls(sl=True, long=True) or []
+    _batch_rename_snapshot['nodes'] = nodes
+    _batch_rename_snapshot['names'] = [node.rpartition('|')[2] for node in nodes]
+    update_batch_rename_preview()
 
-def apply_batch_rename():
-    """Applique le renommage batch"""
+
+def update_batch_rename_preview():
+    """Met à jour l'aperçu à partir du snapshot, sans requêter la scène
     
-    selection = cmds.ls(sl=True)
+    Seules les premières lignes (BATCH_RENAME_PREVIEW_ROWS) sont calculées et affichées,
+    le coût d'une frappe ne dépend donc pas de la taille de la sélection.
+    """
+    if not cmds.textScrollList("batchRenamePreview", exists=True):
+        return
+    
+    names = _batch_rename_snapshot['names']
+    visible_names = names[:BATCH_RENAME_PREVIEW_ROWS]
+    
+    cmds.textScrollList("batchRenamePreview", edit=True, removeAll=True)
+    
+    try:
+        new_names = compute_batch_names(visible_names, read_batch_rename_rules())
+    except re.error as e:
+        cmds.text("batchRenameCount", edit=True, label=f"Expression régulière invalide: {e}")
+        return
+    
+    lines = [f"{old}  ->  {new}" if new != old else old for old, new in zip(visible_names, new_names)]
+    if len(names) > len(visible_names):
+        lines.append(f"... et {len(names) - len(visible_names)} autre(s)")
+    if lines:
+        cmds.textScrollList("batchRenamePreview", edit=True, append=lines)
+    
+    cmds.text("batchRenameCount", edit=True, label=f"{len(names)} objet(s) sélectionné(s)")
+
+
+def apply_batch_rename(rules=None):
+    """Applique le renommage batch à la sélection
+    
+    rules : dict de règles (voir compute_batch_names), lu depuis la fenêtre si None.
+    """
+    
+    selection = cmds.ls(sl=True, long=True)
     if not selection:
         cmds.warning("Aucune sélection ! Veuillez sélectionner des objets.")
         return
     
-    prefix = cmds.textField("batchRenamePrefix", query=True, text=True)
-    suffix = cmds.textField("batchRenameSuffix", query=True, text=True)
-    search = cmds.textField("batchRenameSearch", query=True, text=True)
-    replace = cmds.textField("batchRenameReplace", query=True, text=True)
+    short_names = [node.rpartition('|')[2] for node in selection]
     
-    renamed_count = 0
+    try:
+        new_names = compute_batch_names(short_names, rules if rules is not None else read_batch_rename_rules())
+    except re.error as e:
+        cmds.warning(f"Expression régulière invalide: {e}")
+        return
     
-    for obj in selection:
-        short_name = obj.split('|')[-1]
-        new_name = short_name
-        
-        # Rechercher/Remplacer
-        if search:
-            new_name = new_name.replace(search, replace)
-        
-        # Ajoute préfixe et suffixe
-        new_name = prefix + new_name + suffix
-        
-        # Renomme seulement si le nom change
-        if new_name != short_name:
-            try:
-                cmds.rename(obj, new_name)
-                renamed_count += 1
-                print(f"Renommé: '{short_name}' -> '{new_name}'")
-            except Exception as e:
-                print(f"Impossible de renommer '{short_name}': {str(e)}")
+    # Planifie tous les renommages puis les applique sans chemins périmés
+    plan = [(node, new_name) for node, short_name, new_name in zip(selection, short_names, new_names)
+            if new_name and new_name != short_name]
+    stats = apply_renames(plan, chunk_name="batchRename", verbose=False)
     
-    print(f"{renamed_count} objet(s) renommé(s)")
+    print(f"{stats['applied']} objet(s) renommé(s)")
+    
+    # Les noms ont changé : met à jour le snapshot de l'aperçu
+    refresh_batch_rename_selection()
+    return stats
+
+
+# Presets d'export par défaut : plugin et type de fichier Maya, extension et options du
+# translator (commandes MEL FBXExport* pour le FBX, chaîne "clé=valeur;" pour l'USD)
+EXPORT_PRESETS = {
+    'fbx': {
+        'format': 'fbx',
+        'plugin': 'fbxmaya',
+        'type': 'FBX export',
+        'extension': '.fbx',
+        'options': {
+            'FBXExportFileVersion': 'FBX202000',
+            'FBXExportSmoothingGroups': True,
+            'FBXExportSmoothMesh': True,
+            'FBXExportTriangulate': False,
+            'FBXExportInstances': False,
+            'FBXExportCameras': False,
+            'FBXExportLights': False,
+            'FBXExportEmbeddedTextures': False,
+            'FBXExportInputConnections': False,
+        },
+    },
+    'usd': {
+        'format': 'usd',
+        'plugin': 'mayaUsdPlugin',
+        'type': 'USD Export',
+        'extension': '.usd',
+        'options': {
+            'defaultUSDFormat': 'usdc',
+            'exportUVs': True,
+            'exportColorSets': True,
+            'exportDisplayColor': False,
+            'exportVisibility': True,
+            'mergeTransformAndShape': True,
+            'shadingMode': 'useRegistry',
+        },
+    },
+}
 
+# Presets enregistrés par l'utilisateur (JSON {nom: preset}), voir save_export_preset
+EXPORT_PRESETS_PATH = os.environ.get('CUSTOM_PLUGINS_EXPORT_PRESETS') or os.path.join(
+    os.path.expanduser('~'), 'maya', 'customPlugins', 'export_presets.json')
 
-def quick_fbx_export():
-    """Ouvre la fenêtre d'export FBX avec options"""
+# Manifest écrit par export_assets dans chaque dossier de sortie, au plus une fois par
+# EXPORT_MANIFEST_INTERVAL secondes pendant la file (et toujours à la fin)
+EXPORT_MANIFEST = "export_manifest.json"
+EXPORT_MANIFEST_INTERVAL = 1.0
+
+# Cache local des fichiers exportés, partagé entre scènes et sessions (voir ExportCache)
+EXPORT_CACHE_DIR = os.environ.get('CUSTOM_PLUGINS_EXPORT_CACHE') or os.path.join(
+    os.path.expanduser('~'), 'maya', 'customPlugins', 'export_cache')
+EXPORT_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+
+def complete_export_preset(preset):
+    """Complète un preset partiel par le preset par défaut de son format ('fbx' si absent)"""
+    base = EXPORT_PRESETS.get(preset.get('format', 'fbx'))
+    if base is None:
+        cmds.error(f"Format d'export inconnu: {preset.get('format')} (formats: {', '.join(EXPORT_PRESETS)})")
+        return None
+    complete = dict(base)
+    complete.update(preset)
+    complete['options'] = dict(base['options'], **preset.get('options', {}))
+    return complete
+
+
+def load_export_presets(path=None):
+    """Presets d'export disponibles : EXPORT_PRESETS puis les presets enregistrés dans path"""
+    presets = {name: complete_export_preset(preset) for name, preset in EXPORT_PRESETS.items()}
+    path = path or EXPORT_PRESETS_PATH
+    if os.path.isfile(path):
+        with open(path, 'r') as f:
+            for name, preset in json.load(f).items():
+                presets[name] = complete_export_preset(preset)
+    return presets
+
+
+def save_export_preset(name, preset, path=None):
+    """Enregistre un preset d'export (seules les clés et options à changer suffisent)
+    
+    Exemple : save_export_preset('fbx_unity', {'format': 'fbx', 'options': {'FBXExportTriangulate': True}})
+    """
+    path = path or EXPORT_PRESETS_PATH
+    saved = {}
+    if os.path.isfile(path):
+        with open(path, 'r') as f:
+            saved = json.load(f)
+    saved[name] = preset
+    
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as f:
+        json.dump(saved, f, indent=2, sort_keys=True)
+    print(f"Preset d'export '{name}' enregistré: {path}")
+
+
+def get_export_preset(preset):
+    """Preset complet à partir d'un nom (load_export_presets) ou d'un dict partiel"""
+    if isinstance(preset, dict):
+        return complete_export_preset(preset)
+    presets = load_export_presets()
+    if preset not in presets:
+        cmds.error(f"Preset d'export inconnu: {preset} (presets: {', '.join(sorted(presets))})")
+        return None
+    return presets[preset]
+
+
+def fbx_option_commands(options):
+    """Commandes MEL FBXExport* correspondant aux options d'un preset FBX"""
+    commands = []
+    for name, value in options.items():
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        commands.append(f"{name} -v {value}")
+    return commands
+
+
+def translator_options(options):
+    """Chaîne d'options du translator (ex: USD Export) : "clé=valeur;clé=valeur" """
+    return ';'.join(f"{name}={int(value) if isinstance(value, bool) else value}"
+                    for name, value in options.items())
+
+
+def read_modified_attributes(fn_node):
+    """{attribut: valeur} des attributs d'un node dont la valeur diffère du défaut (API 2.0)
+    
+    Seuls les attributs simples (nombres, enums, chaînes) sont lus ; les composés le sont
+    par leurs enfants, les attributs multi et message sont ignorés.
+    """
+    import maya.api.OpenMaya as om2
+    
+    values = {}
+    mobject = fn_node.object()
+    for index in range(fn_node.attributeCount()):
+        attribute = fn_node.attribute(index)
+        fn_attribute = om2.MFnAttribute(attribute)
+        api_type = attribute.apiType()
+        if fn_attribute.array or api_type in (om2.MFn.kCompoundAttribute, om2.MFn.kMessageAttribute):
+            continue
+        try:
+            plug = om2.MPlug(mobject, attribute)
+            if plug.isDefaultValue():
+                continue
+            if api_type == om2.MFn.kTypedAttribute:
+                values[fn_attribute.name] = plug.asString()
+            else:
+                values[fn_attribute.name] = round(plug.asDouble(), 6)
+        except (RuntimeError, TypeError):
+            # Enfant d'un attribut multi, données non scalaires (mesh, matrice...)
+            continue
+    return values
+
+
+def read_material_network(shading_group):
+    """Réseau de shading en amont d'un shading group, sous une forme hachable
+    
+    Retourne {'nodes': {node: [type, attributs modifiés]}, 'connections': [[source,
+    destination]], 'textures': {node: [chemin, fichiers, octets]}}. La géométrie membre
+    du shading group n'en fait pas partie. Un ls et un listConnections par niveau du
+    réseau ; les valeurs sont lues via l'API Maya 2.0.
+    """
+    import maya.api.OpenMaya as om2
+    
+    nodes = [shading_group]
+    seen = {shading_group}
+    connections = []
+    frontier = nodes
+    while frontier:
+        pairs = cmds.listConnections(frontier, source=True, destination=False, connections=True, plugs=True) or []
+        sources = list(dict.fromkeys(plug.partition('.')[0] for plug in pairs[1::2]))
+        dag = set(cmds.ls(sources, type='dagNode') or []) if sources else set()
+        for destination, source in zip(pairs[::2], pairs[1::2]):
+            if source.partition('.')[0] not in dag:
+                connections.append([source, destination])
+        frontier = [node for node in sources if node not in seen and node not in dag]
+        seen.update(frontier)
+        nodes.extend(frontier)
+    
+    listing = cmds.ls(nodes, showType=True) or []
+    types = dict(zip(listing[::2], listing[1::2]))
+    selection = om2.MSelectionList()
+    for node in nodes:
+        selection.add(node)
+    network = {}
+    for index, node in enumerate(nodes):
+        network[node] = [types.get(node), read_modified_attributes(om2.MFnDependencyNode(selection.getDependNode(index)))]
+    
+    textures = {}
+    for node_type in TEXTURE_FILE_ATTRIBUTES:
+        texture_nodes = [node for node in nodes if types.get(node) == node_type]
+        if not texture_nodes:
+            continue
+        for node, path in read_texture_paths({node_type: texture_nodes}).items():
+            # La taille sur disque change quand une texture est remplacée sous le même chemin
+            textures[node] = [path] + list(texture_disk_usage(path))
+    return {'nodes': network, 'connections': sorted(connections), 'textures': textures}
+
+
+def read_asset_content(asset, networks=None):
+    """Lit ce qui détermine le fichier exporté d'un asset (chemin long d'un groupe)
+    
+    Retourne des données simples, indexées par chemin relatif au parent de l'asset :
+    matrice locale de chaque transform, hash de géométrie de chaque mesh (hash_meshes :
+    positions, topologie, UV sets et color sets, cache invalidé à chaque modification),
+    shading groups de chaque mesh et réseau de chaque shading group (read_material_network).
+    Les matrices et les assignations sont lues via l'API Maya 2.0, sans appel cmds par node.
+    networks : dict {shading group: réseau} réutilisé entre les assets d'une même file.
+    """
+    import maya.api.OpenMaya as om2
+    
+    root_length = len(asset.rpartition('|')[0])
+    transforms = [asset] + (cmds.listRelatives(asset, allDescendents=True, type='transform', fullPath=True) or [])
+    shapes = cmds.listRelatives(asset, allDescendents=True, type='mesh', fullPath=True, noIntermediate=True) or []
+    
+    selection = om2.MSelectionList()
+    for node in transforms + shapes:
+        selection.add(node)
+    
+    matrices = {}
+    for index, transform in enumerate(transforms):
+        matrix = om2.MFnDagNode(selection.getDagPath(index)).transformationMatrix()
+        matrices[transform[root_length:]] = [round(value, 6) for value in matrix]
+    
+    materials = {}
+    for index, shape in enumerate(shapes, len(transforms)):
+        dag_path = selection.getDagPath(index)
+        shading_groups, face_indices = om2.MFnMesh(dag_path).getConnectedShaders(dag_path.instanceNumber())
+        names = [om2.MFnDependencyNode(shading_group).name() for shading_group in shading_groups]
+        # Les indices par face ne comptent que si plusieurs shading groups se partagent le mesh
+        materials[shape[root_length:]] = [names, list(face_indices)] if len(names) > 1 else names
+    
+    networks = {} if networks is None else networks
+    shading = {}
+    for names in materials.values():
+        for shading_group in (names[0] if names and isinstance(names[0], list) else names):
+            if shading_group not in networks:
+                networks[shading_group] = read_material_network(shading_group)
+            shading[shading_group] = networks[shading_group]
+    
+    geometry = hash_meshes(shapes, verbose=False) if shapes else {}
+    return {
+        'transforms': matrices,
+        'meshes': {shape[root_length:]: geometry_hash for shape, (geometry_hash, _) in geometry.items()},
+        'materials': materials,
+        'shading': shading,
+    }
+
+
+def hash_asset_content(content):
+    """Hash stable du contenu d'un asset lu par read_asset_content (fonction pure)"""
+    import hashlib
     
-    import maya.mel as mel
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def export_cache_key(content_hash, preset_hash):
+    """Clé du cache d'export : même contenu et même preset donnent le même fichier (fonction pure)"""
+    import hashlib
     
-    # Charge le plugin FBX si nécessaire
-    if not cmds.pluginInfo("fbxmaya", query=True, loaded=True):
+    return hashlib.sha1(f"{content_hash}:{preset_hash}".encode('utf-8')).hexdigest()
+
+
+class ExportCache(object):
+    """Cache de fichiers exportés adressé par le contenu (clés de export_cache_key)
+    
+    Les fichiers sont rangés sous <directory>/<clé[:2]>/<clé><extension>. La date de
+    modification sert d'horodatage LRU (mise à jour à chaque accès) : quand la taille
+    totale dépasse max_bytes, les fichiers les moins récemment utilisés sont supprimés.
+    Un accès réussi crée un lien physique vers le fichier du cache (copie si link=False
+    ou si le volume ne les supporte pas) : les fichiers ainsi livrés sont à traiter en
+    lecture seule. Pur Python, sans appel Maya ; plusieurs sessions peuvent partager le dossier.
+    """
+    
+    def __init__(self, directory=None, max_bytes=None, link=True):
+        import collections
+        
+        self.directory = directory or EXPORT_CACHE_DIR
+        self.max_bytes = EXPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.total_bytes = 0
+        self._entries = collections.OrderedDict()  # chemin -> octets, du moins au plus récent
+        self._scan()
+    
+    def _scan(self):
+        files = []
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._add(path, size)
+    
+    def _add(self, path, size):
+        self._forget(path)
+        self._entries[path] = size
+        self.total_bytes += size
+    
+    def _forget(self, path):
+        self.total_bytes -= self._entries.pop(path, 0)
+    
+    def path(self, key, extension):
+        return os.path.join(self.directory, key[:2], key + extension)
+    
+    def fetch(self, key, extension, destination):
+        """Livre le fichier de la clé dans destination ; retourne False s'il n'est pas en cache"""
+        import shutil
+        
+        cached = self.path(key, extension)
+        if cached not in self._entries:
+            # Peut avoir été ajouté par une autre session depuis le scan
+            if not os.path.isfile(cached):
+                self.misses += 1
+                return False
+            self._add(cached, os.path.getsize(cached))
+        
         try:
-            cmds.loadPlugin("fbxmaya")
-        except:
-            cmds.error("Impossible de charger le plugin FBX")
-            return
+            if os.path.exists(destination):
+                os.remove(destination)
+            if self.link:
+                try:
+                    os.link(cached, destination)
+                except OSError:
+                    # Autre volume ou système de fichiers sans liens physiques
+                    shutil.copyfile(cached, destination)
+            else:
+                shutil.copyfile(cached, destination)
+            os.utime(cached)
+        except (IOError, OSError):
+            # Supprimé entre-temps (éviction par une autre session)
+            self._forget(cached)
+            self.misses += 1
+            return False
+        
+        self._entries.move_to_end(cached)
+        self.hits += 1
+        return True
     
-    # Définit FBX comme type d'export et ouvre le dialogue avec options
-    cmds.optionVar(sv=("defaultFileExportActiveType", "FBX export"))
-    mel.eval('ExportSelectionOptions')
+    def store(self, key, extension, source):
+        """Copie source dans le cache sous la clé puis évince au-delà de max_bytes
+        
+        Retourne False si le fichier dépasse à lui seul la taille du cache.
+        """
+        import shutil
+        
+        size = os.path.getsize(source)
+        if size > self.max_bytes:
+            return False
+        cached = self.path(key, extension)
+        directory = os.path.dirname(cached)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        # Écriture atomique : une autre session ne voit jamais un fichier incomplet
+        temp_path = f"{cached}.{os.getpid()}.tmp"
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, cached)
+        self._add(cached, size)
+        self.evict()
+        return True
+    
+    def evict(self, max_bytes=None):
+        """Supprime les fichiers les moins récemment utilisés jusqu'à passer sous max_bytes"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        while self.total_bytes > max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evicted += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def read_export_manifest(path):
+    """Entrées {nom de fichier: export} du manifest, vide s'il est absent ou illisible"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('assets', {})
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def export_asset_file(asset, path, preset):
+    """Exporte asset (et sa hiérarchie) dans path avec les options du preset, sans dialogue"""
+    cmds.select(asset, replace=True)
+    options = ''
+    if preset['format'] == 'fbx':
+        import maya.mel as mel
+        
+        mel.eval('FBXResetExport')
+        for command in fbx_option_commands(preset['options']):
+            mel.eval(command)
+    else:
+        options = translator_options(preset['options'])
+    cmds.file(path, force=True, options=options, type=preset['type'], exportSelected=True)
+
+
+class ExportQueue(object):
+    """File d'exports d'assets vers output_dir, un fichier par asset, dans l'ordre d'ajout
+    
+    Les exports Maya tournent sur le thread principal : run() traite toute la file. Le
+    manifest JSON du dossier (hash du contenu et du preset, taille et durée de chaque
+    fichier) est réécrit pendant la file et à la fin ; un asset dont le contenu et le
+    preset n'ont pas changé depuis son dernier export, et dont le fichier existe encore,
+    est ignoré (sauf avec force=True). Avec un ExportCache, un asset déjà exporté ailleurs
+    (même contenu, même preset) est repris du cache au lieu d'être exporté, et chaque
+    nouvel export y est ajouté. Un asset en échec n'arrête pas la file.
+    """
+    
+    def __init__(self, output_dir, preset, force=False, cache=None):
+        self.output_dir = output_dir
+        self.preset = preset
+        self.preset_hash = preset_hash(preset)
+        self.force = force
+        self.cache = cache
+        self.manifest_path = os.path.join(output_dir, EXPORT_MANIFEST)
+        self.manifest = read_export_manifest(self.manifest_path)
+        self.records = []
+        self._pending = []
+        self._names = set()
+        self._networks = {}  # shading group -> réseau, lu une fois par file
+        self._manifest_dirty = False
+        self._manifest_time = 0.0
+    
+    def add(self, asset):
+        """Ajoute un asset (chemin long) ; retourne son enregistrement"""
+        name = re.sub(r'\W', '_', asset.rpartition('|')[2])
+        while name in self._names:
+            name += '_'
+        self._names.add(name)
+        
+        record = {
+            'asset': asset,
+            'name': name,
+            'path': os.path.join(self.output_dir, name + self.preset['extension']),
+            'status': 'queued',
+            'error': None,
+            'hash': None,
+            'bytes': 0,
+            'seconds': 0,
+        }
+        self.records.append(record)
+        self._pending.append(record)
+        return record
+    
+    def run(self):
+        """Traite les assets en attente ; retourne tous les enregistrements"""
+        try:
+            while self._pending:
+                self._export(self._pending.pop(0))
+        finally:
+            if self._manifest_dirty:
+                self.write_manifest()
+        return self.records
+    
+    def is_up_to_date(self, record):
+        previous = self.manifest.get(os.path.basename(record['path']))
+        return (not self.force and previous is not None and previous['hash'] == record['hash']
+                and previous['preset_hash'] == self.preset_hash and os.path.isfile(record['path']))
+    
+    def _export(self, record):
+        start = time.perf_counter()
+        try:
+            tool_phase('hash')
+            record['hash'] = hash_asset_content(read_asset_content(record['asset'], self._networks))
+            cache_key = export_cache_key(record['hash'], self.preset_hash)
+            extension = self.preset['extension']
+            if self.is_up_to_date(record):
+                record['status'] = 'skipped'
+            elif self.cache is not None and not self.force and self.cache.fetch(cache_key, extension, record['path']):
+                record['status'] = 'cached'
+            else:
+                tool_phase('export')
+                # Le fichier existant peut être un lien vers le cache : Maya ne doit pas l'écraser sur place
+                if os.path.exists(record['path']):
+                    os.remove(record['path'])
+                export_asset_file(record['asset'], record['path'], self.preset)
+                record['status'] = 'exported'
+                if self.cache is not None:
+                    self.cache.store(cache_key, extension, record['path'])
+            record['bytes'] = os.path.getsize(record['path'])
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+            cmds.warning(f"Export: échec de {record['asset']}: {str(e)}")
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        
+        file_name = os.path.basename(record['path'])
+        if record['status'] == 'failed' and file_name in self.manifest:
+            # Le fichier a pu être écrit en partie : il ne doit plus être considéré à jour
+            del self.manifest[file_name]
+            self._manifest_dirty = True
+        elif record['status'] in ('exported', 'cached'):
+            self.manifest[file_name] = {
+                'asset': record['asset'],
+                'hash': record['hash'],
+                'preset_hash': self.preset_hash,
+                'bytes': record['bytes'],
+                'seconds': record['seconds'],
+                'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self._manifest_dirty = True
+            # Réécrire tout le manifest après chaque fichier coûterait O(n²) sur une grosse file
+            if time.perf_counter() - self._manifest_time > EXPORT_MANIFEST_INTERVAL:
+                self.write_manifest()
+        print(f"[Export] {record['name']}: {record['status']} "
+              f"({format_bytes(record['bytes'])}, {record['seconds']:.2f}s)")
+    
+    def write_manifest(self):
+        """Écrit le manifest JSON (preset et dernier export de chaque fichier)"""
+        manifest = {'preset': self.preset, 'assets': self.manifest}
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+        self._manifest_dirty = False
+        self._manifest_time = time.perf_counter()
+
+
+_export_cache = None
+
 
+def get_export_cache():
+    """Cache d'export par défaut (EXPORT_CACHE_DIR), créé et scanné une fois par session"""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportCache()
+    return _export_cache
 
-def quick_usd_export():
-    """Ouvre la fenêtre d'export USD avec options"""
+
+def export_assets(assets=None, preset='fbx', output_dir=None, force=False, cache=True):
+    """Exporte chaque asset dans son propre fichier, sans dialogue d'options
+    
+    assets : groupes de plus haut niveau, par défaut ceux sélectionnés.
+    preset : nom d'un preset (voir load_export_presets) ou dict partiel complété par le
+    preset de son format. output_dir : par défaut <workspace>/export/<format>.
+    Les assets inchangés depuis leur dernier export dans output_dir sont ignorés et ceux
+    déjà exportés ailleurs sont repris du cache d'export (force=True pour tout réexporter).
+    cache : True pour le cache par défaut (EXPORT_CACHE_DIR), un ExportCache, ou False.
+    Utilisable en script et en mayapy.
+    Retourne la liste des enregistrements (asset, fichier, statut, octets, secondes).
+    """
+    tool_phase('query')
+    if assets is None:
+        assets = cmds.ls(sl=True, long=True, assemblies=True) or []
+    else:
+        assets = cmds.ls(assets, long=True) or []
+    if not assets:
+        cmds.warning("Aucun asset ! Sélectionnez des groupes de plus haut niveau.")
+        return []
     
-    import maya.mel as mel
+    preset = get_export_preset(preset)
     
-    # Charge le plugin USD si nécessaire
-    if not cmds.pluginInfo("mayaUsdPlugin", query=True, loaded=True):
+    # Charge le plugin d'export si nécessaire
+    if not cmds.pluginInfo(preset['plugin'], query=True, loaded=True):
         try:
-            cmds.loadPlugin("mayaUsdPlugin")
+            cmds.loadPlugin(preset['plugin'])
         except:
-            cmds.error("Impossible de charger le plugin USD (mayaUsdPlugin)")
-            return
+            cmds.error(f"Impossible de charger le plugin {preset['plugin']}")
+            return []
+    
+    if output_dir is None:
+        output_dir = os.path.join(cmds.workspace(query=True, rootDirectory=True), 'export', preset['format'])
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    
+    if cache is True:
+        cache = get_export_cache()
+    # Le cache est partagé entre les appels : compteurs affichés pour cet appel seulement
+    hits, evicted = (cache.hits, cache.evicted) if cache else (0, 0)
+    
+    start = time.perf_counter()
+    previous_selection = cmds.ls(sl=True, long=True) or []
+    queue = ExportQueue(output_dir, preset, force=force, cache=cache or None)
+    for asset in assets:
+        queue.add(asset)
+    try:
+        records = queue.run()
+    finally:
+        if previous_selection:
+            cmds.select(previous_selection, replace=True)
+        else:
+            cmds.select(clear=True)
+    
+    tool_phase('report')
+    statuses = {}
+    for record in records:
+        statuses[record['status']] = statuses.get(record['status'], 0) + 1
     
-    # Définit USD comme type d'export et ouvre le dialogue avec options
-    cmds.optionVar(sv=("defaultFileExportActiveType", "USD Export"))
-    mel.eval('ExportSelectionOptions')
+    print("=" * 50)
+    print(f"Export {preset['format'].upper()} terminé: {len(records)} asset(s) en {time.perf_counter() - start:.1f}s")
+    for status, count in sorted(statuses.items()):
+        print(f"  - {status}: {count}")
+    print(f"  - {format_bytes(sum(record['bytes'] for record in records if record['status'] == 'exported'))} écrit(s)")
+    if cache:
+        print(f"  - Cache: {cache.hits - hits} fichier(s) repris, {cache.evicted - evicted} évincé(s), "
+              f"{format_bytes(cache.total_bytes)} / {format_bytes(cache.max_bytes)}")
+    print(f"  - Dossier: {output_dir}")
+    print("=" * 50)
+    return records
+
+
+def quick_fbx_export(output_dir=None, force=False, cache=True):
+    """Exporte chaque groupe sélectionné en FBX (preset 'fbx'), un fichier par groupe"""
+    return export_assets(preset='fbx', output_dir=output_dir, force=force, cache=cache)
+
+
+def quick_usd_export(output_dir=None, force=False, cache=True):
+    """Exporte chaque groupe sélectionné en USD (preset 'usd'), un fichier par groupe"""
+    return export_assets(preset='usd', output_dir=output_dir, force=force, cache=cache)
 
 
 def select_by_type():
-    """Ouvre une fenêtre pour sélectionner des objets par type"""
+    """Ouvre une fenêtre pour sélectionner des objets par type ou par filtre"""
     
     window_name = "selectByTypeWindow"
     
@@ -364,101 +2203,745 @@ def select_by_type():
         cmds.deleteUI(window_name)
     
     # Crée la fenêtre
-    window = cmds.window(window_name, title="Select by Type", widthHeight=(250, 320), sizeable=True)
+    height = 90 + 30 * len(SELECTION_FILTERS)
+    window = cmds.window(window_name, title="Select by Type", widthHeight=(250, height), sizeable=True)
     
     cmds.columnLayout(adjustableColumn=True, rowSpacing=5, columnOffset=('both', 10))
     
-    cmds.separator(height=10, style='none')
-    cmds.text(label="Sélectionner par type:", align='left', font='boldLabelFont')
-    cmds.separator(height=10, style='none')
+    cmds.separator(height=10, style='none')
+    cmds.text(label="Sélectionner par type:", align='left', font='boldLabelFont')
+    cmds.separator(height=10, style='none')
+    
+    # Un bouton par filtre, y compris ceux ajoutés par register_selection_filter
+    for name, spec in SELECTION_FILTERS.items():
+        cmds.button(label=spec['label'], command=lambda x, name=name: select_type(name), height=25)
+    
+    cmds.separator(height=10, style='none')
+    
+    cmds.showWindow(window)
+
+
+MAYA_LIGHT_TYPES = ['ambientLight', 'directionalLight', 'pointLight', 'spotLight', 'areaLight', 'volumeLight']
+ARNOLD_LIGHT_TYPES = ['aiAreaLight', 'aiSkyDomeLight', 'aiMeshLight', 'aiPhotometricLight', 'aiLightPortal']
+
+# Filtres de Select by Type : types de nodes, conditions sur leurs valeurs (where) et options
+#   transforms      : les nodes sont eux-mêmes des transforms (joints), pas des shapes
+#   exclude_startup : ignore les caméras par défaut (persp, top, front, side)
+SELECTION_FILTERS = {
+    'mesh': {'label': "Meshes", 'types': ['mesh']},
+    'nurbsCurve': {'label': "Curves", 'types': ['nurbsCurve']},
+    'nurbsSurface': {'label': "Surfaces NURBS", 'types': ['nurbsSurface']},
+    'joint': {'label': "Joints", 'types': ['joint'], 'transforms': True},
+    'locator': {'label': "Locators", 'types': ['locator']},
+    'camera': {'label': "Cameras", 'types': ['camera'], 'exclude_startup': True},
+    'light': {'label': "Lights", 'types': MAYA_LIGHT_TYPES},
+    'aiLight': {'label': "Arnold Lights", 'types': ARNOLD_LIGHT_TYPES},
+    'heavyMesh': {'label': "Meshes > 100k faces", 'types': ['mesh'], 'where': [('faceCount', '>', 100000)]},
+    'blackLight': {'label': "Lights intensité 0", 'types': MAYA_LIGHT_TYPES + ARNOLD_LIGHT_TYPES,
+                   'where': [('intensity', '==', 0)]},
+}
+
+FILTER_OPERATORS = {
+    '==': lambda value, reference: value == reference,
+    '!=': lambda value, reference: value != reference,
+    '>': lambda value, reference: value > reference,
+    '>=': lambda value, reference: value >= reference,
+    '<': lambda value, reference: value < reference,
+    '<=': lambda value, reference: value <= reference,
+}
+
+# Valeurs calculées (pas des attributs) : nom -> lecture depuis le MObject du shape
+NODE_VALUE_READERS = {
+    'faceCount': lambda om2, mobject: om2.MFnMesh(mobject).numPolygons,
+    'vertexCount': lambda om2, mobject: om2.MFnMesh(mobject).numVertices,
+}
+
+# Cache des candidats par filtre : nom -> (version de l'index de scène, [(node, transform)])
+_selection_cache = {}
+
+
+def register_selection_filter(name, label, types, where=None, **options):
+    """Ajoute un filtre à Select by Type
+    
+    where : liste de (attribut ou valeur calculée, opérateur, valeur), toutes vraies.
+    Exemple : register_selection_filter('bigLights', "Lights > 10", MAYA_LIGHT_TYPES,
+                                        where=[('intensity', '>', 10)])
+    """
+    for attribute, operator, value in where or []:
+        if operator not in FILTER_OPERATORS:
+            cmds.error(f"Opérateur inconnu '{operator}' (disponibles: {', '.join(FILTER_OPERATORS)})")
+    SELECTION_FILTERS[name] = dict(options, label=label, types=list(types), where=list(where or []))
+    _selection_cache.pop(name, None)
+
+
+def query_node_values(nodes, attributes):
+    """Valeurs de plusieurs attributs pour tous les nodes, en une passe API 2.0
+    
+    Retourne {attribut: [valeur par node]} ; None si le node n'a pas l'attribut.
+    """
+    import maya.api.OpenMaya as om2
+    
+    selection = om2.MSelectionList()
+    for node in nodes:
+        selection.add(node)
+    
+    values = {attribute: [] for attribute in attributes}
+    for i in range(selection.length()):
+        mobject = selection.getDependNode(i)
+        fn_node = om2.MFnDependencyNode(mobject)
+        for attribute in attributes:
+            reader = NODE_VALUE_READERS.get(attribute)
+            if reader:
+                value = reader(om2, mobject)
+            elif fn_node.hasAttribute(attribute):
+                value = fn_node.findPlug(attribute, False).asDouble()
+            else:
+                value = None
+            values[attribute].append(value)
+    return values
+
+
+def filter_candidates(spec):
+    """Nodes des types du filtre et leur transform, en chemins longs : [(node, transform)]"""
+    index = get_scene_index()
+    if index is not None:
+        uuids = index.nodes_of_type(spec['types'])
+        if not spec.get('transforms'):
+            uuids = [uuid for uuid in uuids if uuid in index.parents]
+        nodes = index.paths(uuids)
+    else:
+        nodes = cmds.ls(type=spec['types'], long=True) or []
+    
+    if spec.get('exclude_startup'):
+        # Les caméras par défaut sont toujours sous un transform à la racine
+        nodes = [node for node in nodes
+                 if node.count('|') != 2 or not cmds.camera(node, query=True, startupCamera=True)]
+    
+    if spec.get('transforms'):
+        return [(node, node) for node in nodes]
+    # Le parent se lit dans le chemin long : aucun listRelatives par shape
+    return [(node, node.rpartition('|')[0]) for node in nodes if node.count('|') > 1]
+
+
+def find_filtered_nodes(name, use_cache=True):
+    """Transforms correspondant au filtre name de SELECTION_FILTERS, dédupliqués
+    
+    Avec l'index de scène actif, les candidats sont mis en cache jusqu'au prochain
+    changement de la scène ; les conditions where sont toujours réévaluées.
+    """
+    spec = SELECTION_FILTERS.get(name) or {'label': name, 'types': [name]}
+    
+    index = get_scene_index()
+    cached = _selection_cache.get(name)
+    if use_cache and index is not None and cached and cached[0] == index.version:
+        candidates = cached[1]
+    else:
+        candidates = filter_candidates(spec)
+        if index is not None:
+            _selection_cache[name] = (index.version, candidates)
+    
+    where = spec.get('where')
+    if where and candidates:
+        attributes = list(dict.fromkeys(attribute for attribute, _, _ in where))
+        values = query_node_values([node for node, _ in candidates], attributes)
+        kept = []
+        for i, candidate in enumerate(candidates):
+            if all(values[attribute][i] is not None
+                   and FILTER_OPERATORS[operator](values[attribute][i], reference)
+                   for attribute, operator, reference in where):
+                kept.append(candidate)
+        candidates = kept
+    
+    return list(dict.fromkeys(transform for _, transform in candidates))
+
+
+def select_type(name, use_cache=True):
+    """Sélectionne tous les objets d'un type ou d'un filtre de SELECTION_FILTERS"""
+    label = SELECTION_FILTERS.get(name, {}).get('label', name)
+    transforms = find_filtered_nodes(name, use_cache=use_cache)
+    
+    if transforms:
+        cmds.select(transforms, replace=True)
+        print(f"{len(transforms)} objet(s) sélectionné(s) : {label}")
+    else:
+        cmds.select(clear=True)
+        print(f"Aucun objet trouvé : {label}")
+    return transforms
+
+
+# Attribut portant le chemin du fichier, par type de node texture
+TEXTURE_FILE_ATTRIBUTES = {'file': 'fileTextureName', 'aiImage': 'filename'}
+
+# Tokens de tuiles (UDIM, UV tiles) et de frames, remplacés par un joker pour trouver les fichiers
+TEXTURE_TILE_TOKENS = re.compile(r'<udim>|<uvtile>|u<u>_v<v>|<u>_<v>|<f>|<frame>|#+', re.IGNORECASE)
+
+# Nombre de threads pour lire la taille des textures sur disque
+STATISTICS_WORKERS = 8
+
+# Colonnes (titre, clé) de chaque vue du tableau de statistiques
+STATISTICS_VIEWS = {
+    'Types': [("Type", 'name'), ("Nodes", 'count')],
+    'Assets': [("Asset", 'name'), ("Triangles", 'triangles'), ("Sommets", 'vertices'),
+               ("Meshes", 'meshes'), ("Mémoire", 'memory_bytes')],
+    'Textures': [("Node", 'name'), ("Taille", 'bytes'), ("Fichiers", 'files'), ("Chemin", 'path')],
+}
+
+# Dernières statistiques affichées et lignes du tableau (fenêtre Scene Statistics)
+_scene_statistics = {'stats': None, 'rows': []}
+
+
+def format_bytes(size):
+    """Taille lisible : 512 o, 3.2 Ko, 1.5 Mo, 2.0 Go"""
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} Go"
+
+
+def list_directory(directory):
+    """Noms de fichiers triés d'un dossier (vide s'il n'existe pas)"""
+    try:
+        return sorted(os.listdir(directory))
+    except OSError:
+        return []
+
+
+def texture_files(path, listings=None):
+    """Fichiers sur disque d'un chemin de texture, toutes tuiles et frames comprises
+    
+    listings : {dossier: noms triés} déjà lus, pour ne lister chaque dossier qu'une fois.
+    """
+    import bisect
+    
+    directory, name = os.path.split(path)
+    parts = TEXTURE_TILE_TOKENS.split(name)
+    if len(parts) == 1:
+        return [path] if os.path.isfile(path) else []
+    
+    names = listings[directory] if listings is not None else list_directory(directory)
+    pattern = re.compile('.+?'.join(re.escape(part) for part in parts))
+    # Les noms sont triés : seuls ceux qui commencent par la partie fixe sont testés
+    files = []
+    for entry in names[bisect.bisect_left(names, parts[0]):]:
+        if not entry.startswith(parts[0]):
+            break
+        if pattern.fullmatch(entry):
+            files.append(os.path.join(directory, entry))
+    return files
+
+
+def texture_disk_usage(path, listings=None):
+    """(nombre de fichiers, taille totale en octets) d'un chemin de texture"""
+    files = texture_files(path, listings)
+    total = 0
+    for file_path in files:
+        try:
+            total += os.path.getsize(file_path)
+        except OSError:
+            pass
+    return len(files), total
+
+
+def measure_texture_files(paths, workers=STATISTICS_WORKERS):
+    """{chemin: (fichiers, octets)} ; les accès disque sont répartis sur un pool de threads"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    unique_paths = list(dict.fromkeys(paths))
+    if not unique_paths:
+        return {}
+    tiled_directories = list(dict.fromkeys(os.path.dirname(path) for path in unique_paths
+                                           if TEXTURE_TILE_TOKENS.search(os.path.basename(path))))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        listings = dict(zip(tiled_directories, pool.map(list_directory, tiled_directories)))
+        usage = pool.map(lambda path: texture_disk_usage(path, listings), unique_paths)
+        return dict(zip(unique_paths, usage))
+
+
+def gather_mesh_statistics(meshes):
+    """Sommets, triangles et mémoire estimée de chaque shape mesh, en une passe API 2.0"""
+    import maya.api.OpenMaya as om2
+    
+    selection = om2.MSelectionList()
+    for mesh in meshes:
+        selection.add(mesh)
+    
+    results = []
+    for i in range(selection.length()):
+        fn_mesh = om2.MFnMesh(selection.getDagPath(i))
+        vertices = fn_mesh.numVertices
+        faces = fn_mesh.numPolygons
+        face_vertices = fn_mesh.numFaceVertices
+        results.append({
+            'vertices': vertices,
+            'triangles': face_vertices - 2 * faces,
+            'memory_bytes': estimate_mesh_bytes(vertices, faces, face_vertices),
+            'intermediate': fn_mesh.isIntermediateObject,
+        })
+    return results
+
+
+def read_texture_paths(nodes_by_type):
+    """{node: chemin absolu} des nodes texture, lus en une passe API 2.0 par type"""
+    import maya.api.OpenMaya as om2
+    
+    root = cmds.workspace(query=True, rootDirectory=True) or ''
+    paths = {}
+    for node_type, nodes in nodes_by_type.items():
+        attribute = TEXTURE_FILE_ATTRIBUTES[node_type]
+        selection = om2.MSelectionList()
+        for node in nodes:
+            selection.add(node)
+        for node, i in zip(nodes, range(selection.length())):
+            path = om2.MFnDependencyNode(selection.getDependNode(i)).findPlug(attribute, False).asString()
+            if path:
+                path = os.path.expandvars(path)
+                paths[node] = os.path.normpath(path if os.path.isabs(path) else os.path.join(root, path))
+    return paths
+
+
+def gather_scene_statistics(workers=STATISTICS_WORKERS):
+    """Statistiques de la scène : nodes par type, polycount et mémoire des meshes
+    (total et par asset de premier niveau), taille des textures sur disque
+    
+    Un seul ls sur la scène ; meshes et textures sont lus par l'API en une passe,
+    les tailles de fichiers dans un pool de threads.
+    """
+    start = time.perf_counter()
+    
+    listing = cmds.ls(long=True, showType=True) or []
+    nodes, types = listing[::2], listing[1::2]
+    
+    type_counts = {}
+    meshes = []
+    textures = {}
+    for node, node_type in zip(nodes, types):
+        type_counts[node_type] = type_counts.get(node_type, 0) + 1
+        if node_type == 'mesh':
+            meshes.append(node)
+        elif node_type in TEXTURE_FILE_ATTRIBUTES:
+            textures.setdefault(node_type, []).append(node)
+    
+    # Meshes, regroupés par asset (transform à la racine)
+    assets = {}
+    totals = {'nodes': len(nodes), 'meshes': 0, 'vertices': 0, 'triangles': 0, 'memory_bytes': 0}
+    for mesh, mesh_stats in zip(meshes, gather_mesh_statistics(meshes)):
+        # Les shapes intermédiaires (historique) ne sont pas rendus mais occupent la mémoire
+        totals['memory_bytes'] += mesh_stats['memory_bytes']
+        asset = assets.setdefault('|' + mesh.split('|')[1], {'meshes': 0, 'vertices': 0, 'triangles': 0, 'memory_bytes': 0})
+        asset['memory_bytes'] += mesh_stats['memory_bytes']
+        if mesh_stats['intermediate']:
+            continue
+        for stats in (totals, asset):
+            stats['meshes'] += 1
+            stats['vertices'] += mesh_stats['vertices']
+            stats['triangles'] += mesh_stats['triangles']
+    
+    # Textures : taille sur disque de chaque chemin (une fois par chemin)
+    texture_paths = read_texture_paths(textures)
+    usage = measure_texture_files(texture_paths.values(), workers)
+    texture_stats = {}
+    for node, path in texture_paths.items():
+        file_count, size = usage[path]
+        texture_stats[node] = {'path': path, 'files': file_count, 'bytes': size}
+    totals['textures'] = len(texture_stats)
+    totals['texture_bytes'] = sum(size for _, size in usage.values())
+    totals['missing_textures'] = sum(1 for stats in texture_stats.values() if not stats['files'])
+    
+    return {
+        'scene': cmds.file(query=True, sceneName=True) or "untitled",
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'seconds': round(time.perf_counter() - start, 3),
+        'totals': totals,
+        'node_types': dict(sorted(type_counts.items(), key=lambda item: item[1], reverse=True)),
+        'assets': assets,
+        'textures': texture_stats,
+    }
+
+
+def statistics_rows(stats, view):
+    """Lignes d'une vue du tableau : liste de dicts avec la clé 'name'"""
+    if view == 'Types':
+        return [{'name': node_type, 'count': count} for node_type, count in stats['node_types'].items()]
+    source = stats['assets'] if view == 'Assets' else stats['textures']
+    return [dict(values, name=name) for name, values in source.items()]
+
+
+def format_statistics_table(rows, columns, sort_key, descending=True):
+    """Lignes de texte à colonnes fixes, triées sur sort_key (textes : ordre alphabétique)"""
+    numeric = bool(rows) and not isinstance(rows[0].get(sort_key), str)
+    if numeric:
+        rows = sorted(rows, key=lambda row: row.get(sort_key) or 0, reverse=descending)
+    else:
+        rows = sorted(rows, key=lambda row: str(row.get(sort_key, '')).lower())
+    
+    def cell(row, key):
+        value = row.get(key, '')
+        if key in ('memory_bytes', 'bytes'):
+            return format_bytes(value)
+        if isinstance(value, int):
+            return f"{value:,}".replace(',', ' ')
+        return str(value).rpartition('|')[2] if key == 'name' else str(value)
+    
+    widths = [max([len(title)] + [len(cell(row, key)) for row in rows]) for title, key in columns]
+    header = "  ".join(title.ljust(width) for (title, _), width in zip(columns, widths))
+    lines = ["  ".join(cell(row, key).ljust(width) if i == 0 or key == 'path' else cell(row, key).rjust(width)
+                       for i, ((_, key), width) in enumerate(zip(columns, widths)))
+             for row in rows]
+    return header, lines, rows
+
+
+def export_scene_statistics(stats, path=None):
+    """Écrit les statistiques en JSON (défaut : <scène>_stats.json) ; retourne le chemin"""
+    import tempfile
+    
+    if path is None:
+        scene = stats['scene'] if stats['scene'] != "untitled" else os.path.join(tempfile.gettempdir(), "untitled")
+        path = os.path.splitext(scene)[0] + "_stats.json"
+    with open(path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    print(f"Statistiques exportées: {path}")
+    return path
+
+
+def scene_statistics():
+    """Ouvre le tableau de bord des statistiques de la scène"""
+    
+    window_name = "sceneStatisticsWindow"
+    
+    # Ferme la fenêtre si elle existe déjà
+    if cmds.window(window_name, exists=True):
+        cmds.deleteUI(window_name)
+    
+    window = cmds.window(window_name, title="Scene Statistics", widthHeight=(560, 520), sizeable=True)
+    
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=6, columnOffset=('both', 10))
+    
+    cmds.separator(height=10, style='none')
+    cmds.text("sceneStatisticsSummary", label="", align='left')
+    
+    refresh = lambda *args: update_scene_statistics_table()
+    
+    cmds.rowLayout(numberOfColumns=3, adjustableColumn=3)
+    cmds.optionMenu("sceneStatisticsView", label="Vue:", changeCommand=lambda *args: update_scene_statistics_sort())
+    for view in STATISTICS_VIEWS:
+        cmds.menuItem(label=view)
+    cmds.optionMenu("sceneStatisticsSort", label="Trier par:", changeCommand=refresh)
+    cmds.checkBox("sceneStatisticsDescending", label="Décroissant", value=True, changeCommand=refresh)
+    cmds.setParent('..')
+    
+    cmds.text("sceneStatisticsHeader", label="", align='left', font='fixedWidthFont')
+    cmds.textScrollList("sceneStatisticsTable", height=340, allowMultiSelection=True, font='fixedWidthFont',
+                        selectCommand=select_scene_statistics_rows)
+    
+    cmds.rowLayout(numberOfColumns=2, adjustableColumn=1)
+    cmds.button(label="Actualiser", command=lambda x: refresh_scene_statistics(), height=30)
+    cmds.button(label="Exporter JSON", command=lambda x: export_scene_statistics_dialog(), height=30)
+    cmds.setParent('..')
+    
+    cmds.showWindow(window)
+    
+    update_scene_statistics_sort()
+    refresh_scene_statistics()
+
+
+def refresh_scene_statistics():
+    """Recalcule les statistiques puis met à jour la fenêtre"""
+    stats = gather_scene_statistics()
+    _scene_statistics['stats'] = stats
+    
+    totals = stats['totals']
+    summary = (f"{totals['nodes']} nodes, {totals['meshes']} meshes, {totals['triangles']:,} triangles, "
+               f"{totals['vertices']:,} sommets, mémoire mesh ~{format_bytes(totals['memory_bytes'])}, "
+               f"{totals['textures']} textures ({format_bytes(totals['texture_bytes'])}, "
+               f"{totals['missing_textures']} manquante(s)) - {stats['seconds']:.2f}s").replace(',', ' ')
+    print(summary)
+    if cmds.text("sceneStatisticsSummary", exists=True):
+        cmds.text("sceneStatisticsSummary", edit=True, label=summary)
+        update_scene_statistics_table()
+    return stats
+
+
+def update_scene_statistics_sort():
+    """Remplit le menu de tri avec les colonnes de la vue choisie"""
+    view = cmds.optionMenu("sceneStatisticsView", query=True, value=True)
+    for item in cmds.optionMenu("sceneStatisticsSort", query=True, itemListLong=True) or []:
+        cmds.deleteUI(item)
+    columns = STATISTICS_VIEWS[view]
+    for title, _ in columns:
+        cmds.menuItem(label=title, parent="sceneStatisticsSort")
+    # Tri par défaut sur la première colonne chiffrée
+    cmds.optionMenu("sceneStatisticsSort", edit=True, value=columns[1][0])
+    update_scene_statistics_table()
+
+
+def update_scene_statistics_table():
+    """Affiche la vue et le tri choisis, sans requêter la scène"""
+    stats = _scene_statistics['stats']
+    if not stats or not cmds.textScrollList("sceneStatisticsTable", exists=True):
+        return
+    view = cmds.optionMenu("sceneStatisticsView", query=True, value=True)
+    sort_title = cmds.optionMenu("sceneStatisticsSort", query=True, value=True)
+    columns = STATISTICS_VIEWS[view]
+    sort_key = dict(columns).get(sort_title, columns[0][1])
+    descending = cmds.checkBox("sceneStatisticsDescending", query=True, value=True)
+    
+    header, lines, rows = format_statistics_table(statistics_rows(stats, view), columns, sort_key, descending)
+    _scene_statistics['rows'] = rows
+    cmds.text("sceneStatisticsHeader", edit=True, label=header)
+    cmds.textScrollList("sceneStatisticsTable", edit=True, removeAll=True)
+    if lines:
+        cmds.textScrollList("sceneStatisticsTable", edit=True, append=lines)
+
+
+def select_scene_statistics_rows():
+    """Sélectionne dans la scène les assets ou les nodes texture des lignes choisies"""
+    indices = cmds.textScrollList("sceneStatisticsTable", query=True, selectIndexedItem=True) or []
+    rows = _scene_statistics['rows']
+    if cmds.optionMenu("sceneStatisticsView", query=True, value=True) == 'Types':
+        nodes = cmds.ls(type=[rows[i - 1]['name'] for i in indices]) or []
+    else:
+        nodes = [rows[i - 1]['name'] for i in indices]
+    if nodes:
+        cmds.select(nodes, replace=True)
+
+
+def export_scene_statistics_dialog():
+    """Demande un fichier puis exporte les statistiques affichées"""
+    stats = _scene_statistics['stats']
+    if not stats:
+        cmds.warning("Aucune statistique à exporter")
+        return
+    default = os.path.splitext(stats['scene'])[0] + "_stats.json" if stats['scene'] != "untitled" else ""
+    result = cmds.fileDialog2(fileFilter="JSON (*.json)", dialogStyle=2, fileMode=0, startingDirectory=default)
+    if result:
+        export_scene_statistics(stats, result[0])
+
+
+# Preset de rendu par défaut (compositing). Un fichier de preset JSON/YAML peut
+# redéfinir tout ou partie de ces clés.
+DEFAULT_RENDER_PRESET = {
+    'resolution': [1920, 1080],
+    'frame_range': [0, 120],
+    'frame_padding': 3,
+    'driver': 'exr',
+    'merge_aovs': True,
+    'device': 'auto',  # 'cpu', 'gpu' ou 'auto' (GPU sous Windows uniquement)
+    'aovs': [
+        "RGBA",
+        "diffuse",
+        "specular",
+        "transmission",
+        "sss",
+        "emission",
+        "volume",
+        "N",
+        "Z",
+        "crypto_asset",
+        "crypto_object",
+        "crypto_material",
+    ],
+}
+
+# Valeur de defaultRenderGlobals.imageFormat pour chaque driver Arnold
+IMAGE_FORMATS = {
+    'exr': 40,
+    'png': 32,
+    'tif': 3,
+    'jpeg': 8,
+}
+
+
+def load_render_preset(path):
+    """Charge un preset de rendu depuis un fichier JSON ou YAML, complété par DEFAULT_RENDER_PRESET"""
+    with open(path, 'r') as preset_file:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                cmds.error("Le module yaml n'est pas disponible, utilisez un preset JSON")
+                return
+            data = yaml.safe_load(preset_file) or {}
+        else:
+            data = json.load(preset_file)
+    
+    return complete_render_preset(data)
+
+
+def complete_render_preset(data):
+    """Complète un preset de rendu partiel (dict) par DEFAULT_RENDER_PRESET"""
+    preset = dict(DEFAULT_RENDER_PRESET)
+    preset.update(data or {})
+    return preset
+
+
+def render_preset_attributes(preset, driver):
+    """Traduit un preset en valeurs d'attributs attendues {plug: valeur}"""
+    import platform
+    
+    attributes = {
+        "defaultRenderGlobals.currentRenderer": "arnold",
+        "defaultResolution.width": preset['resolution'][0],
+        "defaultResolution.height": preset['resolution'][1],
+        "defaultRenderGlobals.imageFormat": IMAGE_FORMATS.get(preset['driver'], 40),
+        f"{driver}.mergeAOVs": int(preset['merge_aovs']),
+        # Frame/Animation extension : name.###.ext
+        "defaultRenderGlobals.animation": 1,
+        "defaultRenderGlobals.putFrameBeforeExt": 1,
+        "defaultRenderGlobals.extensionPadding": preset['frame_padding'],
+        "defaultRenderGlobals.startFrame": preset['frame_range'][0],
+        "defaultRenderGlobals.endFrame": preset['frame_range'][1],
+    }
+    
+    # 'auto' : active le rendu GPU sous Windows, ne touche pas au device ailleurs
+    device = preset['device']
+    if device == 'auto':
+        device = 'gpu' if platform.system() == "Windows" else None
+    if device:
+        attributes["defaultArnoldRenderOptions.renderDevice"] = 1 if device == 'gpu' else 0  # 0=CPU, 1=GPU
+    
+    return attributes
+
+
+def diff_render_attributes(current, target, tolerance=1e-6):
+    """Retourne {plug: (valeur actuelle, valeur cible)} pour les attributs qui changent"""
+    diff = {}
+    for plug, value in target.items():
+        old_value = current.get(plug)
+        if isinstance(value, (int, float)) and isinstance(old_value, (int, float)):
+            if abs(old_value - value) <= tolerance:
+                continue
+        elif old_value == value:
+            continue
+        diff[plug] = (old_value, value)
+    return diff
+
+
+def get_arnold_driver(translator, create=True):
+    """Retourne le driver Arnold utilisant ce translator, en le créant si nécessaire
+    (create=False : None s'il n'existe pas)"""
+    for driver in cmds.ls(type='aiAOVDriver') or []:
+        if cmds.getAttr(f"{driver}.aiTranslator") == translator:
+            return driver
+    if not create:
+        return None
+    
+    driver = cmds.createNode('aiAOVDriver', name='defaultArnoldDriver')
+    cmds.setAttr(f"{driver}.aiTranslator", translator, type="string")
+    return driver
+
+
+def preset_hash(preset):
+    """Hash stable d'un preset (indépendant de l'ordre des clés)"""
+    import hashlib
+    
+    return hashlib.sha1(json.dumps(preset, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def snapshot_attributes(plugs):
+    """Lit en une passe les valeurs actuelles {plug: valeur} (None si l'attribut n'existe pas)"""
+    snapshot = {}
+    for plug in plugs:
+        try:
+            snapshot[plug] = cmds.getAttr(plug)
+        except Exception:
+            snapshot[plug] = None
+    return snapshot
+
+
+def apply_render_attributes(target, dry_run=False, verbose=True, failures=None):
+    """Compare la scène aux valeurs cibles et n'écrit que les différences
     
-    # Boutons pour chaque type
-    cmds.button(label="Meshes", command=lambda x: select_type('mesh'), height=25)
-    cmds.button(label="Curves", command=lambda x: select_type('nurbsCurve'), height=25)
-    cmds.button(label="Surfaces NURBS", command=lambda x: select_type('nurbsSurface'), height=25)
-    cmds.button(label="Joints", command=lambda x: select_type('joint'), height=25)
-    cmds.button(label="Locators", command=lambda x: select_type('locator'), height=25)
-    cmds.button(label="Cameras", command=lambda x: select_type('camera'), height=25)
-    cmds.button(label="Lights", command=lambda x: select_type('light'), height=25)
-    cmds.button(label="Arnold Lights", command=lambda x: select_type('aiLight'), height=25)
+    Retourne le diff {plug: (ancienne valeur, nouvelle valeur)}.
+    failures : liste complétée par les plugs qui n'ont pas pu être modifiés.
+    """
+    diff = diff_render_attributes(snapshot_attributes(target), target)
     
-    cmds.separator(height=10, style='none')
+    if not dry_run:
+        for plug, (old_value, value) in diff.items():
+            try:
+                if isinstance(value, str):
+                    cmds.setAttr(plug, value, type="string")
+                else:
+                    cmds.setAttr(plug, value)
+                if verbose:
+                    print(f"{plug}: {old_value} -> {value}")
+            except Exception as e:
+                print(f"Impossible de modifier {plug}: {str(e)}")
+                if failures is not None:
+                    failures.append(plug)
     
-    cmds.showWindow(window)
+    return diff
 
 
-def select_type(node_type):
-    """Sélectionne tous les objets d'un type donné"""
-    
-    if node_type == 'light':
-        # Sélectionne toutes les lights Maya standard
-        lights = cmds.ls(type=['ambientLight', 'directionalLight', 'pointLight', 'spotLight', 'areaLight', 'volumeLight'])
-        transforms = []
-        for light in lights:
-            parent = cmds.listRelatives(light, parent=True)
-            if parent:
-                transforms.append(parent[0])
-        if transforms:
-            cmds.select(transforms, replace=True)
-            print(f"{len(transforms)} light(s) sélectionnée(s)")
-        else:
-            cmds.select(clear=True)
-            print("Aucune light trouvée")
-    
-    elif node_type == 'aiLight':
-        # Sélectionne toutes les lights Arnold
-        ai_lights = cmds.ls(type=['aiAreaLight', 'aiSkyDomeLight', 'aiMeshLight', 'aiPhotometricLight', 'aiLightPortal'])
-        transforms = []
-        for light in ai_lights:
-            parent = cmds.listRelatives(light, parent=True)
-            if parent:
-                transforms.append(parent[0])
-        if transforms:
-            cmds.select(transforms, replace=True)
-            print(f"{len(transforms)} Arnold light(s) sélectionnée(s)")
-        else:
-            cmds.select(clear=True)
-            print("Aucune Arnold light trouvée")
-    
-    elif node_type == 'camera':
-        # Sélectionne les caméras (sauf les caméras par défaut)
-        cameras = cmds.ls(type='camera')
-        default_cameras = ['perspShape', 'topShape', 'frontShape', 'sideShape']
-        transforms = []
-        for cam in cameras:
-            if cam not in default_cameras:
-                parent = cmds.listRelatives(cam, parent=True)
-                if parent:
-                    transforms.append(parent[0])
-        if transforms:
-            cmds.select(transforms, replace=True)
-            print(f"{len(transforms)} caméra(s) sélectionnée(s)")
-        else:
-            cmds.select(clear=True)
-            print("Aucune caméra trouvée (hors caméras par défaut)")
+def apply_render_preset(preset, dry_run=False):
+    """Applique un preset de rendu en ne modifiant que ce qui diffère de la scène
+    
+    Retourne (diff des attributs, AOVs manquants, échecs : plugs et AOVs qui n'ont pas
+    pu être modifiés ou créés). Réappliquer le même preset ne
+    modifie rien. Avec dry_run=True, rien n'est modifié ni créé : un driver absent
+    apparaît dans le diff sous un nom provisoire.
+    """
+    driver = get_arnold_driver(preset['driver'], create=not dry_run) or f"<aiAOVDriver {preset['driver']}>"
+    failures = []
+    diff = apply_render_attributes(render_preset_attributes(preset, driver), dry_run, failures=failures)
+    
+    # Indexe une seule fois les AOVs existants : nom -> node
+    import mtoa.aovs as aovs
+    aov_interface = aovs.AOVInterface()
+    existing_aovs = dict(aov_interface.getAOVNodes(names=True))
+    missing_aovs = [name for name in preset['aovs'] if name not in existing_aovs]
+    
+    if dry_run:
+        return diff, missing_aovs, failures
+    
+    # Crée uniquement les AOVs manquants
+    for aov_name in missing_aovs:
+        try:
+            aov_interface.addAOV(aov_name)
+            print(f"AOV ajouté: {aov_name}")
+        except Exception as e:
+            print(f"Erreur pour {aov_name}: {str(e)}")
+            failures.append(aov_name)
     
-    else:
-        # Sélectionne par type standard
-        shapes = cmds.ls(type=node_type)
-        transforms = []
-        for shape in shapes:
-            parent = cmds.listRelatives(shape, parent=True)
-            if parent:
-                transforms.append(parent[0])
-        
-        # Déduplique
-        transforms = list(set(transforms))
-        
-        if transforms:
-            cmds.select(transforms, replace=True)
-            print(f"{len(transforms)} {node_type}(s) sélectionné(s)")
-        else:
-            cmds.select(clear=True)
-            print(f"Aucun {node_type} trouvé")
+    return diff, [name for name in missing_aovs if name not in failures], failures
 
 
-def setup_arnold_render():
-    """Configure les paramètres de rendu Arnold pour le compositing"""
+# Clé fileInfo (stockée dans la scène) du hash du dernier preset appliqué
+RENDER_PRESET_FILEINFO = "customPluginsRenderPreset"
+
+
+def render_preset_nodes_exist(preset):
+    """Vérification rapide d'un preset déjà appliqué : son driver et ses AOVs existent encore
+    
+    mtoa nomme les nodes d'AOV aiAOV_<nom> : un seul ls suffit pour tous les AOVs.
+    """
+    if not get_arnold_driver(preset['driver'], create=False):
+        return False
+    aov_nodes = [f"aiAOV_{name}" for name in preset['aovs']]
+    return len(cmds.ls(aov_nodes, type='aiAOV') or []) == len(set(aov_nodes))
+
+
+def setup_arnold_render(preset=None, force=False):
+    """Configure les paramètres de rendu Arnold pour le compositing
+    
+    preset : dict (éventuellement partiel) ou chemin d'un fichier de preset JSON/YAML,
+    complété par DEFAULT_RENDER_PRESET
+    force : réapplique le preset même si la scène y correspond déjà
+    Le hash du preset est enregistré dans la scène (fileInfo) seulement s'il a été
+    appliqué sans échec. Aux lancements suivants, un hash identique dont le driver et
+    les AOVs existent encore saute la configuration sans relire les attributs ; sinon
+    (ou avec force=True) seuls les attributs qui diffèrent sont modifiés.
+    """
+    
+    if preset is None:
+        preset = DEFAULT_RENDER_PRESET
+    elif isinstance(preset, str):
+        preset = load_render_preset(preset)
+    else:
+        preset = complete_render_preset(preset)
+    
+    digest = preset_hash(preset)
     
     # Charge le plugin Arnold si nécessaire
     if not cmds.pluginInfo("mtoa", query=True, loaded=True):
@@ -468,106 +2951,247 @@ def setup_arnold_render():
             print("Impossible de charger le plugin Arnold (mtoa)")
             return
     
-    # Définir Arnold comme moteur de rendu
-    cmds.setAttr("defaultRenderGlobals.currentRenderer", "arnold", type="string")
+    stored = cmds.fileInfo(RENDER_PRESET_FILEINFO, query=True) or []
+    if not force and stored == [digest] and render_preset_nodes_exist(preset):
+        print("Preset Arnold déjà appliqué à la scène (force=True pour le réappliquer)")
+        return
     
-    # Résolution 1920x1080
-    cmds.setAttr("defaultResolution.width", 1920)
-    cmds.setAttr("defaultResolution.height", 1080)
+    try:
+        # Une seule lecture des attributs : seules les différences sont écrites
+        diff, added_aovs, failures = apply_render_preset(preset)
+    except ImportError:
+        print("Impossible d'importer le module mtoa.aovs")
+        return
     
-    # Format EXR (40 = EXR dans Maya)
-    cmds.setAttr("defaultRenderGlobals.imageFormat", 40)
+    if failures:
+        cmds.warning(f"Preset Arnold appliqué en partie, {len(failures)} échec(s): {', '.join(failures)}")
+    elif stored != [digest]:
+        cmds.fileInfo(RENDER_PRESET_FILEINFO, digest)
     
-    # Crée ou récupère le driver Arnold pour EXR
-    drivers = cmds.ls(type='aiAOVDriver')
-    exr_driver = None
+    width, height = preset['resolution']
+    start_frame, end_frame = preset['frame_range']
     
-    for driver in drivers:
-        if cmds.getAttr(f"{driver}.aiTranslator") == "exr":
-            exr_driver = driver
-            break
+    print("=" * 50)
+    if not diff and not added_aovs and not failures:
+        print("Preset Arnold déjà appliqué, rien à modifier")
+    else:
+        print("Preset Arnold configuré avec succès!" if not failures else "Preset Arnold configuré en partie")
+        modified = len([plug for plug in diff if plug not in failures])
+        print(f"  - {modified} attribut(s) modifié(s), {len(added_aovs)} AOV(s) ajouté(s), {len(failures)} échec(s)")
+    print(f"Résolution: {width}x{height}")
+    print(f"Format: {preset['driver'].upper()} (Merge AOVs {'activé' if preset['merge_aovs'] else 'désactivé'})")
+    print(f"Animation: Frame {start_frame}-{end_frame} (name.{'#' * preset['frame_padding']}.ext)")
+    print(f"{len(preset['aovs'])} AOV(s) pour le compositing")
+    print("=" * 50)
+
+
+def find_isolation_nodes(transforms, keep):
+    """Calcule le plus petit ensemble de transforms à masquer pour n'afficher que keep
+    
+    transforms : chemins longs des transforms visibles de la scène (snapshot)
+    keep : chemins longs des nodes à garder visibles (avec leurs descendants)
+    Seuls les transforms hors du chemin vers keep dont le parent est sur ce chemin
+    (ou à la racine) sont masqués : leurs descendants le sont par héritage.
+    Retourne (nodes à masquer, nombre de nodes que l'ancienne méthode modifiait).
+    """
+    keep = set(keep)
+    
+    # Nodes sur le chemin de la sélection : la sélection et tous ses ancêtres
+    on_path = set()
+    for node in keep:
+        while node and node not in on_path:
+            on_path.add(node)
+            node = node.rpartition('|')[0]
+    
+    to_hide = []
+    legacy_count = 0
+    for node in transforms:
+        parent = node.rpartition('|')[0]
+        if not parent or parent in on_path:
+            if node not in on_path and parent not in keep:
+                to_hide.append(node)
+        
+        # L'ancienne méthode masquait un par un tout ce qui n'est pas sous la sélection
+        ancestor = node
+        while ancestor and ancestor not in keep:
+            ancestor = ancestor.rpartition('|')[0]
+        if not ancestor:
+            legacy_count += 1
+    
+    return to_hide, legacy_count
+
+
+def isolate_nodes(keep):
+    """Masque tout sauf keep (chemins longs) en une passe sur le DAG et un seul appel hide
+    
+    Retourne (nodes masqués, nombre de nodes que l'ancienne méthode modifiait).
+    """
+    transforms = cmds.ls(dag=True, visible=True, transforms=True, long=True) or []
+    to_hide, legacy_count = find_isolation_nodes(transforms, keep)
+    if to_hide:
+        cmds.hide(to_hide)
+    return to_hide, legacy_count
+
+
+def store_hidden_nodes(node, hidden_nodes):
+    """Enregistre les UUIDs des nodes masqués dans l'attribut hiddenUuids de node"""
+    uuids = []
+    if hidden_nodes:
+        uuids = cmds.ls(hidden_nodes, uuid=True) or []
+    cmds.addAttr(node, longName='hiddenUuids', dataType='stringArray')
+    cmds.setAttr(f"{node}.hiddenUuids", len(uuids), *uuids, type='stringArray')
+
+
+# Marge appliquée à la distance caméra du turntable (1.0 = cadrage serré)
+LOOKDEV_FRAMING_PADDING = 1.15
+
+# Cadrage calculé par sélection : {(uuids, options): (état des shapes, cadrage)}
+_framing_cache = {}
+
+
+def compute_turntable_framing(points, fov_h, fov_v, padding=LOOKDEV_FRAMING_PADDING, fit='cylinder'):
+    """Calcule le cadrage d'un turntable autour de l'axe Y à partir de points monde
     
-    if not exr_driver:
-        exr_driver = cmds.createNode('aiAOVDriver', name='defaultArnoldDriver')
-        cmds.setAttr(f"{exr_driver}.aiTranslator", "exr", type="string")
+    fit='cylinder' : cadrage serré valable sur les 360° (rayon dans le plan XZ + hauteur)
+    fit='sphere'   : sphère englobante, indépendante de l'angle de vue
+    Retourne {'center', 'radius', 'half_height', 'distance'} ; aucune frame ne coupe l'objet.
+    """
+    import math
     
-    # Merge AOVs activé
-    cmds.setAttr(f"{exr_driver}.mergeAOVs", 1)
+    try:
+        import numpy as np
+        
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        lower, upper = coords.min(axis=0), coords.max(axis=0)
+        center = (lower + upper) / 2
+        offsets = coords - center
+        if fit == 'sphere':
+            radius = float(np.sqrt((offsets ** 2).sum(axis=1)).max())
+        else:
+            radius = float(np.sqrt(offsets[:, 0] ** 2 + offsets[:, 2] ** 2).max())
+        center = tuple(float(v) for v in center)
+        half_height = float(upper[1] - lower[1]) / 2
+    except ImportError:
+        xs, ys, zs = zip(*points)
+        center = ((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2, (min(zs) + max(zs)) / 2)
+        cx, cy, cz = center
+        if fit == 'sphere':
+            radius = math.sqrt(max((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 for x, y, z in zip(xs, ys, zs)))
+        else:
+            radius = math.sqrt(max((x - cx) ** 2 + (z - cz) ** 2 for x, z in zip(xs, zs)))
+        half_height = (max(ys) - min(ys)) / 2
     
-    # Frame/Animation extension : name.###.ext
-    cmds.setAttr("defaultRenderGlobals.animation", 1)
-    cmds.setAttr("defaultRenderGlobals.putFrameBeforeExt", 1)
-    cmds.setAttr("defaultRenderGlobals.extensionPadding", 3)
+    if fit == 'sphere':
+        # La sphère tient dans le cône de vision le plus étroit
+        distance = radius / math.sin(min(fov_h, fov_v) / 2) * padding
+    else:
+        # Quel que soit l'angle, l'objet tient dans un cylindre de rayon radius :
+        # sa face avant est à (distance - radius) de la caméra
+        distance_for_width = radius / math.tan(fov_h / 2)
+        distance_for_height = half_height / math.tan(fov_v / 2)
+        distance = max(distance_for_width, distance_for_height) * padding + radius
     
-    # Range 0-120
-    cmds.setAttr("defaultRenderGlobals.startFrame", 0)
-    cmds.setAttr("defaultRenderGlobals.endFrame", 120)
+    return {'center': center, 'radius': radius, 'half_height': half_height, 'distance': distance}
+
+
+def gather_framing_points(dag_paths, max_vertices=0):
+    """Points monde servant au cadrage, lus en bloc via l'API Maya 2.0
     
-    # Active le rendu GPU sur Windows
-    import platform
-    if platform.system() == "Windows":
-        try:
-            cmds.setAttr("defaultArnoldRenderOptions.renderDevice", 1)  # 0=CPU, 1=GPU
-            print("Rendu GPU activé (Windows)")
-        except:
-            print("Impossible d'activer le rendu GPU")
-    else:
-        print(f"Système détecté: {platform.system()} - GPU non activé (Windows uniquement)")
+    Par défaut : les 8 coins de la bounding box locale de chaque shape, transformés
+    en espace monde. Avec max_vertices, les sommets des mesh sont lus (au plus
+    max_vertices par mesh, un sommet sur N au-delà).
+    """
+    import maya.api.OpenMaya as om2
     
-    # Import du module Arnold
     try:
-        import mtoa.aovs as aovs
+        import numpy as np
     except ImportError:
-        print("Impossible d'importer le module mtoa.aovs")
-        return
-    
-    # Active les AOVs principaux pour le compositing
-    aovs_to_create = [
-        "RGBA",
-        "diffuse",
-        "specular",
-        "transmission",
-        "sss",
-        "emission",
-        "volume",
-        "N",
-        "Z",
-        "crypto_asset",
-        "crypto_object",
-        "crypto_material"
-    ]
-    
-    # Crée les AOVs avec le module mtoa
-    for aov_name in aovs_to_create:
-        try:
-            # Vérifie si l'AOV existe déjà
-            existing_aovs = aovs.AOVInterface().getAOVNodes()
-            aov_exists = False
-            
-            for existing_aov in existing_aovs:
-                if cmds.getAttr(f"{existing_aov}.name") == aov_name:
-                    aov_exists = True
-                    print(f"AOV déjà existant (ignoré): {aov_name}")
-                    break
-            
-            # Ajoute l'AOV seulement s'il n'existe pas
-            if not aov_exists:
-                aovs.AOVInterface().addAOV(aov_name)
-                print(f"AOV ajouté: {aov_name}")
-        except Exception as e:
-            print(f"Erreur pour {aov_name}: {str(e)}")
+        np = None
+    
+    points = []
+    for dag_path in dag_paths:
+        if max_vertices and dag_path.hasFn(om2.MFn.kMesh):
+            raw_points = om2.MFnMesh(dag_path).getPoints(om2.MSpace.kWorld)
+            step = max(1, len(raw_points) // max_vertices)
+            if np is not None:
+                points.append(np.array(raw_points, dtype=np.float64)[::step, :3])
+            else:
+                points.extend((raw_points[i].x, raw_points[i].y, raw_points[i].z)
+                              for i in range(0, len(raw_points), step))
+            continue
+        
+        bbox = om2.MFnDagNode(dag_path).boundingBox
+        matrix = dag_path.inclusiveMatrix()
+        corners = []
+        for x in (bbox.min.x, bbox.max.x):
+            for y in (bbox.min.y, bbox.max.y):
+                for z in (bbox.min.z, bbox.max.z):
+                    point = om2.MPoint(x, y, z) * matrix
+                    corners.append((point.x, point.y, point.z))
+        if np is not None:
+            points.append(np.array(corners, dtype=np.float64))
+        else:
+            points.extend(corners)
     
-    print("=" * 50)
-    print("Preset Arnold configuré avec succès!")
-    print("Résolution: 1920x1080")
-    print("Format: EXR (Merge AOVs activé)")
-    print("Animation: Frame 0-120 (name.###.ext)")
-    print("AOVs activés pour le compositing")
-    print("=" * 50)
+    if np is not None:
+        return np.vstack(points) if points else np.empty((0, 3))
+    return points
 
 
-def setup_lookdev_scene():
-    """Configure une scène lookdev avec HDRI et caméra pour la sélection"""
+def get_turntable_framing(nodes, fov_h, fov_v, fit='cylinder', max_vertices=0):
+    """Cadrage du turntable pour nodes, mis en cache par sélection
+    
+    Le cache est invalidé dès qu'un shape change de matrice monde ou de bounding
+    box locale : relancer le LookDev sur le même asset ne recalcule rien.
+    """
+    import maya.api.OpenMaya as om2
+    
+    shapes = cmds.ls(nodes, dag=True, long=True, type='surfaceShape', noIntermediate=True) or []
+    if not shapes:
+        # Pas de géométrie (locators, etc.) : bounding box globale
+        bbox = cmds.exactWorldBoundingBox(nodes)
+        points = [(x, y, z) for x in (bbox[0], bbox[3]) for y in (bbox[1], bbox[4]) for z in (bbox[2], bbox[5])]
+        return compute_turntable_framing(points, fov_h, fov_v, fit=fit)
+    
+    selection = om2.MSelectionList()
+    for shape in shapes:
+        selection.add(shape)
+    dag_paths = [selection.getDagPath(i) for i in range(selection.length())]
+    
+    state = []
+    for dag_path in dag_paths:
+        bbox = om2.MFnDagNode(dag_path).boundingBox
+        state.append((
+            tuple(dag_path.inclusiveMatrix()),
+            (bbox.min.x, bbox.min.y, bbox.min.z, bbox.max.x, bbox.max.y, bbox.max.z),
+        ))
+    state = tuple(state)
+    
+    key = (tuple(cmds.ls(shapes, uuid=True) or []), fit, max_vertices, round(fov_h, 6), round(fov_v, 6))
+    cached = _framing_cache.get(key)
+    if cached and cached[0] == state:
+        print(f"Cadrage repris du cache ({len(shapes)} shape(s))")
+        return cached[1]
+    
+    start = time.perf_counter()
+    framing = compute_turntable_framing(gather_framing_points(dag_paths, max_vertices), fov_h, fov_v, fit=fit)
+    _framing_cache[key] = (state, framing)
+    print(f"Cadrage calculé sur {len(shapes)} shape(s) en {time.perf_counter() - start:.3f}s")
+    return framing
+
+
+def setup_lookdev_scene(render=True, profile='final', refine=False, workers=None, render_command=None,
+                        fit='cylinder', max_vertices=0):
+    """Configure une scène lookdev avec HDRI et caméra pour la sélection
+    
+    render : lance le rendu du turntable en tâche de fond (voir start_lookdev_render)
+    profile : profil de rendu de LOOKDEV_PROFILES ('final' ou 'preview')
+    refine : après la passe du profil, rend les frames restantes avec son refine_profile,
+    puis les frames de l'aperçu en qualité finale, dans la même séquence
+    fit / max_vertices : cadrage de la caméra (voir get_turntable_framing)
+    workers / render_command : nombre de process et ligne de commande du renderer
+    (RENDER_WORKERS et RENDER_COMMAND par défaut)
+    """
     
     # Vérifie la sélection
     selection = cmds.ls(sl=True)
@@ -575,44 +3199,33 @@ def setup_lookdev_scene():
         cmds.error("Aucune sélection ! Veuillez sélectionner au moins un objet.")
         return
     
-    # Appelle setup_arnold_render
-    setup_arnold_render()
-    
-    # Calcule le bounding box de la sélection
-    bbox = cmds.exactWorldBoundingBox(selection)
-    
-    # Extraction des dimensions
-    min_x, min_y, min_z = bbox[0], bbox[1], bbox[2]
-    max_x, max_y, max_z = bbox[3], bbox[4], bbox[5]
+    camera_transform = build_lookdev_scene(selection, fit=fit, max_vertices=max_vertices)
     
-    # Calcul du centre et de la taille
-    center_x = (min_x + max_x) / 2
-    center_y = (min_y + max_y) / 2
-    center_z = (min_z + max_z) / 2
-    
-    size_x = max_x - min_x
-    size_y = max_y - min_y
-    size_z = max_z - min_z
+    # Lance le rendu en tâche de fond ; le cleanup suit automatiquement
+    if render:
+        tool_phase('render')
+        try:
+            passes = plan_lookdev_passes(LOOKDEV_FRAMES, profile, refine)
+            start_lookdev_render(camera_transform, passes, workers=workers, command=render_command)
+        except Exception as e:
+            print(f"Impossible de lancer le rendu: {str(e)}")
+            print("Cliquez sur 'Clean LookDev' pour nettoyer la scène")
+
+
+def build_lookdev_scene(nodes, fit='cylinder', max_vertices=0):
+    """Construit le setup LookDev autour de nodes : Arnold, isolation, HDRI et caméra turntable
     
-    # Récupère tous les descendants de la sélection (pour ne pas les masquer)
-    # Utilise les chemins longs pour éviter les problèmes de comparaison
-    selection_long = cmds.ls(selection, long=True)
-    selection_and_children = set(selection_long)
+    Retourne le transform de la caméra de rendu. clean_lookdev() défait le setup.
+    """
     
-    for obj in selection_long:
-        descendants = cmds.listRelatives(obj, allDescendents=True, fullPath=True) or []
-        selection_and_children.update(descendants)
+    # Appelle setup_arnold_render
+    tool_phase('arnold')
+    setup_arnold_render()
     
-    # Masque tout sauf la sélection et ses enfants
-    all_objects = cmds.ls(dag=True, visible=True, transforms=True, long=True)
-    hidden_objects = []
-    for obj in all_objects:
-        if obj not in selection_and_children and cmds.objExists(obj):
-            try:
-                cmds.setAttr(f"{obj}.visibility", 0)
-                hidden_objects.append(obj)
-            except:
-                pass
+    tool_phase('isolate')
+    # Masque tout sauf la sélection et ses enfants (uniquement les ancêtres de plus haut niveau)
+    selection_long = cmds.ls(nodes, long=True)
+    hidden_objects, legacy_count = isolate_nodes(selection_long)
     
     # Vérifie si l'HDRI existait déjà AVANT de créer le groupe
     hdri_existed = cmds.objExists('lookdev_hdri')
@@ -621,8 +3234,7 @@ def setup_lookdev_scene():
     lookdev_grp = cmds.group(empty=True, name='LookDev_Setup_GRP')
     
     # Stocke les infos pour le cleanup (attributs custom sur le groupe)
-    cmds.addAttr(lookdev_grp, longName='hiddenObjects', dataType='string')
-    cmds.setAttr(f"{lookdev_grp}.hiddenObjects", ','.join(hidden_objects), type='string')
+    store_hidden_nodes(lookdev_grp, hidden_objects)
     cmds.addAttr(lookdev_grp, longName='hdriExisted', attributeType='bool')
     cmds.setAttr(f"{lookdev_grp}.hdriExisted", hdri_existed)
     
@@ -635,13 +3247,10 @@ def setup_lookdev_scene():
         # Crée le skydome HDRI (asLight=True retourne le transform)
         skydome = cmds.shadingNode('aiSkyDomeLight', asLight=True)
         skydome = cmds.rename(skydome, 'lookdev_hdri')
-        
-        cmds.setAttr(f"{skydome}.translateX", center_x)
-        cmds.setAttr(f"{skydome}.translateY", center_y)
-        cmds.setAttr(f"{skydome}.translateZ", center_z)
         print(f"HDRI créé: {skydome}")
     
     # Crée la caméra
+    tool_phase('framing')
     camera = cmds.camera(name='LookDev_Camera')
     camera_transform = camera[0]
     camera_shape = camera[1]
@@ -656,20 +3265,22 @@ def setup_lookdev_scene():
     fov_h = 2 * math.atan((h_aperture * 25.4) / (2 * focal_length))
     fov_v = 2 * math.atan((v_aperture * 25.4) / (2 * focal_length))
     
-    # Calcul de la distance nécessaire pour voir l'objet en entier
-    distance_for_width = (size_x / 2) / math.tan(fov_h / 2)
-    distance_for_height = (size_y / 2) / math.tan(fov_v / 2)
+    # Cadrage valable sur tout le tour, à partir des bounds de chaque shape
+    framing = get_turntable_framing(selection_long, fov_h, fov_v, fit=fit, max_vertices=max_vertices)
+    center_x, center_y, center_z = framing['center']
     
-    # On prend le max + la moitié de la profondeur + 100% de marge
-    padding = 2
-    camera_distance = max(distance_for_width, distance_for_height) * padding + (size_z / 2)
+    if skydome:
+        cmds.setAttr(f"{skydome}.translateX", center_x)
+        cmds.setAttr(f"{skydome}.translateY", center_y)
+        cmds.setAttr(f"{skydome}.translateZ", center_z)
     
     # Position de la caméra (légère plongée basée sur la hauteur de l'objet)
     cam_x = center_x
-    cam_y = center_y + (size_y * 0.3)  # 30% de la hauteur pour l'effet de plongée
-    cam_z = center_z + camera_distance
+    cam_y = center_y + (framing['half_height'] * 0.6)  # 30% de la hauteur pour l'effet de plongée
+    cam_z = center_z + framing['distance']
     
     # Crée l'aim (locator) au centre
+    tool_phase('rig')
     aim = cmds.spaceLocator(name='Camera_Aim')[0]
     cmds.setAttr(f"{aim}.translateX", center_x)
     cmds.setAttr(f"{aim}.translateY", center_y)
@@ -703,12 +3314,13 @@ def setup_lookdev_scene():
     cmds.parent(camera_rotation_grp, lookdev_grp)
     
     # Résumé
+    tool_phase('report')
     print("=" * 50)
     print("Scène LookDev configurée!")
-    print(f"  - {len(hidden_objects)} objet(s) masqué(s)")
+    print(f"  - {len(hidden_objects)} objet(s) masqué(s) (au lieu de {legacy_count} objet par objet)")
     print(f"  - Centre: ({center_x:.2f}, {center_y:.2f}, {center_z:.2f})")
-    print(f"  - Taille: ({size_x:.2f}, {size_y:.2f}, {size_z:.2f})")
-    print(f"  - Distance caméra: {camera_distance:.2f}")
+    print(f"  - Rayon ({fit}): {framing['radius']:.2f}, hauteur: {framing['half_height'] * 2:.2f}")
+    print(f"  - Distance caméra: {framing['distance']:.2f}")
     print(f"  - Caméra: turntable 360° sur 120 frames")
     print(f"  - Groupe: {lookdev_grp}")
     print("=" * 50)
@@ -716,6 +3328,7 @@ def setup_lookdev_scene():
     # Configure la caméra LookDev pour le rendu
     
     # Désactive TOUTES les caméras pour le rendu d'abord
+    tool_phase('render_settings')
     all_cameras = cmds.ls(type='camera')
     for cam in all_cameras:
         try:
@@ -738,16 +3351,7 @@ def setup_lookdev_scene():
     cmds.setAttr("defaultRenderLayer.renderable", 1)
     
     print(f"Caméra de rendu configurée: {camera_transform}")
-    
-    # Lance le batch render
-    import maya.mel as mel
-    try:
-        print("Lancement du BatchRender...")
-        mel.eval('BatchRender')
-        print("BatchRender lancé")
-        print("Une fois terminé, cliquez sur 'Clean LookDev' pour nettoyer la scène")
-    except:
-        print("Impossible de lancer le Batch Render")
+    return camera_transform
 
 
 def clean_lookdev():
@@ -770,9 +3374,15 @@ def clean_lookdev():
         pass
     
     try:
-        hidden_str = cmds.getAttr(f"{lookdev_grp}.hiddenObjects")
-        if hidden_str:
-            hidden_objects = hidden_str.split(',')
+        if cmds.attributeQuery('hiddenUuids', node=lookdev_grp, exists=True):
+            uuids = cmds.getAttr(f"{lookdev_grp}.hiddenUuids") or []
+            if uuids:
+                hidden_objects = cmds.ls(uuids, long=True) or []
+        else:
+            # Setup créé par une ancienne version : liste de noms séparés par des virgules
+            hidden_str = cmds.getAttr(f"{lookdev_grp}.hiddenObjects")
+            if hidden_str:
+                hidden_objects = [obj for obj in hidden_str.split(',') if cmds.objExists(obj)]
     except:
         pass
     
@@ -791,15 +3401,14 @@ def clean_lookdev():
     except Exception as e:
         print(f"Erreur lors de la suppression du groupe: {str(e)}")
     
-    # Réaffiche les objets masqués
+    # Réaffiche les objets masqués en un seul appel
     shown_count = 0
-    for obj in hidden_objects:
-        if cmds.objExists(obj):
-            try:
-                cmds.setAttr(f"{obj}.visibility", 1)
-                shown_count += 1
-            except:
-                pass
+    if hidden_objects:
+        try:
+            cmds.showHidden(hidden_objects)
+            shown_count = len(hidden_objects)
+        except Exception as e:
+            print(f"Impossible de réafficher les objets masqués: {str(e)}")
     
     print("=" * 50)
     print("Cleanup LookDev terminé!")
@@ -809,174 +3418,758 @@ def clean_lookdev():
     print("=" * 50)
 
 
-def create_custom_shelf():
-    """Crée un shelf personnalisé avec un bouton pour créer un cube"""
-    
-    shelf_name = "MesOutils"
-    
-    # Vérifie si le shelf existe déjà
-    if cmds.shelfLayout(shelf_name, exists=True):
-        # Supprime l'ancien shelf pour le recréer
-        cmds.deleteUI(shelf_name, layout=True)
-    
-    # Crée le nouveau shelf
-    main_shelf = cmds.shelfLayout(shelf_name, parent="ShelfLayout")
-    
-    # Ajoute un bouton pour supprimer l'historique
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Del History",
-        command="from customPlugins import delete_history\ndelete_history()",
-        image="DeleteHistory.png",
-        annotation="Supprimer l'historique des mesh sélectionnés",
-        imageOverlayLabel="DelH",
-        style="iconOnly"
-    )
-    
-    # Ajoute un bouton pour freeze transform
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Freeze",
-        command="from customPlugins import freeze_transform\nfreeze_transform()",
-        image="FreezeTransform.png",
-        annotation="Freeze les transformations des mesh sélectionnés",
-        imageOverlayLabel="Frz",
-        style="iconOnly"
-    )
-    
-    # Ajoute un bouton pour assigner des matériaux uniques
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Materials",
-        command="from customPlugins import assign_unique_materials\nassign_unique_materials()",
-        image="render_aiStandardSurface.png",
-        annotation="Assigner un matériau aiStandardSurface unique à chaque mesh",
-        imageOverlayLabel="Mat",
-        style="iconOnly"
-    )
-    
-    # Ajoute un bouton pour enlever le préfixe "pasted__"
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Remove Pasted",
-        command="from customPlugins import remove_pasted_prefix\nremove_pasted_prefix()",
-        image="quickRename.png",
-        annotation="Enlever le préfixe 'pasted__' de tous les objets",
-        imageOverlayLabel="Paste",
-        style="iconOnly"
-    )
-    
-    # Ajoute un bouton pour supprimer les groupes vides
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Delete Empty",
-        command="from customPlugins import delete_empty_groups\ndelete_empty_groups()",
-        image="deleteActive.png",
-        annotation="Supprimer tous les groupes vides",
-        imageOverlayLabel="DelE",
-        style="iconOnly"
+# Profils de rendu LookDev. Un profil à frame_stride > 1 ne rend qu'une frame sur N ;
+# la passe de refine (refine_profile) rend ensuite les frames restantes, puis une
+# dernière passe rend les frames de l'aperçu en qualité finale : chaque frame n'est
+# rendue qu'une fois par qualité. Les images de l'aperçu sont écrites à part (voir
+# lookdev_pass_output_dir) pour ne pas mélanger deux résolutions dans la séquence.
+LOOKDEV_PROFILES = {
+    'final': {
+        'resolution_scale': 1.0,
+        'aa_samples': None,  # None : valeur de la scène
+        'frame_stride': 1,
+        'aovs': True,
+        'refine_profile': None,
+    },
+    'preview': {
+        'resolution_scale': 0.5,
+        'aa_samples': 1,
+        'frame_stride': 10,
+        'aovs': False,
+        'refine_profile': 'final',
+    },
+}
+
+# Frames du turntable (un tour complet)
+LOOKDEV_FRAMES = range(0, 121)
+
+
+def plan_lookdev_passes(frames, profile_name, refine=False):
+    """Retourne les passes [(profil, frames)] : le profil sur une frame sur frame_stride,
+    puis, avec refine, le profil de refine sur les frames restantes et enfin sur les
+    frames déjà rendues en aperçu"""
+    frames = sorted(set(frames))
+    profile = LOOKDEV_PROFILES[profile_name]
+    stride = max(1, profile['frame_stride'])
+    
+    first_frames = frames[::stride]
+    passes = [(profile_name, first_frames)]
+    
+    if refine and profile['refine_profile'] and stride > 1:
+        first = set(first_frames)
+        passes.append((profile['refine_profile'], [frame for frame in frames if frame not in first]))
+        passes.append((profile['refine_profile'], first_frames))
+    return passes
+
+
+def lookdev_pass_output_dir(output_dir, passes, index):
+    """Dossier des images de la passe index : les passes au profil de la dernière passe
+    écrivent dans output_dir, les passes d'aperçu dans un sous-dossier à leur nom"""
+    if passes[index][0] != passes[-1][0]:
+        return os.path.join(output_dir, passes[index][0])
+    return output_dir
+
+
+def lookdev_profile_attributes(profile, base_resolution):
+    """Traduit un profil LookDev en valeurs d'attributs {plug: valeur}"""
+    width, height = base_resolution
+    scale = profile['resolution_scale']
+    attributes = {
+        "defaultResolution.width": max(1, int(round(width * scale))),
+        "defaultResolution.height": max(1, int(round(height * scale))),
+        "defaultArnoldRenderOptions.aovMode": 1 if profile['aovs'] else 0,  # 0=désactivés, 1=activés
+    }
+    if profile['aa_samples'] is not None:
+        attributes["defaultArnoldRenderOptions.AASamples"] = profile['aa_samples']
+    return attributes
+
+
+def export_lookdev_passes(passes):
+    """Exporte une scène par passe avec les réglages de son profil
+    
+    Les réglages de la scène ouverte sont restaurés après chaque export.
+    Retourne [(profil, chemin de la scène exportée, frames)].
+    """
+    base_resolution = (
+        cmds.getAttr("defaultResolution.width"),
+        cmds.getAttr("defaultResolution.height"),
     )
+    exported = []
+    for profile_name, frames in passes:
+        target = lookdev_profile_attributes(LOOKDEV_PROFILES[profile_name], base_resolution)
+        diff = apply_render_attributes(target, verbose=False)
+        try:
+            exported.append((profile_name, export_render_scene(), frames))
+        finally:
+            previous = {plug: old for plug, (old, new) in diff.items() if old is not None}
+            apply_render_attributes(previous, verbose=False)
+    return exported
+
+
+# Ligne de commande du renderer. Chaque argument est formaté avec render_bin, scene,
+# start, end, step, camera et output_dir ; peut être remplacée par n'importe quel
+# exécutable (ex: un script de rendu factice pour tester le pipeline sans Maya).
+RENDER_COMMAND = [
+    '{render_bin}', '-r', 'arnold',
+    '-s', '{start}', '-e', '{end}', '-b', '{step}',
+    '-cam', '{camera}', '-rd', '{output_dir}',
+    '{scene}',
+]
+
+# Expression trouvant le numéro d'une frame rendue dans la sortie du renderer
+RENDER_FRAME_PATTERN = r"[Ff]rame\D{0,20}?(\d+)"
+
+# Nombre de process renderer lancés en parallèle par défaut
+RENDER_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Jobs de rendu en cours (gardés en référence pour pouvoir les annuler)
+_active_render_jobs = []
+
+# Dossiers temporaires des scènes exportées pour le rendu (voir export_render_scene)
+_render_scene_dirs = set()
+
+
+def frame_segments(frames):
+    """Découpe une liste de frames en segments (start, end, step) à pas constant"""
+    frames = sorted(set(frames))
+    segments = []
+    index = 0
+    while index < len(frames):
+        start = frames[index]
+        if index + 1 == len(frames):
+            segments.append((start, start, 1))
+            break
+        step = frames[index + 1] - start
+        last = index + 1
+        while last + 1 < len(frames) and frames[last + 1] - frames[last] == step:
+            last += 1
+        segments.append((start, frames[last], step))
+        index = last + 1
+    return segments
+
+
+def split_frames(frames, chunk_count):
+    """Répartit les frames (triées) en chunk_count paquets contigus de tailles proches"""
+    frames = sorted(set(frames))
+    chunk_count = max(1, min(chunk_count, len(frames)))
+    size, extra = divmod(len(frames), chunk_count)
+    chunks = []
+    start = 0
+    for index in range(chunk_count):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(frames[start:end])
+        start = end
+    return chunks
+
+
+def default_render_bin():
+    """Chemin de l'exécutable Render de l'installation Maya courante"""
+    executable = 'Render.exe' if sys.platform == 'win32' else 'Render'
+    return os.path.join(os.environ.get('MAYA_LOCATION', ''), 'bin', executable)
+
+
+def run_deferred(func, *args):
+    """Exécute func dans le thread principal de Maya (directement hors de Maya)"""
+    try:
+        import maya.utils
+        maya.utils.executeDeferred(func, *args)
+    except ImportError:
+        func(*args)
+
+
+class RenderJob(object):
+    """Rendu d'une liste de frames réparti sur plusieurs process renderer locaux
+    
+    Les frames sont découpées en paquets contigus, un par worker ; chaque worker lance
+    le renderer sur ses segments l'un après l'autre et lit sa sortie pour signaler les
+    frames terminées. Les callbacks on_frame(job, frame) et on_complete(job) sont
+    appelés dans le thread principal de Maya.
+    """
+    
+    def __init__(self, scene_path, frames, output_dir, camera, workers=None, command=None,
+                 frame_pattern=None, on_frame=None, on_complete=None):
+        import threading
+        
+        self.scene_path = scene_path
+        self.frames = sorted(set(frames))
+        self.output_dir = output_dir
+        self.camera = camera
+        self.workers = workers or RENDER_WORKERS
+        self.command = command or RENDER_COMMAND
+        self.frame_pattern = re.compile(frame_pattern or RENDER_FRAME_PATTERN)
+        self.on_frame = on_frame
+        self.on_complete = on_complete
+        
+        self.completed_frames = set()
+        self.failed_segments = []
+        self.cancelled = False
+        self.start_time = None
+        self.duration = None
+        self._processes = []
+        self._threads = []
+        self._lock = threading.Lock()
+    
+    @property
+    def succeeded(self):
+        return not self.cancelled and not self.failed_segments
+    
+    def segment_command(self, start, end, step):
+        """Ligne de commande du renderer pour un segment de frames"""
+        values = {
+            'render_bin': default_render_bin(),
+            'scene': self.scene_path,
+            'start': start,
+            'end': end,
+            'step': step,
+            'camera': self.camera,
+            'output_dir': self.output_dir,
+        }
+        return [str(arg).format(**values) for arg in self.command]
+    
+    def start(self):
+        """Lance les workers et retourne immédiatement"""
+        import threading
+        
+        self.start_time = time.perf_counter()
+        for chunk in split_frames(self.frames, self.workers):
+            thread = threading.Thread(target=self._run_chunk, args=(chunk,))
+            thread.daemon = True
+            self._threads.append(thread)
+            thread.start()
+        
+        watcher = threading.Thread(target=self._watch)
+        watcher.daemon = True
+        watcher.start()
+        return self
+    
+    def cancel(self):
+        """Arrête tous les process renderer en cours"""
+        self.cancelled = True
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+    
+    def wait(self, timeout=None):
+        """Attend la fin de tous les workers ; retourne True s'ils sont tous terminés"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0, deadline - time.perf_counter())
+            thread.join(remaining)
+        return not any(thread.is_alive() for thread in self._threads)
+    
+    def _run_chunk(self, chunk):
+        import subprocess
+        
+        for start, end, step in frame_segments(chunk):
+            if self.cancelled:
+                return
+            expected = set(range(start, end + 1, step))
+            try:
+                process = subprocess.Popen(
+                    self.segment_command(start, end, step),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                )
+            except OSError as e:
+                self.failed_segments.append((start, end, step, str(e)))
+                continue
+            
+            with self._lock:
+                self._processes.append(process)
+            
+            for line in process.stdout:
+                match = self.frame_pattern.search(line)
+                if match and int(match.group(1)) in expected:
+                    self._frame_done(int(match.group(1)))
+            
+            return_code = process.wait()
+            if return_code == 0:
+                # Frames que le renderer n'a pas signalées individuellement
+                for frame in sorted(expected):
+                    self._frame_done(frame)
+            elif not self.cancelled:
+                self.failed_segments.append((start, end, step, f"code {return_code}"))
+    
+    def _frame_done(self, frame):
+        with self._lock:
+            if frame in self.completed_frames:
+                return
+            self.completed_frames.add(frame)
+        if self.on_frame:
+            run_deferred(self.on_frame, self, frame)
+    
+    def _watch(self):
+        self.wait()
+        self.duration = time.perf_counter() - self.start_time
+        if self in _active_render_jobs:
+            _active_render_jobs.remove(self)
+        if self.on_complete:
+            run_deferred(self.on_complete, self)
+
+
+def export_render_scene(directory=None):
+    """Exporte une copie de la scène courante pour le rendu, sans changer la scène ouverte
+    
+    Sans directory, la scène est écrite dans un dossier temporaire supprimé par
+    remove_render_scene une fois son rendu terminé ou annulé.
+    """
+    import tempfile
+    
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix='lookdev_')
+        _render_scene_dirs.add(directory)
+    path = os.path.join(directory, 'lookdev_render.ma')
+    cmds.file(path, exportAll=True, type='mayaAscii', preserveReferences=True, force=True)
+    return path
+
+
+def remove_render_scenes(exported):
+    """Supprime les dossiers temporaires des scènes exportées [(profil, scène, frames)]
+    
+    Seuls les dossiers créés par export_render_scene sont supprimés.
+    """
+    import shutil
+    
+    for _, scene_path, _ in exported:
+        directory = os.path.dirname(scene_path)
+        if directory in _render_scene_dirs:
+            _render_scene_dirs.discard(directory)
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def show_render_progress(job, pass_name):
+    """Ouvre une fenêtre de progression non bloquante avec un bouton d'annulation"""
+    window_name = "lookdevRenderWindow"
     
-    # Ajoute un bouton pour configurer Arnold
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Arnold Setup",
-        command="from customPlugins import setup_arnold_render\nsetup_arnold_render()",
-        image="renderGlobals.png",
-        annotation="Configurer Arnold pour le compositing (1920x1080, EXR, AOVs)",
-        imageOverlayLabel="Arnd",
-        style="iconOnly"
-    )
+    if cmds.window(window_name, exists=True):
+        cmds.deleteUI(window_name)
     
-    # Ajoute un bouton pour configurer la scène LookDev
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="LookDev Setup",
-        command="from customPlugins import setup_lookdev_scene\nsetup_lookdev_scene()",
-        image="cameraAim.png",
-        annotation="Configurer scène LookDev (Arnold + HDRI + Caméra)",
-        imageOverlayLabel="Look",
-        style="iconOnly"
-    )
+    window = cmds.window(window_name, title="Rendu LookDev", widthHeight=(320, 110), sizeable=True)
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=6, columnOffset=('both', 10))
+    cmds.separator(height=5, style='none')
+    cmds.text("lookdevRenderStatus", label=f"{pass_name}: 0/{len(job.frames)} frame(s) rendue(s)", align='left')
+    cmds.progressBar("lookdevRenderProgress", maxValue=len(job.frames))
+    cmds.button(label="Annuler", command=lambda x: job.cancel(), height=25)
+    cmds.showWindow(window)
+
+
+def update_render_progress(job, frame, pass_name):
+    """Callback de frame terminée : met à jour la fenêtre de progression"""
+    done = len(job.completed_frames)
+    if cmds.progressBar("lookdevRenderProgress", exists=True):
+        cmds.progressBar("lookdevRenderProgress", edit=True, progress=done)
+        cmds.text("lookdevRenderStatus", edit=True, label=f"{pass_name}: {done}/{len(job.frames)} frame(s) rendue(s)")
+    print(f"[{pass_name}] Frame {frame} rendue ({done}/{len(job.frames)})")
+
+
+def start_lookdev_render(camera, passes, output_dir=None, workers=None, command=None, cleanup=True):
+    """Exporte la scène LookDev et lance son rendu en tâche de fond
+    
+    passes : [(profil, frames)] rendues l'une après l'autre (voir plan_lookdev_passes),
+    les passes d'aperçu dans un sous-dossier de output_dir. Chaque passe est répartie sur workers process renderer ;
+    la progression s'affiche au fil des frames et clean_lookdev() est lancé
+    automatiquement à la fin si cleanup est vrai.
+    Retourne le RenderJob de la première passe (job.cancel() pour l'arrêter).
+    """
+    exported = export_lookdev_passes(passes)
+    
+    if output_dir is None:
+        output_dir = os.path.join(cmds.workspace(query=True, rootDirectory=True), 'images', 'lookdev')
+    
+    finished = []
+    
+    def start_pass(index):
+        pass_name, scene_path, frames = exported[index]
+        job = RenderJob(scene_path, frames, lookdev_pass_output_dir(output_dir, exported, index),
+                        camera, workers=workers, command=command,
+                        on_frame=lambda job, frame: update_render_progress(job, frame, pass_name),
+                        on_complete=lambda job: on_complete(job, index))
+        _active_render_jobs.append(job)
+        
+        if not cmds.about(batch=True):
+            show_render_progress(job, pass_name)
+        
+        print(f"[{pass_name}] Rendu de {len(job.frames)} frame(s) sur {min(job.workers, len(job.frames))} process...")
+        return job.start()
     
-    # Ajoute un bouton pour nettoyer après le LookDev
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Clean LookDev",
-        command="from customPlugins import clean_lookdev\nclean_lookdev()",
-        image="brush.png",
-        annotation="Nettoyer la scène après le LookDev (supprime le setup, réaffiche les objets)",
-        imageOverlayLabel="Clean",
-        style="iconOnly"
-    )
+    def on_complete(job, index):
+        finished.append((exported[index][0], job))
+        remove_render_scenes(exported[index:index + 1])
+        
+        # Passe suivante (refine) si la précédente s'est bien terminée
+        if job.succeeded and index + 1 < len(exported):
+            start_pass(index + 1)
+            return
+        # Annulé ou en échec : les passes suivantes ne seront pas rendues
+        remove_render_scenes(exported[index + 1:])
+        
+        if cmds.window("lookdevRenderWindow", exists=True):
+            cmds.deleteUI("lookdevRenderWindow")
+        
+        print("=" * 50)
+        if job.cancelled:
+            print("Rendu LookDev annulé")
+        elif job.failed_segments:
+            print(f"Rendu LookDev terminé avec {len(job.failed_segments)} erreur(s):")
+            for start, end, step, reason in job.failed_segments:
+                print(f"  - frames {start}-{end} (pas {step}): {reason}")
+        else:
+            print("Rendu LookDev terminé!")
+        for pass_name, pass_job in finished:
+            print(f"  - {pass_name}: {len(pass_job.completed_frames)}/{len(pass_job.frames)} frame(s) "
+                  f"en {pass_job.duration:.1f}s")
+        print(f"  - Images: {output_dir}")
+        print("=" * 50)
+        
+        if cleanup:
+            clean_lookdev()
     
-    # Ajoute un bouton pour supprimer les nodes inconnus
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Delete Unknown",
-        command="from customPlugins import delete_unknown_nodes\ndelete_unknown_nodes()",
-        image="nodeGrapherRemoveNodes.png",
-        annotation="Supprimer tous les nodes inconnus",
-        imageOverlayLabel="Unk",
-        style="iconOnly"
-    )
+    return start_pass(0)
+
+
+# Nom du manifest écrit par batch_lookdev dans son dossier de sortie
+LOOKDEV_MANIFEST = "lookdev_manifest.json"
+
+
+class LookDevBatch(object):
+    """File de rendus LookDev de plusieurs assets
     
-    # Ajoute un bouton pour supprimer les nodes inutilisés
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Delete Unused",
-        command="from customPlugins import delete_unused_nodes\ndelete_unused_nodes()",
-        image="deleteClip.png",
-        annotation="Supprimer les materials, textures et nodes inutilisés",
-        imageOverlayLabel="Unus",
-        style="iconOnly"
-    )
+    Chaque asset est ajouté avec ses scènes exportées (une par passe) ; au plus max_jobs
+    assets sont rendus en même temps, chacun sur workers process renderer. Un asset en
+    échec n'arrête pas la file et le manifest JSON est réécrit à chaque asset terminé.
+    """
     
-    # Ajoute un bouton pour le batch rename
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Batch Rename",
-        command="from customPlugins import batch_rename\nbatch_rename()",
-        image="quickRename.png",
-        annotation="Renommer plusieurs objets (préfixe/suffixe/rechercher-remplacer)",
-        imageOverlayLabel="Ren",
-        style="iconOnly"
-    )
+    def __init__(self, manifest_path, max_jobs=None, workers=1, command=None, settings=None, on_complete=None):
+        import threading
+        
+        self.manifest_path = manifest_path
+        self.max_jobs = max_jobs or RENDER_WORKERS
+        self.workers = workers
+        self.command = command
+        self.settings = settings or {}
+        self.on_complete = on_complete
+        
+        self.records = []
+        self.cancelled = False
+        self.start_time = time.time()
+        self.duration = None
+        self._pending = []
+        self._jobs = []
+        self._running = 0
+        self._closed = False
+        self._finished = False
+        self._lock = threading.RLock()
+        self._done = threading.Event()
+    
+    def add(self, record, camera=None, exported=None):
+        """Ajoute un asset ; sans scène exportée, il est seulement consigné dans le manifest"""
+        with self._lock:
+            self.records.append(record)
+            if exported:
+                record['status'] = 'queued'
+                self._pending.append((record, camera, exported))
+        self._fill()
+    
+    def close(self):
+        """Signale que tous les assets ont été ajoutés"""
+        with self._lock:
+            self._closed = True
+        self._fill()
+    
+    def cancel(self):
+        """Arrête les rendus en cours et abandonne les assets en attente"""
+        with self._lock:
+            self.cancelled = True
+            for record, camera, exported in self._pending:
+                record['status'] = 'cancelled'
+                remove_render_scenes(exported)
+            self._pending = []
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+        self._fill()
+    
+    def wait(self, timeout=None):
+        """Attend la fin de la file ; retourne True si elle est terminée"""
+        return self._done.wait(timeout)
+    
+    def _fill(self):
+        to_start = []
+        with self._lock:
+            while self._pending and self._running < self.max_jobs:
+                self._running += 1
+                to_start.append(self._pending.pop(0))
+            finished = self._closed and not self._running and not self._pending and not self._finished
+            if finished:
+                self._finished = True
+        for entry in to_start:
+            self._start_pass(entry, 0)
+        if finished:
+            self._finish()
+    
+    def _start_pass(self, entry, index):
+        record, camera, exported = entry
+        pass_name, scene_path, frames = exported[index]
+        record['status'] = 'rendering'
+        print(f"[LookDev batch] {record['name']}: passe {pass_name}, {len(frames)} frame(s)")
+        
+        job = RenderJob(scene_path, frames, lookdev_pass_output_dir(record['output_dir'], exported, index),
+                        camera, workers=self.workers,
+                        command=self.command, on_complete=lambda job: self._pass_done(entry, index, job))
+        with self._lock:
+            self._jobs.append(job)
+        _active_render_jobs.append(job)
+        job.start()
+    
+    def _pass_done(self, entry, index, job):
+        record, camera, exported = entry
+        with self._lock:
+            self._jobs.remove(job)
+            record['render_seconds'] = round(record['render_seconds'] + (job.duration or 0), 3)
+            record['frames_rendered'] += len(job.completed_frames)
+        remove_render_scenes(exported[index:index + 1])
+        
+        if job.succeeded and index + 1 < len(exported) and not self.cancelled:
+            self._start_pass(entry, index + 1)
+            return
+        remove_render_scenes(exported[index + 1:])
+        
+        if job.cancelled:
+            record['status'] = 'cancelled'
+        elif job.failed_segments:
+            record['status'] = 'failed'
+            record['error'] = "; ".join(f"frames {start}-{end}: {reason}"
+                                        for start, end, step, reason in job.failed_segments)
+        else:
+            record['status'] = 'ok'
+        print(f"[LookDev batch] {record['name']}: {record['status']} "
+              f"({record['frames_rendered']}/{record['frames_total']} frame(s), {record['render_seconds']:.1f}s)")
+        
+        with self._lock:
+            self._running -= 1
+            self.write_manifest()
+        self._fill()
+    
+    def write_manifest(self):
+        """Écrit le manifest JSON (réglages, statut et temps de chaque asset)"""
+        with self._lock:
+            manifest = {
+                'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.start_time)),
+                'duration': self.duration,
+                'settings': self.settings,
+                'assets': self.records,
+            }
+            with open(self.manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+    
+    def _finish(self):
+        self.duration = round(time.time() - self.start_time, 3)
+        self.write_manifest()
+        
+        statuses = {}
+        for record in self.records:
+            statuses[record['status']] = statuses.get(record['status'], 0) + 1
+        
+        print("=" * 50)
+        print(f"LookDev batch terminé: {len(self.records)} asset(s) en {self.duration:.1f}s")
+        for status, count in sorted(statuses.items()):
+            print(f"  - {status}: {count}")
+        print(f"  - Manifest: {self.manifest_path}")
+        print("=" * 50)
+        
+        self._done.set()
+        if self.on_complete:
+            run_deferred(self.on_complete, self)
+
+
+def load_lookdev_reference(path):
+    """Référence un fichier d'asset ; retourne (fichier de référence, nodes de plus haut niveau)"""
+    namespace = re.sub(r'\W', '_', os.path.splitext(os.path.basename(path))[0])
+    new_nodes = cmds.file(path, reference=True, namespace=namespace, returnNewNodes=True) or []
+    reference_file = cmds.referenceQuery(new_nodes[0], filename=True)
+    return reference_file, cmds.ls(new_nodes, assemblies=True, long=True) or []
+
+
+def batch_lookdev(assets=None, output_dir=None, profile='final', refine=False, max_jobs=None, workers=1,
+                  render_command=None, fit='cylinder', max_vertices=0):
+    """Rend le turntable LookDev de plusieurs assets à la suite
+    
+    assets : groupes de plus haut niveau ou fichiers d'asset (référencés le temps du setup) ;
+    par défaut les groupes sélectionnés. Chaque asset est configuré, exporté pour le rendu
+    puis nettoyé avant le suivant ; les rendus tournent en tâche de fond (au plus max_jobs
+    assets à la fois), avec un dossier d'images par asset et un manifest JSON des temps.
+    Retourne le LookDevBatch (batch.wait() pour attendre la fin en mayapy).
+    """
+    if assets is None:
+        assets = cmds.ls(sl=True, long=True, assemblies=True) or []
+    if not assets:
+        cmds.error("Aucun asset ! Sélectionnez des groupes de plus haut niveau ou passez une liste de fichiers.")
+        return None
+    
+    if output_dir is None:
+        output_dir = os.path.join(cmds.workspace(query=True, rootDirectory=True), 'images', 'lookdev_batch',
+                                  time.strftime('%Y%m%d_%H%M%S'))
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    
+    passes = plan_lookdev_passes(LOOKDEV_FRAMES, profile, refine)
+    settings = {'profile': profile, 'refine': refine, 'fit': fit, 'workers': workers}
+    batch = LookDevBatch(os.path.join(output_dir, LOOKDEV_MANIFEST), max_jobs=max_jobs, workers=workers,
+                         command=render_command, settings=settings)
+    
+    used_names = set()
+    for asset in assets:
+        if os.path.isfile(asset):
+            name = os.path.splitext(os.path.basename(asset))[0]
+        else:
+            name = asset.rpartition('|')[2]
+        name = re.sub(r'\W', '_', name)
+        while name in used_names:
+            name += '_'
+        used_names.add(name)
+        
+        record = {
+            'asset': asset,
+            'name': name,
+            'output_dir': os.path.join(output_dir, name),
+            'status': 'setup_failed',
+            'error': None,
+            'setup_seconds': 0,
+            'render_seconds': 0,
+            'frames_total': sum(len(frames) for _, frames in passes),
+            'frames_rendered': 0,
+        }
+        camera = None
+        exported = None
+        reference_file = None
+        start = time.perf_counter()
+        
+        try:
+            if os.path.isfile(asset):
+                reference_file, nodes = load_lookdev_reference(asset)
+            else:
+                nodes = cmds.ls(asset, long=True) or []
+            if not nodes:
+                raise ValueError("asset introuvable")
+            
+            camera = build_lookdev_scene(nodes, fit=fit, max_vertices=max_vertices)
+            exported = export_lookdev_passes(passes)
+            if not os.path.isdir(record['output_dir']):
+                os.makedirs(record['output_dir'])
+        except Exception as e:
+            record['error'] = str(e)
+            cmds.warning(f"LookDev batch: échec du setup de {asset}: {str(e)}")
+            if exported:
+                remove_render_scenes(exported)
+                exported = None
+        finally:
+            # Nettoyage entre deux assets, même après un échec
+            try:
+                if cmds.objExists('LookDev_Setup_GRP'):
+                    clean_lookdev()
+                if reference_file:
+                    cmds.file(reference_file, removeReference=True)
+            except Exception as e:
+                cmds.warning(f"LookDev batch: échec du nettoyage de {asset}: {str(e)}")
+            record['setup_seconds'] = round(time.perf_counter() - start, 3)
+        
+        batch.add(record, camera, exported)
     
-    # Ajoute un bouton pour l'export FBX
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="FBX Export",
-        command="from customPlugins import quick_fbx_export\nquick_fbx_export()",
-        image="out_mesh.png",
-        annotation="Export FBX rapide",
-        imageOverlayLabel="FBX",
-        style="iconOnly"
-    )
+    batch.close()
+    return batch
+
+
+SHELF_NAME = "MesOutils"
+
+# optionVar contenant le hash du contenu du shelf lors de sa dernière construction
+SHELF_HASH_OPTION_VAR = "customPluginsShelfHash"
+
+# Boutons du shelf, dans l'ordre : l'appel est exécuté dans le module customPlugins, via run_tool
+SHELF_BUTTONS = [
+    {'label': "Del History", 'call': "delete_history()", 'image': "DeleteHistory.png", 'overlay': "DelH",
+     'annotation': "Supprimer l'historique des mesh sélectionnés"},
+    {'label': "Freeze", 'call': "freeze_transform()", 'image': "FreezeTransform.png", 'overlay': "Frz",
+     'annotation': "Freeze les transformations des mesh sélectionnés"},
+    {'label': "Materials", 'call': "assign_unique_materials()", 'image': "render_aiStandardSurface.png", 'overlay': "Mat",
+     'annotation': "Assigner un matériau aiStandardSurface unique à chaque mesh"},
+    {'label': "Instances", 'call': "instance_duplicate_meshes()", 'image': "instanceToObject.png", 'overlay': "Inst",
+     'annotation': "Convertir les mesh dupliqués (géométrie identique) en instances"},
+    {'label': "Remove Pasted", 'call': "remove_pasted_prefix()", 'image': "quickRename.png", 'overlay': "Paste",
+     'annotation': "Enlever le préfixe 'pasted__' de tous les objets"},
+    {'label': "Delete Empty", 'call': "delete_empty_groups()", 'image': "deleteActive.png", 'overlay': "DelE",
+     'annotation': "Supprimer tous les groupes vides"},
+    {'label': "Arnold Setup", 'call': "setup_arnold_render()", 'image': "renderGlobals.png", 'overlay': "Arnd",
+     'annotation': "Configurer Arnold pour le compositing (1920x1080, EXR, AOVs)"},
+    {'label': "LookDev Setup", 'call': "setup_lookdev_scene()", 'image': "cameraAim.png", 'overlay': "Look",
+     'annotation': "Configurer scène LookDev (Arnold + HDRI + Caméra)"},
+    {'label': "LookDev Preview", 'call': "setup_lookdev_scene(profile='preview')", 'image': "cameraAim.png", 'overlay': "Prev",
+     'annotation': "Configurer scène LookDev et rendre une preview rapide (1 frame sur 10, basse résolution, sans AOVs)"},
+    {'label': "Clean LookDev", 'call': "clean_lookdev()", 'image': "brush.png", 'overlay': "Clean",
+     'annotation': "Nettoyer la scène après le LookDev (supprime le setup, réaffiche les objets)"},
+    {'label': "Delete Unknown", 'call': "delete_unknown_nodes()", 'image': "nodeGrapherRemoveNodes.png", 'overlay': "Unk",
+     'annotation': "Supprimer tous les nodes inconnus"},
+    {'label': "Delete Unused", 'call': "delete_unused_nodes()", 'image': "deleteClip.png", 'overlay': "Unus",
+     'annotation': "Supprimer les materials, textures et nodes inutilisés"},
+    {'label': "Batch Rename", 'call': "batch_rename()", 'image': "quickRename.png", 'overlay': "Ren",
+     'annotation': "Renommer plusieurs objets (préfixe/suffixe/rechercher-remplacer)"},
+    {'label': "FBX Export", 'call': "quick_fbx_export()", 'image': "out_mesh.png", 'overlay': "FBX",
+     'annotation': "Exporte chaque groupe sélectionné en FBX (assets inchangés ignorés)"},
+    {'label': "USD Export", 'call': "quick_usd_export()", 'image': "publish.png", 'overlay': "USD",
+     'annotation': "Exporte chaque groupe sélectionné en USD (assets inchangés ignorés)"},
+    {'label': "Scene Statistics", 'call': "scene_statistics()", 'image': "polyMesh.png", 'overlay': "Stat",
+     'annotation': "Nodes par type, polycount, mémoire et textures de la scène"},
+    {'label': "Select by Type", 'call': "select_by_type()", 'image': "selectByType.png", 'overlay': "Sel",
+     'annotation': "Sélectionner des objets par type"},
+]
+
+
+def shelf_button_arguments(buttons=None):
+    """Arguments de cmds.shelfButton pour chaque bouton du registre"""
+    return [{
+        'label': button['label'],
+        'command': f"import customPlugins\ncustomPlugins.run_tool({button['label']!r}, lambda: customPlugins.{button['call']})",
+        'sourceType': "python",
+        'image': button['image'],
+        'annotation': button['annotation'],
+        'imageOverlayLabel': button['overlay'],
+        'style': "iconOnly",
+    } for button in (buttons or SHELF_BUTTONS)]
+
+
+def shelf_content_hash(buttons=None):
+    """Hash stable du contenu du shelf (boutons, commandes et ordre)"""
+    import hashlib
     
-    # Ajoute un bouton pour l'export USD
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="USD Export",
-        command="from customPlugins import quick_usd_export\nquick_usd_export()",
-        image="publish.png",
-        annotation="Export USD rapide",
-        imageOverlayLabel="USD",
-        style="iconOnly"
-    )
+    arguments = shelf_button_arguments(buttons)
+    return hashlib.sha1(json.dumps(arguments, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def create_custom_shelf(force=False):
+    """Construit le shelf MesOutils à partir de SHELF_BUTTONS
+    
+    Maya enregistre le shelf dans les préférences : il n'est reconstruit que si
+    SHELF_BUTTONS a changé depuis la dernière construction (hash dans une optionVar),
+    s'il a été supprimé, ou avec force=True. Retourne True si le shelf a été construit.
+    """
+    content_hash = shelf_content_hash()
+    exists = cmds.shelfLayout(SHELF_NAME, exists=True)
+    if exists and not force and cmds.optionVar(query=SHELF_HASH_OPTION_VAR) == content_hash:
+        return False
+    
+    if exists:
+        # Supprime l'ancien shelf pour le recréer
+        cmds.deleteUI(SHELF_NAME, layout=True)
     
-    # Ajoute un bouton pour sélectionner par type
-    cmds.shelfButton(
-        parent=main_shelf,
-        label="Select by Type",
-        command="from customPlugins import select_by_type\nselect_by_type()",
-        image="selectByType.png",
-        annotation="Sélectionner des objets par type",
-        imageOverlayLabel="Sel",
-        style="iconOnly"
-    )
+    main_shelf = cmds.shelfLayout(SHELF_NAME, parent="ShelfLayout")
+    for arguments in shelf_button_arguments():
+        cmds.shelfButton(parent=main_shelf, **arguments)
     
-    print(f"Shelf '{shelf_name}' créé avec succès!")
+    cmds.optionVar(stringValue=(SHELF_HASH_OPTION_VAR, content_hash))
+    print(f"Shelf '{SHELF_NAME}' créé avec succès! ({len(SHELF_BUTTONS)} boutons)")
+    return True
 
 
 # Commande Maya pour créer le shelf
@@ -991,21 +4184,36 @@ class CreateCustomShelfCommand(ommpx.MPxCommand):
         return ommpx.asMPxPtr(CreateCustomShelfCommand())
     
     def doIt(self, args):
-        create_custom_shelf()
+        create_custom_shelf(force=True)
+
+
+# Date de modification du fichier à l'import du module (voir initializePlugin)
+_MODULE_MTIME = os.path.getmtime(__file__)
+
+
+def module_is_stale(module):
+    """Le fichier du module a-t-il été modifié depuis son import ?"""
+    try:
+        return os.path.getmtime(module.__file__) != getattr(module, '_MODULE_MTIME', None)
+    except (AttributeError, OSError, TypeError):
+        return False
 
 
 def initializePlugin(mobject):
     """Initialise le plugin lors du chargement"""
+    start = time.perf_counter()
+    
     # Ajoute le chemin du dossier plug-ins au sys.path
     plugin_path = cmds.pluginInfo('customPlugins', query=True, path=True)
     plugin_dir = os.path.dirname(plugin_path)
     if plugin_dir not in sys.path:
         sys.path.append(plugin_dir)
     
-    # Force le rechargement du module
-    import importlib
-    if 'customPlugins' in sys.modules:
-        importlib.reload(sys.modules['customPlugins'])
+    # Recharge le module utilisé par les boutons du shelf seulement si le fichier a changé
+    module = sys.modules.get('customPlugins')
+    if module is not None and module_is_stale(module):
+        import importlib
+        importlib.reload(module)
     
     pluginFn = ommpx.MFnPlugin(mobject, "Votre Nom", "1.0", "Any")
     
@@ -1016,8 +4224,12 @@ def initializePlugin(mobject):
         )
         print("Plugin Custom Shelf chargé avec succès!")
         
-        # Crée automatiquement le shelf au chargement du plugin
+        # Mesure du temps de chargement des scènes (voir delete_unknown_nodes)
+        register_scene_callbacks()
+        
+        # Crée le shelf au chargement du plugin (s'il manque ou a changé)
         create_custom_shelf()
+        print(f"Plugin Custom Shelf initialisé en {(time.perf_counter() - start) * 1000:.1f} ms")
         
     except:
         om.MGlobal.displayError("Erreur lors du chargement du plugin")
@@ -1029,11 +4241,13 @@ def uninitializePlugin(mobject):
     
     try:
         pluginFn.deregisterCommand(CreateCustomShelfCommand.kPluginCmdName)
+        remove_scene_callbacks()
+        clear_geometry_hash_cache()
+        disable_scene_index()
         
         # Optionnel : supprime le shelf lors du déchargement
-        # shelf_name = "MesOutils"
-        # if cmds.shelfLayout(shelf_name, exists=True):
-        #     cmds.deleteUI(shelf_name, layout=True)
+        # if cmds.shelfLayout(SHELF_NAME, exists=True):
+        #     cmds.deleteUI(SHELF_NAME, layout=True)
         
         print("Plugin Custom Shelf déchargé")
     except:
@@ -0,0 +1,485 @@
+"""Lecture / écriture en flux de scènes Maya ASCII (.ma), sans Maya
+
+Le fichier est découpé en instructions MEL (createNode, setAttr, connectAttr...) au fil
+de la lecture, en mémoire bornée : seules l'instruction courante et une table des
+nodes (noms, types, parents) sont gardées en mémoire, jamais le contenu des setAttr.
+L'entrée est mappée en mémoire (mmap) quand c'est possible, lue par blocs sinon.
+
+Les nettoyages équivalents aux outils du shelf réécrivent directement le fichier :
+
+    python mayaAscii.py scene.ma                              # unknown, pasted, empty_groups
+    python mayaAscii.py scene.ma -o propre.ma --stages unknown
+    python mayaAscii.py scenes/*.ma --bench                   # débit de lecture en Mo/s
+
+La suppression des nodes inconnus se fait en une seule passe. Les groupes vides et le
+préfixe 'pasted__' ont besoin de connaître toute la scène (enfants et noms déclarés plus
+loin) : une passe d'index, qui ne garde que les createNode et parent, précède alors la
+passe de réécriture.
+"""
+import argparse
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+
+# Une instruction : commentaire '//' en début de ligne, ou texte jusqu'au ';' hors chaînes
+STATEMENT_RE = re.compile(rb'\s*(?://[^\n]*\n|[^";]*(?:"(?:[^"\\]|\\.)*"[^";]*)*;)')
+# Corps d'une instruction hors chaînes : s'arrête avant le ';', un '"' non refermé ou la fin
+STATEMENT_BODY_RE = re.compile(rb'[^";]*(?:"(?:[^"\\]|\\.)*"[^";]*)*')
+STATEMENT_END_RE = re.compile(rb'[^";]*(?:"(?:[^"\\]|\\.)*"[^";]*)*;')
+# Lecture par blocs : un commentaire sans '\n' s'arrête à la fin du bloc (il peut contenir un ';')
+CHUNK_STATEMENT_RE = re.compile(rb'\s*(?://[^\n]*(?:\n|\Z)|[^";]*(?:"(?:[^"\\]|\\.)*"[^";]*)*;)')
+COMMAND_RE = re.compile(rb'\s*([A-Za-z]\w*)')
+TOKEN_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"|([^\s;"]+)')
+
+# Types de nodes supprimés par delete_unknown_nodes
+UNKNOWN_TYPES = {'unknown', 'unknownDag', 'unknownTransform'}
+
+# Commandes de haut niveau dont les chaînes désignent des nodes
+REFERENCE_COMMANDS = {b'connectAttr', b'disconnectAttr', b'relationship', b'parent', b'select'}
+
+STAGES = ('unknown', 'pasted', 'empty_groups')
+
+READ_CHUNK_SIZE = 1 << 22
+
+
+class Statement(object):
+    """Instruction MEL brute ; raw contient les blancs qui la précèdent et son ';'"""
+
+    __slots__ = ('raw', 'command', 'attached')
+
+    def __init__(self, raw):
+        self.raw = raw
+        match = COMMAND_RE.match(raw)
+        self.command = match.group(1) if match else None
+        # Les instructions indentées (setAttr, addAttr...) s'appliquent au dernier node créé ou sélectionné
+        indent = raw[:match.start(1)] if match else b''
+        self.attached = bool(indent.rpartition(b'\n')[2])
+
+    def tokens(self):
+        """[(valeur, entre guillemets, début, fin)] des arguments, commande comprise"""
+        result = []
+        for match in TOKEN_RE.finditer(self.raw):
+            if match.group(1) is not None:
+                result.append((decode(match.group(1)), True, match.start(1), match.end(1)))
+            else:
+                result.append((decode(match.group(2)), False, match.start(2), match.end(2)))
+        return result
+
+    def replace_tokens(self, replacements):
+        """Remplace des tokens {début: (fin, nouvelle valeur)} sans toucher au reste"""
+        parts = []
+        position = 0
+        for start in sorted(replacements):
+            end, value = replacements[start]
+            parts.append(self.raw[position:start])
+            parts.append(encode(value))
+            position = end
+        parts.append(self.raw[position:])
+        self.raw = b''.join(parts)
+
+
+def decode(data):
+    return data.decode('utf-8', 'surrogateescape')
+
+
+def encode(text):
+    return text.encode('utf-8', 'surrogateescape')
+
+
+def iter_statements(path, chunk_size=READ_CHUNK_SIZE):
+    """Instructions du fichier, dans l'ordre ; le texte final sans ';' est rendu tel quel"""
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            data = None  # fichier vide ou non mappable : lecture par blocs
+
+        if data is not None:
+            with data:
+                position = 0
+                size = len(data)
+                while position < size:
+                    match = STATEMENT_RE.match(data, position)
+                    if not match:
+                        yield Statement(data[position:])
+                        return
+                    position = match.end()
+                    yield Statement(match.group())
+            return
+
+        yield from iter_chunk_statements(f, chunk_size)
+
+
+def iter_chunk_statements(f, chunk_size=READ_CHUNK_SIZE):
+    """Instructions d'un fichier ouvert en binaire, lu par blocs de chunk_size octets
+
+    Une instruction à cheval sur plusieurs blocs n'est pas relue depuis son début à
+    chaque bloc : la recherche reprend là où le bloc précédent s'est arrêté.
+    """
+    buffer = b''
+    eof = False
+    resume = None  # où reprendre la recherche de fin de l'instruction en attente
+    while True:
+        if not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+        position = 0
+        while True:
+            if resume is not None:
+                match = STATEMENT_END_RE.match(buffer, resume)
+            else:
+                match = CHUNK_STATEMENT_RE.match(buffer, position)
+            # Une instruction qui touche la fin du tampon peut être incomplète
+            if not match or (match.end() == len(buffer) and not eof):
+                break
+            resume = None
+            yield Statement(buffer[position:match.end()])
+            position = match.end()
+        buffer = buffer[position:]
+        if eof:
+            if buffer:
+                yield Statement(buffer)
+            return
+        resume = pending_statement_offset(buffer, resume - position if resume is not None else None)
+
+
+def pending_statement_offset(buffer, resume=None):
+    """Position jusqu'à laquelle l'instruction incomplète en tête de buffer est lue hors
+    chaînes ; None si elle doit être relue depuis le début (commentaire, rien d'entamé)"""
+    if resume is None:
+        start = re.match(rb'\s*', buffer).end()
+        # '//' peut encore être coupé en deux : un commentaire se termine par '\n', pas ';'
+        if len(buffer) - start < 2 or buffer.startswith(b'//', start):
+            return None
+        resume = start
+    return STATEMENT_BODY_RE.match(buffer, resume).end()
+
+
+def create_node_arguments(tokens):
+    """(type, nom, parent, {flag: (valeur, début, fin)}) d'un createNode"""
+    flags = {}
+    node_type = tokens[1][0] if len(tokens) > 1 else None
+    index = 2
+    while index < len(tokens):
+        value = tokens[index][0]
+        if value.startswith('-') and not tokens[index][1] and index + 1 < len(tokens):
+            following = tokens[index + 1]
+            if value in ('-n', '-name', '-p', '-parent'):
+                flags[value[:2]] = following
+                index += 2
+                continue
+        index += 1
+    name = flags['-n'][0] if '-n' in flags else None
+    parent = flags['-p'][0] if '-p' in flags else None
+    return node_type, name, parent, flags
+
+
+class MaIndex(object):
+    """Table des nodes créés par le fichier : chemins, types et parents
+
+    Les chemins n'ont pas de '|' initial ('grp|geo|geoShape') ; un node sans -p est à
+    la racine. Les références du fichier (nom court, chemin partiel ou complet) sont
+    résolues comme le fait Maya au chargement.
+    """
+
+    def __init__(self):
+        self.types = {}
+        self.parents = {}
+        self.by_name = {}
+        self.order = []
+        self.extra_children = {}
+
+    def add_node(self, name, node_type, parent_ref=None):
+        parent = self.resolve(parent_ref) if parent_ref else None
+        if parent_ref and parent is None:
+            # Parent hors du fichier (référence) : chemin tel qu'écrit
+            parent = parent_ref.lstrip('|')
+        path = f"{parent}|{name}" if parent else name
+        self.types[path] = node_type
+        self.parents[path] = parent
+        self.by_name.setdefault(name, []).append(path)
+        self.order.append(path)
+        return path
+
+    def resolve(self, ref):
+        """Chemin du node désigné par ref, ou None s'il est inconnu ou ambigu"""
+        if ref.startswith('|'):
+            ref = ref[1:]
+            return ref if ref in self.types else None
+        name = ref.rpartition('|')[2]
+        candidates = self.by_name.get(name, [])
+        if '|' in ref:
+            suffix = '|' + ref
+            candidates = [path for path in candidates if path.endswith(suffix)]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def node_of(self, ref):
+        """Chemin du node d'une référence 'node.attr' ou 'node'"""
+        return self.resolve(ref.partition('.')[0])
+
+    def children_counts(self, removed=()):
+        counts = dict(self.extra_children)
+        for path in self.order:
+            parent = self.parents[path]
+            if parent and path not in removed:
+                counts[parent] = counts.get(parent, 0) + 1
+        return counts
+
+
+def is_removed(path, removed):
+    """Vrai si le node ou un de ses parents est supprimé"""
+    while path:
+        if path in removed:
+            return True
+        path = path.rpartition('|')[0]
+    return False
+
+
+def index_scene(path):
+    """Passe d'index : ne lit que les createNode et les parent (instances)"""
+    index = MaIndex()
+    for statement in iter_statements(path):
+        if statement.command == b'createNode':
+            node_type, name, parent, flags = create_node_arguments(statement.tokens())
+            if name:
+                index.add_node(name, node_type, parent)
+        elif statement.command == b'parent' and not statement.attached:
+            tokens = [token for token in statement.tokens()[1:] if token[1]]
+            if len(tokens) >= 2:
+                target = index.resolve(tokens[-1][0])
+                if target:
+                    index.extra_children[target] = index.extra_children.get(target, 0) + len(tokens) - 1
+    return index
+
+
+def plan_cleanup(index, stages):
+    """Décide à partir de l'index les nodes supprimés et renommés
+
+    Retourne (removed, renamed, counts) : chemins supprimés (avec leurs descendants),
+    {chemin: nouveau nom court} et le nombre de nodes traités par étape.
+    """
+    removed = set()
+    counts = {}
+
+    if 'unknown' in stages:
+        for path in index.order:
+            if index.types[path] in UNKNOWN_TYPES or (index.parents[path] in removed):
+                removed.add(path)
+        counts['unknown'] = sum(1 for path in removed if index.types[path] in UNKNOWN_TYPES)
+
+    if 'pasted' in stages:
+        renamed = {}
+        taken = set(index.by_name)
+        for path in index.order:
+            name = path.rpartition('|')[2]
+            if 'pasted__' not in name or path in removed:
+                continue
+            new_name = name.replace('pasted__', '')
+            if not new_name or new_name.endswith(':'):
+                continue
+            if new_name in taken:
+                # Même règle que Maya : numéro incrémenté jusqu'à un nom libre
+                base = new_name.rstrip('0123456789')
+                number = 1
+                while f"{base}{number}" in taken:
+                    number += 1
+                new_name = f"{base}{number}"
+            taken.add(new_name)
+            renamed[path] = new_name
+        counts['pasted'] = len(renamed)
+    else:
+        renamed = {}
+
+    if 'empty_groups' in stages:
+        # Du plus profond au moins profond : les enfants sont déclarés après leur parent
+        remaining = index.children_counts(removed)
+        empty = 0
+        for path in reversed(index.order):
+            if path in removed or index.types[path] != 'transform' or remaining.get(path, 0):
+                continue
+            removed.add(path)
+            empty += 1
+            parent = index.parents[path]
+            if parent:
+                remaining[parent] -= 1
+        counts['empty_groups'] = empty
+
+    return removed, renamed, counts
+
+
+def renamed_reference(ref, index, renamed):
+    """Référence réécrite avec les nouveaux noms, sous la même forme (courte ou chemin)"""
+    node_ref, dot, attribute = ref.partition('.')
+    path = index.resolve(node_ref)
+    if path is None:
+        return ref
+    segments = path.split('|')
+    new_segments = [renamed.get('|'.join(segments[:i + 1]), segment) for i, segment in enumerate(segments)]
+    if new_segments == segments:
+        return ref
+    depth = node_ref.strip('|').count('|') + 1
+    new_ref = '|'.join(new_segments[-depth:])
+    if node_ref.startswith('|'):
+        new_ref = '|' + new_ref
+    return new_ref + dot + attribute
+
+
+def rewrite_scene(source, destination, stages=STAGES, index=None):
+    """Réécrit source dans destination avec les nettoyages demandés
+
+    destination peut être source : le fichier est écrit à côté puis remplacé.
+    Retourne les statistiques (nodes traités par étape, instructions, octets, durée).
+    """
+    start = time.perf_counter()
+    size = os.path.getsize(source)
+    stages = tuple(stages)
+    needs_index = any(stage in stages for stage in ('pasted', 'empty_groups'))
+    if needs_index and index is None:
+        index = index_scene(source)
+    if index is not None:
+        removed, renamed, counts = plan_cleanup(index, stages)
+    else:
+        removed, renamed, counts = set(), {}, {'unknown': 0}
+
+    # Index reconstruit au fil de la réécriture pour résoudre les références
+    live = MaIndex()
+    statements = dropped = 0
+    skipping = False
+
+    directory = os.path.dirname(os.path.abspath(destination))
+    handle, temp_path = tempfile.mkstemp(prefix='.cleanup_', suffix='.ma', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb', buffering=1 << 20) as output:
+            for statement in iter_statements(source):
+                statements += 1
+
+                if statement.attached:
+                    if skipping:
+                        dropped += 1
+                        continue
+                else:
+                    skipping = False
+
+                if statement.command == b'createNode':
+                    tokens = statement.tokens()
+                    node_type, name, parent, flags = create_node_arguments(tokens)
+                    if name:
+                        path = live.add_node(name, node_type, parent)
+                        if index is None and 'unknown' in stages and (
+                                node_type in UNKNOWN_TYPES or is_removed(live.parents[path] or '', removed)):
+                            # Une seule passe : décision au fil de l'eau
+                            removed.add(path)
+                            counts['unknown'] += node_type in UNKNOWN_TYPES
+                        if is_removed(path, removed):
+                            skipping = True
+                            dropped += 1
+                            continue
+                        if renamed:
+                            replacements = {}
+                            if path in renamed:
+                                value, quoted, token_start, token_end = flags['-n']
+                                replacements[token_start] = (token_end, renamed[path])
+                            if parent:
+                                value, quoted, token_start, token_end = flags['-p']
+                                new_parent = renamed_reference(value, live, renamed)
+                                if new_parent != value:
+                                    replacements[token_start] = (token_end, new_parent)
+                            if replacements:
+                                statement.replace_tokens(replacements)
+
+                elif statement.command in REFERENCE_COMMANDS and not statement.attached:
+                    tokens = [token for token in statement.tokens()[1:] if token[1]]
+                    if statement.command == b'relationship':
+                        tokens = tokens[1:]  # type de relation ("link", "shadowLink"...)
+                    paths = [live.node_of(value) for value, quoted, token_start, token_end in tokens]
+                    if removed and any(path and is_removed(path, removed) for path in paths):
+                        # Connexion, lien ou sélection d'un node supprimé
+                        skipping = statement.command == b'select'
+                        dropped += 1
+                        continue
+                    if renamed:
+                        replacements = {}
+                        for value, quoted, token_start, token_end in tokens:
+                            new_value = renamed_reference(value, live, renamed)
+                            if new_value != value:
+                                replacements[token_start] = (token_end, new_value)
+                        if replacements:
+                            statement.replace_tokens(replacements)
+
+                output.write(statement.raw)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    seconds = time.perf_counter() - start
+    stats = dict(counts)
+    stats.update({
+        'statements': statements,
+        'dropped_statements': dropped,
+        'bytes': size,
+        'seconds': round(seconds, 3),
+        'mb_per_s': round(size / (1 << 20) / seconds, 1) if seconds else None,
+    })
+    return stats
+
+
+def delete_unknown_nodes(source, destination=None):
+    """Supprime les nodes inconnus (et leurs connexions) d'un fichier .ma, en une passe"""
+    return rewrite_scene(source, destination or source, stages=('unknown',))
+
+
+def remove_pasted_prefix(source, destination=None):
+    """Enlève le préfixe 'pasted__' des nodes d'un fichier .ma"""
+    return rewrite_scene(source, destination or source, stages=('pasted',))
+
+
+def delete_empty_groups(source, destination=None):
+    """Supprime les groupes vides (récursivement) d'un fichier .ma"""
+    return rewrite_scene(source, destination or source, stages=('empty_groups',))
+
+
+def measure_throughput(path):
+    """Débit du découpage en instructions seul : (instructions, Mo/s)"""
+    start = time.perf_counter()
+    count = sum(1 for _ in iter_statements(path))
+    seconds = time.perf_counter() - start
+    return count, os.path.getsize(path) / (1 << 20) / seconds if seconds else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nettoyage de fichiers Maya ASCII sans Maya")
+    parser.add_argument('paths', nargs='+', help="fichiers .ma")
+    parser.add_argument('-o', '--output', help="fichier de sortie (un seul fichier en entrée ; défaut: en place)")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help="étapes séparées par des virgules (défaut: %(default)s)")
+    parser.add_argument('--bench', action='store_true', help="mesure le débit de lecture sans rien écrire")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.paths) > 1:
+        parser.error("--output n'accepte qu'un seul fichier en entrée")
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"étape(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(STAGES)})")
+
+    for path in args.paths:
+        if args.bench:
+            count, throughput = measure_throughput(path)
+            print(f"{path}: {count} instruction(s), {throughput:.1f} Mo/s")
+            continue
+        stats = rewrite_scene(path, args.output or path, stages)
+        counts = ", ".join(f"{stage}={stats.get(stage, 0)}" for stage in stages)
+        print(f"{path}: {counts} ({stats['dropped_statements']} instruction(s) retirée(s), "
+              f"{stats['seconds']:.2f}s, {stats['mb_per_s']} Mo/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1490 @@
+"""Backend maya.cmds en mémoire pour exécuter et chronométrer les outils hors de Maya
+
+Implémente le sous-ensemble de maya.cmds utilisé par customPlugins sur un graphe
+de scène simplifié (DAG + nodes DG). Les temps mesurés ici ne reflètent pas le coût
+réel d'un appel Maya : le nombre d'appels par commande (StandInScene.call_counts)
+est la mesure à comparer.
+
+Utilisation :
+    import mayaStandIn
+    scene = mayaStandIn.install()
+    import customPlugins
+"""
+import fnmatch
+import json
+import os
+import sys
+import types
+import uuid as uuid_module
+from collections import Counter
+
+
+# Hiérarchie (simplifiée) des types de nodes : type -> type parent
+NODE_TYPE_PARENTS = {
+    'transform': 'dagNode',
+    'joint': 'transform',
+    'shape': 'dagNode',
+    'mesh': 'shape',
+    'nurbsCurve': 'shape',
+    'nurbsSurface': 'shape',
+    'locator': 'shape',
+    'camera': 'shape',
+    'light': 'shape',
+    'ambientLight': 'light',
+    'directionalLight': 'light',
+    'pointLight': 'light',
+    'spotLight': 'light',
+    'areaLight': 'light',
+    'volumeLight': 'light',
+    'aiAreaLight': 'light',
+    'aiSkyDomeLight': 'light',
+    'aiMeshLight': 'light',
+    'aiPhotometricLight': 'light',
+    'aiLightPortal': 'light',
+    'unknownDag': 'dagNode',
+    'unknownTransform': 'transform',
+    'dagNode': None,
+}
+
+# Classification des types de nodes de rendu (cmds.listNodeTypes)
+NODE_CLASSIFICATIONS = {
+    'shader': ['lambert', 'blinn', 'phong', 'surfaceShader', 'standardSurface',
+               'aiStandardSurface', 'aiFlat', 'aiMixShader', 'aiToon'],
+    'texture': ['file', 'ramp', 'noise', 'checker', 'layeredTexture', 'aiImage', 'aiNoise'],
+    'utility': ['place2dTexture', 'bump2d', 'multiplyDivide', 'plusMinusAverage',
+                'aiNormalMap', 'aiColorCorrect', 'aiRange'],
+}
+
+# Géométrie par défaut d'un mesh (cube unité) : positions à plat, sommets par face, indices
+CUBE_POINTS = [-0.5, -0.5, 0.5, 0.5, -0.5, 0.5, -0.5, 0.5, 0.5, 0.5, 0.5, 0.5,
+               -0.5, 0.5, -0.5, 0.5, 0.5, -0.5, -0.5, -0.5, -0.5, 0.5, -0.5, -0.5]
+CUBE_COUNTS = [4] * 6
+CUBE_CONNECTS = [0, 1, 3, 2, 2, 3, 5, 4, 4, 5, 7, 6, 6, 7, 1, 0, 1, 7, 5, 3, 6, 0, 2, 4]
+
+IDENTITY_MATRIX = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+# Types créés comme shapes sous un transform (cmds.createNode / shadingNode asLight)
+SHAPE_TYPES = {t for t in NODE_TYPE_PARENTS if t not in ('transform', 'joint', 'dagNode')}
+
+
+def inherited_types(node_type):
+    """Retourne le type et tous ses types parents"""
+    types_ = [node_type]
+    parent = NODE_TYPE_PARENTS.get(node_type)
+    while parent:
+        types_.append(parent)
+        parent = NODE_TYPE_PARENTS.get(parent)
+    return types_
+
+
+def is_dag_type(node_type):
+    return 'dagNode' in inherited_types(node_type)
+
+
+class StandInNode(object):
+    """Node de la scène en mémoire"""
+
+    __slots__ = ('uuid', 'name', 'type', 'parent', 'instance_parents', 'children', 'attrs')
+
+    def __init__(self, name, node_type, parent=None):
+        self.uuid = str(uuid_module.uuid4()).upper()
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.instance_parents = []  # parents supplémentaires d'un node instancié (parent -add)
+        self.children = []
+        self.attrs = {}
+
+    @property
+    def is_dag(self):
+        return is_dag_type(self.type)
+
+    def long_name(self):
+        if not self.is_dag:
+            return self.name
+        parts = []
+        node = self
+        while node is not None:
+            parts.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(parts))
+
+    def long_names(self):
+        """Tous les chemins du node (un par instance), le chemin principal en premier"""
+        if not self.is_dag:
+            return [self.name]
+        paths = []
+        for parent in [self.parent] + self.instance_parents:
+            if parent is None:
+                paths.append('|' + self.name)
+            else:
+                paths.extend(f"{path}|{self.name}" for path in parent.long_names())
+        return paths
+
+
+class StandInScene(object):
+    """Graphe de scène en mémoire"""
+
+    def __init__(self):
+        self.call_counts = Counter()
+        self.listeners = []
+        self.workspace_root = ''
+        # Interface et préférences : conservées d'une scène à l'autre, comme dans Maya
+        self.ui = {}           # nom de layout -> liste des boutons (kwargs)
+        self.option_vars = {}
+        self.clear()
+
+    def clear(self):
+        self.nodes = {}       # uuid -> StandInNode
+        self.by_name = {}     # nom court -> liste de nodes
+        self.roots = []
+        self.selection = []
+        self.connections = []  # (plug source, plug destination)
+        self._connection_index = None
+        self.shading_groups = {}  # uuid du membre -> shading group
+        self.file_info = {}
+        self.scene_name = ''
+        self.loaded_plugins = set()
+        self.unknown_plugins = set()
+        self.references = {}   # fichier référencé -> uuids des nodes chargés
+        self.dirty_callbacks = {}  # uuid -> {id: fonction(attribut)} (MNodeMessage.addNodeDirtyPlugCallback)
+
+    def connection_index(self):
+        """{nom de node: [positions dans connections]} (source ou destination), complété au
+        fil des ajouts ; reconstruit si la liste a été remplacée ou raccourcie"""
+        index = self._connection_index
+        if index is None or index[0] is not self.connections or index[1] > len(self.connections):
+            index = self._connection_index = [self.connections, 0, {}]
+        connections, count, positions = index
+        for position in range(count, len(connections)):
+            for plug in connections[position]:
+                positions.setdefault(plug.partition('.')[0], []).append(position)
+        index[1] = len(connections)
+        return positions
+
+    def set_attr(self, node, attr, value):
+        """Modifie un attribut et prévient les callbacks de dirty du node, comme un setAttr"""
+        node.attrs[attr] = value
+        for function in list(self.dirty_callbacks.get(node.uuid, {}).values()):
+            function(attr)
+
+    def add_listener(self, listener):
+        """Source d'événements : listener reçoit node_added / node_removed / node_renamed
+        / node_parent_added / node_parent_removed comme les callbacks Maya
+        (voir customPlugins.enable_scene_index)"""
+        self.listeners.append(listener)
+
+    def unique_name(self, name):
+        """Nom libre au niveau de la scène (nodes DG, nouveaux nodes à la racine)"""
+        if name not in self.by_name:
+            return name
+        base = name.rstrip('0123456789') or name
+        index = 1
+        while f"{base}{index}" in self.by_name:
+            index += 1
+        return f"{base}{index}"
+
+    # --- Construction -----------------------------------------------------
+
+    def add_node(self, name, node_type, parent=None):
+        """Ajoute un node (parent : StandInNode ou None)"""
+        node = StandInNode(name, node_type, parent)
+        self.nodes[node.uuid] = node
+        self.by_name.setdefault(name, []).append(node)
+        if parent is not None:
+            parent.children.append(node)
+        elif node.is_dag:
+            self.roots.append(node)
+        for listener in self.listeners:
+            listener.node_added(node.uuid, name, node_type, parent.uuid if parent is not None else None)
+        return node
+
+    def add_transform(self, name, parent=None, shape_type=None):
+        """Ajoute un transform, avec un shape optionnel nommé <name>Shape"""
+        transform = self.add_node(name, 'transform', parent)
+        if shape_type:
+            self.add_node(f"{name}Shape", shape_type, transform)
+        return transform
+
+    def remove_node(self, node):
+        for child in list(node.children):
+            if child.instance_parents:
+                # Comme Maya : seule l'instance sous ce node disparaît
+                self.remove_instance(child, node)
+            else:
+                self.remove_node(child)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        elif node in self.roots:
+            self.roots.remove(node)
+        for parent in node.instance_parents:
+            parent.children.remove(node)
+        self.by_name[node.name].remove(node)
+        if not self.by_name[node.name]:
+            del self.by_name[node.name]
+        del self.nodes[node.uuid]
+        if node in self.selection:
+            self.selection.remove(node)
+        for listener in self.listeners:
+            listener.node_removed(node.uuid)
+
+    def reparent_node(self, node, parent=None):
+        """Déplace un node DAG (toutes ses instances) sous parent (StandInNode), ou à la racine
+        
+        Comme les MDagMessage de Maya : un parentRemoved par ancien parent, puis un parentAdded.
+        """
+        previous = [node.parent] + node.instance_parents
+        if node.parent is None and node in self.roots:
+            self.roots.remove(node)
+        for old_parent in previous:
+            if old_parent is not None:
+                old_parent.children.remove(node)
+        node.parent = parent
+        node.instance_parents = []
+        if parent is not None:
+            parent.children.append(node)
+        else:
+            self.roots.append(node)
+        for listener in self.listeners:
+            for old_parent in previous:
+                listener.node_parent_removed(node.uuid, old_parent.uuid if old_parent is not None else None)
+            listener.node_parent_added(node.uuid, parent.uuid if parent is not None else None)
+
+    def add_instance(self, node, parent):
+        """Instancie node sous parent (parent -add) : le node a alors plusieurs chemins"""
+        node.instance_parents.append(parent)
+        parent.children.append(node)
+        for listener in self.listeners:
+            listener.node_parent_added(node.uuid, parent.uuid)
+
+    def remove_instance(self, node, parent):
+        """Retire l'instance de node sous parent ; le node garde ses autres parents"""
+        parent.children.remove(node)
+        if node.parent is parent:
+            node.parent = node.instance_parents.pop(0)
+        else:
+            node.instance_parents.remove(parent)
+        for listener in self.listeners:
+            listener.node_parent_removed(node.uuid, parent.uuid)
+
+    def rename_node(self, node, new_name):
+        self.by_name[node.name].remove(node)
+        if not self.by_name[node.name]:
+            del self.by_name[node.name]
+        old_name, node.name = node.name, new_name
+        self.by_name.setdefault(new_name, []).append(node)
+        # Les connexions sont enregistrées par nom : elles suivent le node renommé (sur place)
+        if self.connections:
+            positions = self.connection_index().pop(old_name, [])
+            for position in positions:
+                self.connections[position] = tuple(
+                    new_name + plug[len(old_name):] if plug.partition('.')[0] == old_name else plug
+                    for plug in self.connections[position])
+            if positions:
+                self.connection_index().setdefault(new_name, []).extend(positions)
+        for listener in self.listeners:
+            listener.node_renamed(node.uuid, new_name)
+
+    # --- Résolution des noms ----------------------------------------------
+
+    def resolve(self, name):
+        """Retourne le node correspondant à un nom court, un chemin ou un UUID"""
+        if name in self.nodes:
+            return self.nodes[name]
+        name = name.split('.')[0]
+        if '|' not in name:
+            candidates = self.by_name.get(name, [])
+            return candidates[0] if len(candidates) == 1 else None
+        if name.startswith('|'):
+            # Chemin absolu : descend segment par segment depuis la racine
+            segments = name[1:].split('|')
+            node = next((n for n in self.by_name.get(segments[0], []) if n.parent is None), None)
+            for segment in segments[1:]:
+                if node is None:
+                    return None
+                node = next((c for c in node.children if c.name == segment), None)
+            return node
+        short_name = name.rsplit('|', 1)[-1]
+        for node in self.by_name.get(short_name, []):
+            for long_name in node.long_names():
+                if long_name.endswith('|' + name):
+                    return node
+        return None
+
+    def require(self, name):
+        node = self.resolve(name)
+        if node is None:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def display_name(self, node, long=False):
+        """Nom retourné par les commandes : chemin long ou nom court unique"""
+        if long or (node.is_dag and len(self.by_name.get(node.name, [])) > 1):
+            return node.long_name()
+        return node.name
+
+    def iter_dag(self):
+        """Parcours en profondeur (pré-ordre) de tout le DAG, chaque node instancié une seule fois"""
+        stack = list(reversed(self.roots))
+        instanced = set()
+        while stack:
+            node = stack.pop()
+            if node.instance_parents:
+                if node.uuid in instanced:
+                    continue
+                instanced.add(node.uuid)
+            yield node
+            stack.extend(reversed(node.children))
+
+    def iter_all(self):
+        for node in self.iter_dag():
+            yield node
+        for node in self.nodes.values():
+            if not node.is_dag:
+                yield node
+
+
+class StandInCmds(object):
+    """Sous-ensemble de maya.cmds travaillant sur une StandInScene"""
+
+    def __init__(self, scene):
+        self._scene = scene
+
+    def __getattribute__(self, name):
+        # Compte les appels par nom de commande
+        if not name.startswith('_'):
+            object.__getattribute__(self, '_scene').call_counts[name] += 1
+        return object.__getattribute__(self, name)
+
+    # --- Helpers ----------------------------------------------------------
+
+    def _as_list(self, value):
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple, set)):
+            return list(value)
+        return [value]
+
+    def _match_type(self, node, type_filter, exact=False):
+        if type_filter is None:
+            return True
+        wanted = self._as_list(type_filter)
+        if exact:
+            return node.type in wanted
+        return any(t in wanted for t in inherited_types(node.type))
+
+    def _output(self, nodes, long=False):
+        result = [self._scene.display_name(n, long) for n in nodes]
+        return result
+
+    # --- Requêtes -----------------------------------------------------------
+
+    def ls(self, *args, **kwargs):
+        scene = self._scene
+        long = kwargs.get('long', kwargs.get('l', False))
+        type_filter = kwargs.get('type')
+        exact_type = kwargs.get('exactType')
+
+        if kwargs.get('sl') or kwargs.get('selection'):
+            candidates = list(scene.selection)
+        elif args:
+            candidates = []
+            for item in self._as_list(args[0] if len(args) == 1 else list(args)):
+                if any(c in item for c in '*?['):
+                    candidates.extend(n for n in scene.iter_all()
+                                      if fnmatch.fnmatchcase(n.name, item))
+                else:
+                    node = scene.resolve(item)
+                    if node is not None:
+                        candidates.append(node)
+        else:
+            candidates = list(scene.iter_all())
+
+        result = []
+        for node in candidates:
+            if kwargs.get('dag') and not node.is_dag:
+                continue
+            if kwargs.get('assemblies') and (not node.is_dag or node.parent is not None):
+                continue
+            if kwargs.get('defaultNodes') and not node.attrs.get('isDefault'):
+                continue
+            if kwargs.get('readOnly') and not node.attrs.get('isReferenced'):
+                continue
+            if kwargs.get('transforms') and not self._match_type(node, 'transform'):
+                continue
+            if kwargs.get('shapes') and not self._match_type(node, 'shape'):
+                continue
+            if exact_type is not None and not self._match_type(node, exact_type, exact=True):
+                continue
+            if not self._match_type(node, type_filter):
+                continue
+            result.append(node)
+
+        if kwargs.get('uuid'):
+            return [n.uuid for n in result]
+        # allPaths : un chemin par instance (sinon un nœud instancié n'apparaît qu'une fois)
+        if kwargs.get('allPaths') or kwargs.get('ap'):
+            named = [(path, n) for n in result for path in (n.long_names() if n.is_dag else [n.name])]
+        else:
+            named = [(scene.display_name(n, long), n) for n in result]
+        if kwargs.get('showType'):
+            output = []
+            for path, n in named:
+                output.extend([path, n.type])
+            return output
+        return [path for path, n in named]
+
+    def listRelatives(self, nodes=None, **kwargs):
+        scene = self._scene
+        full_path = kwargs.get('fullPath', kwargs.get('f', False))
+        type_filter = kwargs.get('type')
+        result = []
+        for name in self._as_list(nodes):
+            node = scene.resolve(name)
+            if node is None:
+                continue
+            if kwargs.get('allParents') or kwargs.get('ap'):
+                related = [(None, p) for p in [node.parent] + node.instance_parents if p is not None]
+            elif kwargs.get('parent') or kwargs.get('p'):
+                related = [(None, node.parent)] if node.parent is not None else []
+            else:
+                # Chemins des enfants construits à partir du chemin demandé (instances comprises)
+                base = name if name.startswith('|') else node.long_name()
+                if kwargs.get('allDescendents') or kwargs.get('ad'):
+                    related = []
+                    stack = [(f"{base}|{c.name}", c) for c in node.children]
+                    while stack:
+                        path, child = stack.pop()
+                        related.append((path, child))
+                        stack.extend((f"{path}|{c.name}", c) for c in child.children)
+                else:
+                    related = [(f"{base}|{c.name}", c) for c in node.children]
+                    if kwargs.get('shapes') or kwargs.get('s'):
+                        related = [(path, c) for path, c in related if self._match_type(c, 'shape')]
+            if kwargs.get('noIntermediate') or kwargs.get('ni'):
+                related = [(path, n) for path, n in related if not n.attrs.get('intermediateObject')]
+            for path, n in related:
+                if self._match_type(n, type_filter):
+                    result.append(path if full_path and path else scene.display_name(n, full_path))
+        return result or None
+
+    def listConnections(self, nodes=None, **kwargs):
+        scene = self._scene
+        source = kwargs.get('source', kwargs.get('s', True))
+        destination = kwargs.get('destination', kwargs.get('d', True))
+        wanted = {}
+        attributes = {}  # uuid -> attributs demandés (None : toutes les connexions du node)
+        keys = set()
+        for name in self._as_list(nodes):
+            node_name, _, attr = name.partition('.')
+            node = scene.resolve(node_name)
+            if node is not None:
+                wanted[node.uuid] = node
+                if attr and attributes.get(node.uuid, ()) is not None:
+                    attributes.setdefault(node.uuid, set()).add(attr)
+                else:
+                    attributes[node.uuid] = None
+                keys.update([node_name, node.name] + node.long_names())
+
+        def node_of(plug):
+            return scene.resolve(plug.partition('.')[0])
+
+        def requested(node, plug):
+            attrs = attributes[node.uuid]
+            return attrs is None or plug.partition('.')[2] in attrs
+
+        # Seules les connexions indexées sous le nom d'un des nodes demandés sont lues
+        index = scene.connection_index()
+        positions = sorted({position for key in keys for position in index.get(key, ())})
+        result = []
+        for position in positions:
+            source_plug, destination_plug = scene.connections[position]
+            source_node, destination_node = node_of(source_plug), node_of(destination_plug)
+            if source_node is None or destination_node is None:
+                continue  # connexion d'un node supprimé
+            if destination and source_node.uuid in wanted and requested(source_node, source_plug):
+                result.append((source_plug, destination_node, destination_plug))
+            if source and destination_node.uuid in wanted and requested(destination_node, destination_plug):
+                result.append((destination_plug, source_node, source_plug))
+
+        # Comme Maya : les membres d'un shading group lui sont connectés en amont
+        if source:
+            for node in wanted.values():
+                if node.type == 'shadingEngine' and requested(node, f"{node.name}.dagSetMembers"):
+                    for member in node.attrs.get('members', ()):
+                        if member in scene.nodes:
+                            result.append((f"{node.name}.dagSetMembers", scene.nodes[member], None))
+
+        output = []
+        for own_plug, other, other_plug in result:
+            other_name = scene.display_name(other)
+            if kwargs.get('connections') or kwargs.get('c'):
+                output.append(own_plug)
+            output.append(other_plug if kwargs.get('plugs') and other_plug else other_name)
+        return output or None
+
+    def listNodeTypes(self, classification, **kwargs):
+        return list(NODE_CLASSIFICATIONS.get(classification, [])) or None
+
+    def nodeType(self, name, isTypeName=False, inherited=False, **kwargs):
+        node_type = name if isTypeName else self._scene.require(name).type
+        if inherited:
+            # Comme Maya : du type de base au type demandé
+            return list(reversed(inherited_types(node_type)))
+        return node_type
+
+    def objExists(self, name):
+        return self._scene.resolve(name) is not None
+
+    # --- Modifications ----------------------------------------------------
+
+    def select(self, nodes=None, **kwargs):
+        scene = self._scene
+        if kwargs.get('clear'):
+            scene.selection = []
+            return
+        resolved = [scene.require(n) for n in self._as_list(nodes)]
+        if kwargs.get('add'):
+            scene.selection.extend(n for n in resolved if n not in scene.selection)
+        else:
+            scene.selection = resolved
+
+    def delete(self, nodes=None, **kwargs):
+        scene = self._scene
+        if kwargs.get('ch') or kwargs.get('constructionHistory'):
+            return
+        resolved = [scene.require(n) for n in self._as_list(nodes)]
+        locked = [n.name for n in resolved if n.attrs.get('locked')]
+        if locked:
+            raise RuntimeError(f"Cannot delete locked node '{locked[0]}'")
+        for name, node in zip(self._as_list(nodes), resolved):
+            if node.uuid not in scene.nodes:
+                continue
+            parent = scene.resolve(name.rpartition('|')[0]) if name.startswith('|') else None
+            if node.instance_parents and parent is not None:
+                # Chemin d'une instance : seule cette instance est supprimée
+                scene.remove_instance(node, parent)
+            else:
+                scene.remove_node(node)
+
+    def rename(self, old_name, new_name, **kwargs):
+        scene = self._scene
+        node = scene.require(old_name)
+        if not new_name or '|' in new_name or '*' in new_name:
+            raise RuntimeError(f"New name '{new_name}' is not valid")
+        if new_name == node.name:
+            return scene.display_name(node)
+        # Comme Maya : un nom déjà pris (parmi les frères pour le DAG) reçoit un numéro
+        def taken(candidate):
+            others = scene.by_name.get(candidate, [])
+            if not node.is_dag:
+                return any(n is not node for n in others)
+            siblings = node.parent.children if node.parent is not None else scene.roots
+            if len(siblings) < len(others):
+                return any(n.name == candidate and n is not node for n in siblings)
+            return any(n.parent is node.parent and n is not node for n in others)
+        unique_name = new_name
+        index = 1
+        while taken(unique_name):
+            unique_name = f"{new_name.rstrip('0123456789')}{index}"
+            index += 1
+        scene.rename_node(node, unique_name)
+        return scene.display_name(node)
+
+    def error(self, message):
+        raise RuntimeError(message)
+
+    def warning(self, message):
+        print(f"# Warning: {message}")
+
+    def _write_scene_file(self, path, roots, header):
+        # Fichier factice : une ligne "chemin type" par node DAG (une par instance),
+        # suivie des positions des meshes ; relu par file(reference=True)
+        stack = [(root.long_name(), root) for root in reversed(roots)]
+        with open(path, 'w') as f:
+            f.write(f"# {header}\n")
+            while stack:
+                node_path, node = stack.pop()
+                f.write(f"{node_path} {node.type}\n")
+                if node.type == 'mesh':
+                    f.write(f"  points {json.dumps(node.attrs.get('points', CUBE_POINTS))}\n")
+                stack.extend((f"{node_path}|{child.name}", child) for child in reversed(node.children))
+
+    def _load_scene_file(self, path, namespace):
+        scene = self._scene
+        created = {}  # chemin dans le fichier -> node créé
+        node = None
+        with open(path) as f:
+            for line in f:
+                if line.startswith('#'):
+                    continue
+                if line.startswith('  points '):
+                    node.attrs['points'] = json.loads(line[len('  points '):])
+                    continue
+                node_path, node_type = line.split()
+                parent_path, _, name = node_path.rpartition('|')
+                node = scene.add_node(f"{namespace}:{name}", node_type, created.get(parent_path))
+                created[node_path] = node
+        return list(created.values())
+
+    def file(self, *args, **kwargs):
+        scene = self._scene
+        if kwargs.get('query') and kwargs.get('sceneName'):
+            return scene.scene_name
+        if kwargs.get('new') or kwargs.get('newFile'):
+            scene.clear()
+            return None
+        header = f"{kwargs.get('type')} {kwargs.get('options', '')}"
+        if kwargs.get('exportSelected') or kwargs.get('es'):
+            self._write_scene_file(args[0], scene.selection, header)
+            return args[0]
+        if kwargs.get('exportAll') or kwargs.get('ea'):
+            self._write_scene_file(args[0], scene.roots, header)
+            return args[0]
+        if kwargs.get('reference') or kwargs.get('r'):
+            path = args[0]
+            namespace = kwargs.get('namespace') or os.path.splitext(os.path.basename(path))[0]
+            nodes = self._load_scene_file(path, namespace)
+            for node in nodes:
+                node.attrs['isReferenced'] = True
+            scene.references[path] = [node.uuid for node in nodes]
+            return self._output(nodes, long=True) if kwargs.get('returnNewNodes') else path
+        if kwargs.get('removeReference') or kwargs.get('rr'):
+            for uuid in scene.references.pop(args[0], []):
+                if uuid in scene.nodes:
+                    scene.remove_node(scene.nodes[uuid])
+            return None
+        raise NotImplementedError(f"file: mode non simulé ({', '.join(sorted(kwargs))})")
+
+    def referenceQuery(self, node_name, filename=False, **kwargs):
+        node = self._scene.require(node_name)
+        for path, uuids in self._scene.references.items():
+            if node.uuid in uuids:
+                return path
+        raise RuntimeError(f"'{node_name}' is not from a referenced file")
+
+    def workspace(self, *args, **kwargs):
+        if kwargs.get('query') and kwargs.get('rootDirectory'):
+            return self._scene.workspace_root
+        return None
+
+    def fileInfo(self, *args, **kwargs):
+        file_info = self._scene.file_info
+        if kwargs.get('query') or kwargs.get('q'):
+            if args:
+                return [file_info[args[0]]] if args[0] in file_info else []
+            return [item for pair in file_info.items() for item in pair]
+        if kwargs.get('remove') or kwargs.get('rm'):
+            file_info.pop(kwargs.get('remove') or kwargs.get('rm'), None)
+            return None
+        file_info[args[0]] = args[1]
+
+    def lockNode(self, nodes=None, **kwargs):
+        resolved = [self._scene.require(n) for n in self._as_list(nodes)]
+        if kwargs.get('query') or kwargs.get('q'):
+            return [bool(n.attrs.get('locked')) for n in resolved]
+        for node in resolved:
+            node.attrs['locked'] = kwargs.get('lock', kwargs.get('l', True))
+
+    def unknownPlugin(self, plugin=None, **kwargs):
+        scene = self._scene
+        if kwargs.get('query') or kwargs.get('q'):
+            return sorted(scene.unknown_plugins) or None
+        if kwargs.get('remove') or kwargs.get('r'):
+            if any(n.attrs.get('plugin') == plugin for n in scene.iter_all()):
+                raise RuntimeError(f"Cannot remove plugin '{plugin}': nodes still in use")
+            scene.unknown_plugins.discard(plugin)
+
+    def pluginInfo(self, name, **kwargs):
+        if kwargs.get('path'):
+            return os.path.abspath(f"{name}.py")
+        return name in self._scene.loaded_plugins
+
+    def loadPlugin(self, name, **kwargs):
+        self._scene.loaded_plugins.add(name)
+
+    def group(self, *nodes, **kwargs):
+        """Groupe les nodes donnés (ou la sélection) ; empty=True crée un groupe vide"""
+        scene = self._scene
+        parent = scene.require(kwargs['parent']) if kwargs.get('parent') else None
+        members = [scene.require(name) for node in nodes for name in self._as_list(node)]
+        if not members and not kwargs.get('empty'):
+            members = list(scene.selection)
+        if members and parent is None:
+            parent = members[0].parent
+        grp = scene.add_node(scene.unique_name(kwargs.get('name') or 'group1'), 'transform', parent)
+        for member in members:
+            scene.reparent_node(member, grp)
+        return grp.name
+
+    def parent(self, *args, **kwargs):
+        """Reparente les nodes sous le dernier argument, ou à la racine avec world=True
+        
+        add=True (avec ou sans shape=True) ajoute une instance des nodes sous le parent
+        au lieu de les déplacer ; retourne alors les chemins longs des nouvelles instances.
+        """
+        scene = self._scene
+        names = [name for arg in args for name in self._as_list(arg)]
+        if kwargs.get('world'):
+            parent = None
+        else:
+            parent = scene.require(names.pop())
+        nodes = [scene.require(name) for name in names]
+        if kwargs.get('add') or kwargs.get('addObject'):
+            if parent is None:
+                raise RuntimeError("parent -add: un parent est nécessaire")
+            for node in nodes:
+                if kwargs.get('shape') and not self._match_type(node, 'shape'):
+                    raise RuntimeError(f"'{node.name}' is not a shape")
+                if parent in [node.parent] + node.instance_parents:
+                    raise RuntimeError(f"'{node.name}' is already a child of '{parent.name}'")
+                scene.add_instance(node, parent)
+            return [f"{parent.long_name()}|{node.name}" for node in nodes]
+        for node in nodes:
+            scene.reparent_node(node, parent)
+        return [node.name for node in nodes]
+
+    def _ui_exists(self, name=None, exists=False, **kwargs):
+        # Contrôles d'interface : seule la requête d'existence est simulée
+        if exists:
+            return name in self._scene.ui
+        return None
+
+    window = textScrollList = text = _ui_exists
+
+    def shelfLayout(self, name=None, exists=False, **kwargs):
+        if exists:
+            return name in self._scene.ui
+        self._scene.ui[name] = []
+        return name
+
+    def shelfButton(self, parent=None, **kwargs):
+        buttons = self._scene.ui[parent]
+        buttons.append(kwargs)
+        return f"{parent}|shelfButton{len(buttons)}"
+
+    def deleteUI(self, name, **kwargs):
+        self._scene.ui.pop(name, None)
+
+    def optionVar(self, query=None, exists=None, stringValue=None, remove=None, **kwargs):
+        option_vars = self._scene.option_vars
+        if query is not None:
+            return option_vars.get(query, 0)
+        if exists is not None:
+            return exists in option_vars
+        if remove is not None:
+            option_vars.pop(remove, None)
+        elif stringValue is not None:
+            option_vars[stringValue[0]] = stringValue[1]
+        return None
+
+    def undoInfo(self, *args, **kwargs):
+        return None
+
+    def refresh(self, *args, **kwargs):
+        return None
+
+    def createNode(self, node_type, name=None, parent=None, **kwargs):
+        return self._create_node(node_type, name, parent)
+
+    def _create_node(self, node_type, name=None, parent=None):
+        scene = self._scene
+        parent_node = scene.require(parent) if parent else None
+        node = scene.add_node(scene.unique_name(name or f"{node_type}1"), node_type, parent_node)
+        return scene.display_name(node)
+
+    def shadingNode(self, node_type, name=None, **kwargs):
+        scene = self._scene
+        if kwargs.get('asLight'):
+            # Comme Maya : retourne le transform du shape de light créé
+            transform = scene.add_node(scene.unique_name(name or node_type), 'transform')
+            scene.add_node(f"{transform.name}Shape", node_type, transform)
+            return scene.display_name(transform)
+        return self._create_node(node_type, name)
+
+    def duplicate(self, nodes, name=None, upstreamNodes=False, **kwargs):
+        scene = self._scene
+        result = []
+        for source_name in self._as_list(nodes):
+            source = scene.require(source_name)
+            # Avec upstreamNodes, le réseau DG en amont est copié avec ses connexions internes
+            originals = [source] + (self._upstream_nodes(source) if upstreamNodes or kwargs.get('un') else [])
+            copies = {}
+            for original in originals:
+                copy_name = name if original is source and name else original.name
+                copy = scene.add_node(scene.unique_name(copy_name), original.type, original.parent)
+                copy.attrs = {key: set(value) if isinstance(value, set) else value
+                              for key, value in original.attrs.items()}
+                copies[original.name] = copy
+                result.append(scene.display_name(copy))
+            if len(originals) > 1:
+                positions = scene.connection_index()
+                incoming = [scene.connections[position] for original in originals
+                            for position in positions.get(original.name, ())]
+                for source_plug, destination_plug in dict.fromkeys(incoming):
+                    source_node, _, source_attr = source_plug.partition('.')
+                    destination_node, _, destination_attr = destination_plug.partition('.')
+                    if destination_node in copies:
+                        if source_node in copies:
+                            source_plug = f"{copies[source_node].name}.{source_attr}"
+                        scene.connections.append((source_plug, f"{copies[destination_node].name}.{destination_attr}"))
+        return result
+
+    def _upstream_nodes(self, node):
+        """Nodes DG en amont de node (connexions entrantes, récursivement)"""
+        scene = self._scene
+        found = []
+        seen = {node.name}
+        stack = [node.name]
+        positions = scene.connection_index()
+        while stack:
+            name = stack.pop()
+            for position in positions.get(name, ()):
+                source_plug, destination_plug = scene.connections[position]
+                source_name = source_plug.partition('.')[0]
+                if destination_plug.partition('.')[0] != name or source_name in seen:
+                    continue
+                source = scene.resolve(source_name)
+                if source is not None and not is_dag_type(source.type):
+                    seen.add(source_name)
+                    found.append(source)
+                    stack.append(source_name)
+        return found
+
+    def sets(self, members=None, **kwargs):
+        scene = self._scene
+        if kwargs.get('edit'):
+            target = kwargs.get('forceElement') or kwargs.get('addElement')
+            set_node = scene.require(target)
+            for member in self._as_list(members):
+                node = scene.require(member)
+                # Un mesh n'appartient qu'à un seul shading group
+                previous = scene.shading_groups.get(node.uuid)
+                if previous is not None and set_node.type == 'shadingEngine':
+                    previous.attrs['members'].discard(node.uuid)
+                if set_node.type == 'shadingEngine':
+                    scene.shading_groups[node.uuid] = set_node
+                set_node.attrs.setdefault('members', set()).add(node.uuid)
+            return None
+        if kwargs.get('query'):
+            set_node = scene.require(members)
+            members_ = [scene.nodes[u] for u in set_node.attrs.get('members', ())]
+            return self._output(members_) or None
+        node_type = 'shadingEngine' if kwargs.get('renderable') else 'objectSet'
+        set_node = scene.add_node(scene.unique_name(kwargs.get('name') or f"{node_type}1"), node_type)
+        set_node.attrs['members'] = set()
+        if not kwargs.get('empty'):
+            for member in self._as_list(members):
+                set_node.attrs['members'].add(scene.require(member).uuid)
+        return set_node.name
+
+    def connectAttr(self, source, destination, **kwargs):
+        scene = self._scene
+        scene.require(source)
+        scene.require(destination)
+        if kwargs.get('force'):
+            scene.connections = [c for c in scene.connections if c[1] != destination]
+        scene.connections.append((source, destination))
+
+    def getAttr(self, plug, **kwargs):
+        node_name, _, attr = plug.partition('.')
+        node = self._scene.require(node_name)
+        if attr not in node.attrs:
+            raise ValueError(f"No attribute '{attr}' on '{node_name}'")
+        return node.attrs[attr]
+
+    def setAttr(self, plug, *values, **kwargs):
+        node_name, _, attr = plug.partition('.')
+        node = self._scene.require(node_name)
+        if kwargs.get('type') == 'stringArray':
+            self._scene.set_attr(node, attr, list(values[1:]))
+        else:
+            self._scene.set_attr(node, attr, values[0] if len(values) == 1 else tuple(values))
+
+    def addAttr(self, node_name, longName=None, **kwargs):
+        node = self._scene.require(node_name)
+        node.attrs.setdefault(longName, None)
+
+    def attributeQuery(self, attr, node=None, exists=False, **kwargs):
+        return attr in self._scene.require(node).attrs
+
+    def hide(self, nodes=None, **kwargs):
+        for name in self._as_list(nodes):
+            self._scene.require(name).attrs['visibility'] = False
+
+    def showHidden(self, nodes=None, **kwargs):
+        for name in self._as_list(nodes):
+            self._scene.require(name).attrs['visibility'] = True
+
+    def camera(self, node_name=None, query=False, startupCamera=False, **kwargs):
+        node = self._scene.require(node_name)
+        if query and startupCamera:
+            return bool(node.attrs.get('startupCamera', False))
+        return None
+
+    def polyEvaluate(self, nodes=None, **kwargs):
+        # Topologie d'un cube par défaut, surchargeable via les attrs du shape
+        counts = {'vertex': 0, 'edge': 0, 'face': 0}
+        for name in self._as_list(nodes):
+            node = self._scene.require(name)
+            shapes = [c for c in node.children if c.type == 'mesh'] if node.type != 'mesh' else [node]
+            for shape in shapes:
+                counts['vertex'] += shape.attrs.get('vertexCount', 8)
+                counts['edge'] += shape.attrs.get('edgeCount', 12)
+                counts['face'] += shape.attrs.get('faceCount', 6)
+        wanted = [key for key in counts if kwargs.get(key)]
+        if len(wanted) == 1:
+            return counts[wanted[0]]
+        return {key: counts[key] for key in wanted}
+
+    def xform(self, node_name, **kwargs):
+        if '.vtx[' in node_name:
+            # Positions de tous les sommets, à plat (x, y, z)
+            node = self._scene.require(node_name.split('.', 1)[0])
+            return list(node.attrs.get('points', CUBE_POINTS))
+        node = self._scene.require(node_name)
+        if kwargs.get('boundingBox'):
+            return list(node.attrs.get('boundingBox', (-0.5, -0.5, -0.5, 0.5, 0.5, 0.5)))
+        return [0.0] * 3
+
+    def makeIdentity(self, *args, **kwargs):
+        return None
+
+
+def build_scene(scene, group_count=100, meshes_per_group=10, others_per_group=5):
+    """Remplit la scène avec des groupes de mesh et d'autres transforms (locators, curves)"""
+    scene.clear()
+    for g in range(group_count):
+        grp = scene.add_transform(f"grp{g}")
+        for m in range(meshes_per_group):
+            scene.add_transform(f"geo{g}_{m}", grp, 'mesh')
+        for o in range(others_per_group):
+            shape_type = 'locator' if o % 2 else 'nurbsCurve'
+            scene.add_transform(f"ctl{g}_{o}", grp, shape_type)
+    return scene
+
+
+def build_nested_groups(scene, depth=50, breadth=10):
+    """Remplit la scène avec breadth chaînes de depth groupes imbriqués, chaque niveau
+    portant un groupe vide ; une chaîne sur deux se termine par un mesh"""
+    scene.clear()
+    for b in range(breadth):
+        parent = None
+        for d in range(depth):
+            parent = scene.add_transform(f"chain{b}_{d}", parent)
+            scene.add_transform(f"empty{b}_{d}", parent)
+        if b % 2 == 0:
+            scene.add_transform(f"leaf{b}", parent, 'mesh')
+    return scene
+
+
+def build_pasted_scene(scene, group_count=100, meshes_per_group=5):
+    """Remplit la scène avec des groupes d'origine et des copies collées : chaque
+    copie pasted__grpN contient des pasted__geoM dont les noms se répètent d'une
+    copie à l'autre (Maya les retourne donc en chemins longs)"""
+    scene.clear()
+    for g in range(group_count):
+        grp = scene.add_transform(f"source{g}")
+        pasted_grp = scene.add_transform(f"pasted__grp{g}")
+        for m in range(meshes_per_group):
+            scene.add_transform(f"geo{g}_{m}", grp, 'mesh')
+            scene.add_transform(f"pasted__geo{m}", pasted_grp, 'mesh')
+    return scene
+
+
+def build_shading_scene(scene, material_count=1000, assigned_ratio=0.5):
+    """Remplit la scène avec des réseaux de shading (file -> place2dTexture, shader, SG)
+    dont une partie est assignée à des mesh, les autres orphelins"""
+    scene.clear()
+    defaults = [('lambert1', 'lambert'), ('initialShadingGroup', 'shadingEngine'),
+                ('defaultShaderList1', 'defaultShaderList'), ('defaultTextureList1', 'defaultTextureList'),
+                ('defaultRenderUtilityList1', 'defaultRenderUtilityList'), ('lightLinker1', 'lightLinker')]
+    for name, node_type in defaults:
+        scene.add_node(name, node_type).attrs['isDefault'] = True
+    light = scene.add_transform('key_light', shape_type='aiSkyDomeLight')
+
+    assigned = int(material_count * assigned_ratio)
+    for index in range(material_count):
+        shader = scene.add_node(f"shader{index}", 'aiStandardSurface' if index % 2 else 'lambert')
+        texture = scene.add_node(f"file{index}", 'file')
+        placement = scene.add_node(f"place2dTexture{index}", 'place2dTexture')
+        shading_group = scene.add_node(f"shader{index}SG", 'shadingEngine')
+        shading_group.attrs['members'] = set()
+        scene.connections.extend([
+            (f"{placement.name}.outUV", f"{texture.name}.uvCoord"),
+            (f"{texture.name}.outColor", f"{shader.name}.baseColor"),
+            (f"{shader.name}.outColor", f"{shading_group.name}.surfaceShader"),
+            (f"{shader.name}.message", "defaultShaderList1.shaders"),
+            (f"{texture.name}.message", "defaultTextureList1.textures"),
+            (f"{placement.name}.message", "defaultRenderUtilityList1.utilities"),
+            (f"{shading_group.name}.message", "lightLinker1.link"),
+        ])
+        if index < assigned:
+            mesh = scene.add_transform(f"geo{index}", shape_type='mesh').children[0]
+            shading_group.attrs['members'].add(mesh.uuid)
+            scene.shading_groups[mesh.uuid] = shading_group
+        elif index == assigned:
+            # Texture d'un réseau non assigné qui éclaire la scène : reste utilisée
+            scene.connections.append((f"{texture.name}.outColor", f"{light.children[0].name}.color"))
+    return scene
+
+
+def build_unknown_scene(scene, group_count=100, unknown_per_group=10, plugin_count=5):
+    """Remplit la scène (voir build_scene) et ajoute des nodes inconnus verrouillés
+    provenant de plugins absents"""
+    build_scene(scene, group_count=group_count, meshes_per_group=5, others_per_group=0)
+    for p in range(plugin_count):
+        scene.unknown_plugins.add(f"missingPlugin{p}")
+    for g in range(group_count):
+        for u in range(unknown_per_group):
+            node_type = 'unknownDag' if u % 3 == 0 else 'unknown'
+            if node_type == 'unknownDag':
+                node = scene.add_node(f"unknownDag{g}_{u}", node_type, scene.require(f"|grp{g}"))
+            else:
+                node = scene.add_node(f"unknown{g}_{u}", node_type)
+            node.attrs['plugin'] = f"missingPlugin{(g + u) % plugin_count}"
+            node.attrs['locked'] = u % 2 == 0
+    return scene
+
+
+def build_render_globals(scene):
+    """Ajoute les nodes de réglages de rendu avec les valeurs par défaut de Maya"""
+    defaults = {
+        'defaultRenderGlobals': {
+            'currentRenderer': 'mayaSoftware', 'imageFormat': 7, 'animation': 0,
+            'putFrameBeforeExt': 0, 'extensionPadding': 1, 'startFrame': 1.0, 'endFrame': 10.0,
+        },
+        'defaultResolution': {'width': 640, 'height': 480},
+        'defaultArnoldRenderOptions': {'renderDevice': 0},
+    }
+    for name, attrs in defaults.items():
+        node = scene.add_node(name, 'renderGlobals')
+        node.attrs.update(attrs)
+    driver = scene.add_node('defaultArnoldDriver', 'aiAOVDriver')
+    driver.attrs.update({'aiTranslator': 'exr', 'mergeAOVs': False})
+    scene.loaded_plugins.add('mtoa')
+    return scene
+
+
+def build_api_module(scene):
+    """maya.api.OpenMaya réduit : MSelectionList et lecture de valeurs de nodes
+    (attributs et topologie mesh), sur les mêmes données que StandInCmds"""
+    api = types.ModuleType('maya.api.OpenMaya')
+
+    class MObject(object):
+        __slots__ = ('node',)
+
+        def __init__(self, node=None):
+            self.node = node
+
+    class MDagPath(object):
+        __slots__ = ('_node',)
+
+        def __init__(self, node=None):
+            self._node = node
+
+        def node(self):
+            return MObject(self._node)
+
+        def instanceNumber(self):
+            return 0
+
+    def node_of(obj):
+        return obj.node if isinstance(obj, MObject) else obj._node
+
+    class MSelectionList(object):
+        def __init__(self):
+            self._nodes = []
+
+        def add(self, name):
+            self._nodes.append(scene.require(name))
+            return self
+
+        def length(self):
+            return len(self._nodes)
+
+        def getDependNode(self, index):
+            return MObject(self._nodes[index])
+
+        def getDagPath(self, index):
+            return MDagPath(self._nodes[index])
+
+    class MSpace(object):
+        kObject, kWorld = 2, 4
+
+    class MPoint(tuple):
+        # (x, y, z, w), comme MPoint converti en séquence
+        x = property(lambda self: self[0])
+        y = property(lambda self: self[1])
+        z = property(lambda self: self[2])
+
+    class MColor(tuple):
+        r = property(lambda self: self[0])
+        g = property(lambda self: self[1])
+        b = property(lambda self: self[2])
+        a = property(lambda self: self[3])
+
+    class MBoundingBox(object):
+        def __init__(self, points):
+            self.min = MPoint([min(points[axis::3]) for axis in range(3)] + [1.0])
+            self.max = MPoint([max(points[axis::3]) for axis in range(3)] + [1.0])
+
+    class MFn(object):
+        kNumericAttribute, kTypedAttribute, kCompoundAttribute, kMessageAttribute = range(4)
+
+    class MAttribute(object):
+        # Attribut d'un node du stand-in : nom et type API déduit de la valeur stockée
+        def __init__(self, name, value):
+            self.name = name
+            self.value = value
+
+        def apiType(self):
+            if self.value is None:
+                return MFn.kMessageAttribute
+            if isinstance(self.value, str):
+                return MFn.kTypedAttribute
+            if isinstance(self.value, (bool, int, float)):
+                return MFn.kNumericAttribute
+            return MFn.kCompoundAttribute
+
+    class MFnAttribute(object):
+        def __init__(self, attribute):
+            self.name = attribute.name
+            self.array = False
+
+    class MPlug(object):
+        def __init__(self, value=None, attribute=None):
+            # MPlug(valeur) pour findPlug, MPlug(node, attribut) comme dans l'API
+            self._value = value if attribute is None else node_of(value).attrs.get(attribute.name)
+
+        def isDefaultValue(self):
+            # Le stand-in ne stocke que les attributs modifiés
+            return False
+
+        def asDouble(self):
+            return float(self._value)
+
+        def asInt(self):
+            return int(self._value)
+
+        def asBool(self):
+            return bool(self._value)
+
+        def asString(self):
+            return str(self._value or '')
+
+    class MUuid(object):
+        def __init__(self, value):
+            self._value = value
+
+        def asString(self):
+            return self._value
+
+    class MFnDependencyNode(object):
+        def __init__(self, mobject):
+            self._node = node_of(mobject)
+
+        def name(self):
+            return self._node.name
+
+        def object(self):
+            return MObject(self._node)
+
+        def attributeCount(self):
+            return len(self._node.attrs)
+
+        def attribute(self, index):
+            name = list(self._node.attrs)[index]
+            return MAttribute(name, self._node.attrs[name])
+
+        def uuid(self):
+            return MUuid(self._node.uuid)
+
+        def hasAttribute(self, attribute):
+            return attribute in self._node.attrs
+
+        def findPlug(self, attribute, want_networked_plug):
+            return MPlug(self._node.attrs.get(attribute))
+
+    class MFnDagNode(MFnDependencyNode):
+        @property
+        def boundingBox(self):
+            return MBoundingBox(self._node.attrs.get('points', CUBE_POINTS))
+
+        def transformationMatrix(self):
+            return list(self._node.attrs.get('matrix', IDENTITY_MATRIX))
+
+    class MFnMesh(MFnDagNode):
+        # Topologie d'un cube par défaut, comme polyEvaluate
+        @property
+        def numPolygons(self):
+            return self._node.attrs.get('faceCount', 6)
+
+        @property
+        def numVertices(self):
+            return self._node.attrs.get('vertexCount', 8)
+
+        @property
+        def numFaceVertices(self):
+            return self._node.attrs.get('faceVertexCount', 4 * self.numPolygons)
+
+        @property
+        def isIntermediateObject(self):
+            return bool(self._node.attrs.get('intermediateObject', False))
+
+        def getPoints(self, space=MSpace.kObject):
+            points = self._node.attrs.get('points', CUBE_POINTS)
+            return [MPoint(points[i:i + 3] + [1.0]) for i in range(0, len(points), 3)]
+
+        def getVertices(self):
+            attrs = self._node.attrs
+            return list(attrs.get('counts', CUBE_COUNTS)), list(attrs.get('connects', CUBE_CONNECTS))
+
+        def _uv_sets(self):
+            # Par défaut un UV set map1 : projection planaire des points, un UV par sommet
+            attrs = self._node.attrs
+            if 'uvSets' in attrs:
+                return attrs['uvSets']
+            points = attrs.get('points', CUBE_POINTS)
+            counts, connects = self.getVertices()
+            return {'map1': (list(points[0::3]), list(points[1::3]), counts, connects)}
+
+        def getUVSetNames(self):
+            return list(self._uv_sets())
+
+        def getUVs(self, uv_set='map1'):
+            u_values, v_values = self._uv_sets()[uv_set][:2]
+            return list(u_values), list(v_values)
+
+        def getAssignedUVs(self, uv_set='map1'):
+            uv_counts, uv_ids = self._uv_sets()[uv_set][2:]
+            return list(uv_counts), list(uv_ids)
+
+        def getColorSetNames(self):
+            return list(self._node.attrs.get('colorSets', {}))
+
+        def getFaceVertexColors(self, color_set):
+            values = self._node.attrs['colorSets'][color_set]
+            return [MColor(values[i:i + 4]) for i in range(0, len(values), 4)]
+
+        def getConnectedShaders(self, instance):
+            shading_group = scene.shading_groups.get(self._node.uuid)
+            if shading_group is None or shading_group.uuid not in scene.nodes:
+                return [], []
+            return [MObject(shading_group)], [0] * self.numPolygons
+
+    class MMessage(object):
+        @staticmethod
+        def removeCallback(callback_id):
+            for callbacks in scene.dirty_callbacks.values():
+                callbacks.pop(callback_id, None)
+
+    class MNodeMessage(MMessage):
+        next_id = 0
+
+        @classmethod
+        def addNodeDirtyPlugCallback(cls, mobject, function, client_data=None):
+            node = node_of(mobject)
+            cls.next_id += 1
+            scene.dirty_callbacks.setdefault(node.uuid, {})[cls.next_id] = \
+                lambda attr: function(MObject(node), MPlug(node.attrs.get(attr)), client_data)
+            return cls.next_id
+
+    api.MObject = MObject
+    api.MDagPath = MDagPath
+    api.MMessage = MMessage
+    api.MNodeMessage = MNodeMessage
+    api.MSelectionList = MSelectionList
+    api.MSpace = MSpace
+    api.MPoint = MPoint
+    api.MColor = MColor
+    api.MPlug = MPlug
+    api.MFn = MFn
+    api.MFnAttribute = MFnAttribute
+    api.MUuid = MUuid
+    api.MFnDependencyNode = MFnDependencyNode
+    api.MFnDagNode = MFnDagNode
+    api.MFnMesh = MFnMesh
+    return api
+
+
+def build_selection_scene(scene, group_count=100):
+    """Remplit la scène pour Select by Type : meshes (un sur dix au-delà de 100k faces),
+    locators, joints, lights (une sur trois éteinte) et caméras, plus les 4 caméras par défaut"""
+    scene.clear()
+    for name in ('persp', 'top', 'front', 'side'):
+        camera = scene.add_transform(name, shape_type='camera')
+        camera.children[0].attrs['startupCamera'] = True
+    for g in range(group_count):
+        grp = scene.add_transform(f"grp{g}")
+        for m in range(10):
+            geo = scene.add_transform(f"geo{g}_{m}", grp, 'mesh')
+            geo.children[0].attrs['faceCount'] = 150000 if m == 0 else 500
+        scene.add_transform(f"loc{g}", grp, 'locator')
+        scene.add_node(f"joint{g}", 'joint', grp)
+        light_type = ('pointLight', 'spotLight', 'aiAreaLight')[g % 3]
+        light = scene.add_transform(f"light{g}", grp, light_type)
+        light.children[0].attrs['intensity'] = 0.0 if g % 3 == 0 else 1.0
+        if g % 10 == 0:
+            scene.add_transform(f"cam{g}", grp, 'camera')
+    return scene
+
+
+def build_benchmark_scene(scene, node_count=10000):
+    """Remplit la scène d'environ node_count nodes, par unités d'une quinzaine de nodes :
+    un groupe de 4 meshes (un sur quatre au-delà de 100k faces), une light, une chaîne
+    de groupes vides et, une unité sur deux, une copie collée pasted__ de deux meshes"""
+    scene.clear()
+    scene.add_transform('persp', shape_type='camera').children[0].attrs['startupCamera'] = True
+    for u in range(max(1, node_count // 15)):
+        grp = scene.add_transform(f"asset{u}")
+        for m in range(4):
+            geo = scene.add_transform(f"geo{u}_{m}", grp, 'mesh')
+            geo.children[0].attrs['faceCount'] = 150000 if m == 0 and u % 4 == 0 else 500
+        scene.add_transform(f"light{u}", grp, 'pointLight')
+        scene.add_transform(f"empty{u}", scene.add_transform(f"layout{u}", grp))
+        if u % 2 == 0:
+            pasted_grp = scene.add_transform(f"pasted__copy{u}")
+            for m in range(2):
+                scene.add_transform(f"pasted__geo{m}", pasted_grp, 'mesh')
+    return scene
+
+
+def build_statistics_scene(scene, texture_dir, asset_count=100, meshes_per_asset=10, textures_per_asset=4):
+    """Remplit la scène d'assets (meshes de tailles variées, un shape intermédiaire par
+    asset) et de nodes file dont les textures sont créées dans texture_dir : tuiles UDIM
+    pour une texture sur deux, un fichier manquant par asset. Les chemins sont relatifs
+    au workspace (texture_dir)"""
+    scene.clear()
+    scene.workspace_root = texture_dir
+    os.makedirs(texture_dir, exist_ok=True)
+    for a in range(asset_count):
+        asset = scene.add_transform(f"asset{a}")
+        for m in range(meshes_per_asset):
+            geo = scene.add_transform(f"asset{a}_geo{m}", asset, 'mesh')
+            faces = 100 * (m + 1)
+            geo.children[0].attrs.update({'faceCount': faces, 'vertexCount': faces + 2, 'faceVertexCount': faces * 4})
+        scene.add_node(f"asset{a}_geo0ShapeOrig", 'mesh', asset.children[0]).attrs['intermediateObject'] = True
+        for t in range(textures_per_asset):
+            texture = scene.add_node(f"asset{a}_tex{t}", 'file')
+            if t == textures_per_asset - 1:
+                texture.attrs['fileTextureName'] = f"missing/asset{a}_tex{t}.exr"
+                continue
+            if t % 2:
+                texture.attrs['fileTextureName'] = f"asset{a}_tex{t}.<UDIM>.exr"
+                names = [f"asset{a}_tex{t}.{1001 + tile}.exr" for tile in range(4)]
+            else:
+                texture.attrs['fileTextureName'] = f"asset{a}_tex{t}.exr"
+                names = [f"asset{a}_tex{t}.exr"]
+            for name in names:
+                path = os.path.join(texture_dir, name)
+                if not os.path.exists(path):
+                    with open(path, 'wb') as f:
+                        f.write(b'\0' * 1024 * (t + 1))
+    return scene
+
+
+def install(scene=None):
+    """Enregistre le backend dans sys.modules sous maya, maya.cmds, maya.mel, maya.OpenMaya,
+    maya.OpenMayaMPx, maya.api.OpenMaya et mtoa.aovs, puis retourne la scène utilisée"""
+    scene = scene or StandInScene()
+
+    maya_module = types.ModuleType('maya')
+    cmds_module = StandInCmds(scene)
+
+    open_maya = types.ModuleType('maya.OpenMaya')
+
+    class MGlobal(object):
+        @staticmethod
+        def displayError(message):
+            print(f"# Error: {message}")
+
+    class MMessage(object):
+        callbacks = {}
+
+        @classmethod
+        def removeCallback(cls, callback_id):
+            cls.callbacks.pop(callback_id, None)
+
+    class MSceneMessage(MMessage):
+        kBeforeOpen, kAfterOpen, kAfterNew = 'kBeforeOpen', 'kAfterOpen', 'kAfterNew'
+
+        @classmethod
+        def addCallback(cls, message, function, client_data=None):
+            callback_id = len(MMessage.callbacks) + 1
+            while callback_id in MMessage.callbacks:
+                callback_id += 1
+            MMessage.callbacks[callback_id] = (message, function)
+            return callback_id
+
+    open_maya.MGlobal = MGlobal
+    open_maya.MMessage = MMessage
+    open_maya.MSceneMessage = MSceneMessage
+
+    open_maya_mpx = types.ModuleType('maya.OpenMayaMPx')
+
+    class MPxCommand(object):
+        pass
+
+    class MFnPlugin(object):
+        commands = {}
+
+        def __init__(self, mobject=None, *args):
+            pass
+
+        def registerCommand(self, name, creator):
+            MFnPlugin.commands[name] = creator
+
+        def deregisterCommand(self, name):
+            MFnPlugin.commands.pop(name, None)
+
+    open_maya_mpx.MPxCommand = MPxCommand
+    open_maya_mpx.MFnPlugin = MFnPlugin
+    open_maya_mpx.asMPxPtr = lambda obj: obj
+
+    mel_module = types.ModuleType('maya.mel')
+
+    def mel_eval(command):
+        # Les commandes MEL (options FBX...) sont seulement comptées
+        scene.call_counts['mel.eval'] += 1
+
+    mel_module.eval = mel_eval
+
+    api_module = types.ModuleType('maya.api')
+    api_module.OpenMaya = build_api_module(scene)
+
+    mtoa_module = types.ModuleType('mtoa')
+    aovs_module = types.ModuleType('mtoa.aovs')
+
+    class AOVInterface(object):
+        # AOVs Arnold : nodes aiAOV dont l'attribut name porte le nom de l'AOV
+        def getAOVNodes(self, names=False):
+            nodes = [node for node in scene.nodes.values() if node.type == 'aiAOV']
+            if names:
+                return [(node.attrs.get('name'), node.name) for node in nodes]
+            return [node.name for node in nodes]
+
+        def addAOV(self, name, aovType=None):
+            node = scene.add_node(scene.unique_name(f"aiAOV_{name}"), 'aiAOV')
+            node.attrs['name'] = name
+            return node.name
+
+    aovs_module.AOVInterface = AOVInterface
+    mtoa_module.aovs = aovs_module
+
+    maya_module.cmds = cmds_module
+    maya_module.OpenMaya = open_maya
+    maya_module.OpenMayaMPx = open_maya_mpx
+    maya_module.api = api_module
+    maya_module.mel = mel_module
+
+    sys.modules['maya'] = maya_module
+    sys.modules['maya.cmds'] = cmds_module
+    sys.modules['maya.OpenMaya'] = open_maya
+    sys.modules['maya.OpenMayaMPx'] = open_maya_mpx
+    sys.modules['maya.mel'] = mel_module
+    sys.modules['maya.api'] = api_module
+    sys.modules['maya.api.OpenMaya'] = api_module.OpenMaya
+    sys.modules['mtoa'] = mtoa_module
+    sys.modules['mtoa.aovs'] = aovs_module
+    return scene